@@ -0,0 +1,132 @@
+"""
+Benchmark: tiempo hasta el primer cuadro.
+
+Arranca la aplicación sobre una página en memoria cuyo client_storage tarda
+una latencia fija por operación (en el modo web cada lectura es un viaje al
+navegador) y mide cuándo se ve el reporte por primera vez, con y sin la
+instantánea de la interfaz, además del tiempo hasta terminar la hidratación.
+Requiere flet instalado.
+
+Uso:
+    python benchmarks/bench_arranque.py [latencia_ms ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("FLET_APP_STORAGE_DATA", tempfile.mkdtemp())
+
+import flet as ft
+from config import DEFAULT_OPERATORS
+import main as aplicacion
+
+class AlmacenamientoLento:
+    """Almacenamiento con la interfaz de page.client_storage y latencia por operación."""
+
+    def __init__(self, latencia: float, datos=None):
+        self.latencia = latencia
+        self._datos = dict(datos or {})
+
+    def _esperar(self):
+        if self.latencia:
+            time.sleep(self.latencia)
+
+    def get(self, clave):
+        self._esperar()
+        return self._datos.get(clave)
+
+    def set(self, clave, valor):
+        self._esperar()
+        self._datos[clave] = valor
+
+    def contains_key(self, clave):
+        self._esperar()
+        return clave in self._datos
+
+    def remove(self, clave):
+        self._esperar()
+        self._datos.pop(clave, None)
+
+class PaginaEnMemoria:
+    """Página mínima que registra cuándo aparece el reporte por primera vez."""
+
+    def __init__(self, almacenamiento: AlmacenamientoLento):
+        self.client_storage = almacenamiento
+        self.window = SimpleNamespace()
+        self.controls = []
+        self.appbar = None
+        self.primer_cuadro = None
+        self._hilos = []
+
+    def add(self, *controles):
+        self.controls.extend(controles)
+        self.update()
+
+    def update(self, *controles):
+        if self.primer_cuadro is None and any(_con_reporte(c) for c in self.controls):
+            self.primer_cuadro = time.perf_counter()
+
+    def run_task(self, funcion, *args):
+        pass  # Tareas de fondo (recordatorios, guardado): fuera de la medición
+
+    def run_thread(self, funcion, *args):
+        self._hilos.append((funcion, args))
+
+    def ejecutar_hilos(self):
+        while self._hilos:
+            funcion, args = self._hilos.pop(0)
+            funcion(*args)
+
+    def open(self, control):
+        pass
+
+    def close(self, control):
+        pass
+
+def _con_reporte(control) -> bool:
+    """True si el árbol contiene un texto con spans (el reporte ya dibujado)."""
+    if isinstance(control, ft.Text) and control.spans:
+        return True
+    hijos = list(getattr(control, "controls", None) or [])
+    contenido = getattr(control, "content", None)
+    if contenido is not None:
+        hijos.append(contenido)
+    return any(_con_reporte(h) for h in hijos)
+
+def arrancar(almacenamiento: AlmacenamientoLento):
+    page = PaginaEnMemoria(almacenamiento)
+    inicio = time.perf_counter()
+    aplicacion.main(page)
+    page.ejecutar_hilos()
+    fin = time.perf_counter()
+    return page.primer_cuadro - inicio, fin - inicio
+
+def medir(latencia_ms: float, repeticiones: int = 5):
+    latencia = latencia_ms / 1000
+    datos = {"operators": json.dumps(DEFAULT_OPERATORS), "theme": "dark"}
+
+    # Primer arranque sin instantánea; deja guardada la suya
+    completa, instantanea = [], []
+    for _ in range(repeticiones):
+        almacenamiento = AlmacenamientoLento(latencia, datos)
+        completa.append(arrancar(almacenamiento))
+    app_state = aplicacion.AppState(page=PaginaEnMemoria(AlmacenamientoLento(0, datos)))
+    app_state.is_dark_theme = True
+    datos[aplicacion.CLAVE_INSTANTANEA] = aplicacion.serializar(aplicacion.capturar(app_state))
+    for _ in range(repeticiones):
+        instantanea.append(arrancar(AlmacenamientoLento(latencia, datos)))
+
+    mediana = lambda valores, i: sorted(v[i] for v in valores)[len(valores) // 2] * 1000
+    print(
+        f"latencia {latencia_ms:4.1f} ms: primer cuadro {mediana(completa, 0):7.2f} ms -> "
+        f"{mediana(instantanea, 0):7.2f} ms con instantánea; "
+        f"hidratación completa {mediana(completa, 1):7.2f} ms / {mediana(instantanea, 1):7.2f} ms"
+    )
+
+if __name__ == "__main__":
+    for latencia in (float(n) for n in (sys.argv[1:] or ["0", "2", "10"])):
+        medir(latencia)
@@ -0,0 +1,82 @@
+"""
+Benchmark: tamaño y tiempo de lectura del roster guardado.
+
+Compara, para un roster grande, el formato anterior (lista de objetos JSON)
+con la codificación por columnas, sin comprimir y comprimida, en bytes
+guardados y en tiempo de escritura y de lectura hasta tener los objetos
+Operador.
+
+Uso:
+    python benchmarks/bench_codificacion.py [operadores]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalogos import obtener_catalogos
+from codificacion import codificar_operadores, decodificar_operadores
+from config import DEPARTAMENTO, get_cargos
+from models import Operador
+
+NOMBRES = ("Ana", "Luis", "María", "José", "Carmen", "Pedro", "Rosa", "Jesús", "Yelitza", "Rubén")
+APELLIDOS = ("Rojas", "Pérez", "González", "Rodríguez", "Hernández", "Marcano", "Salazar", "Guzmán")
+
+def generar(cantidad: int, semilla: int = 1):
+    rng = random.Random(semilla)
+    cargos = get_cargos(DEPARTAMENTO)
+    jerarquias = obtener_catalogos().jerarquias
+    return [
+        Operador(
+            f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {i}",
+            rng.choice(cargos),
+            rng.choice(jerarquias),
+            f"V-{rng.randrange(5_000_000, 32_000_000):,}".replace(",", ".")
+        )
+        for i in range(cantidad)
+    ]
+
+def cronometrar(funcion, repeticiones: int = 5) -> float:
+    mejores = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejores.append(time.perf_counter() - inicio)
+    return min(mejores)
+
+def medir(cantidad: int):
+    operadores = generar(cantidad)
+    filas = [(op.nombre, op.cargo, op.jerarquia, op.cedula) for op in operadores]
+
+    formatos = {
+        "anterior (objetos JSON)": lambda: json.dumps([op.to_dict() for op in operadores]),
+        "columnas": lambda: codificar_operadores(filas, comprimir_desde=-1),
+        "columnas + zlib": lambda: codificar_operadores(filas, comprimir_desde=0),
+    }
+    lectura_anterior = lambda valor: [Operador.from_dict(op) for op in json.loads(valor)]
+    lectura = lambda valor: [Operador(*fila) for fila in decodificar_operadores(valor)]
+
+    print(f"{cantidad} operadores")
+    base = None
+    for nombre, codificar in formatos.items():
+        valor = codificar()
+        tamano = len(valor.encode("utf-8"))
+        leer = lectura_anterior if base is None else lectura
+        assert leer(valor) == operadores
+        escritura = cronometrar(codificar)
+        tiempo = cronometrar(lambda: leer(valor))
+        if base is None:
+            base = (tamano, tiempo)
+        print(
+            f"  {nombre:<24} {tamano / 1024:8.1f} KiB ({tamano / base[0]:5.1%}), "
+            f"escritura {escritura * 1000:6.2f} ms, lectura {tiempo * 1000:6.2f} ms ({tiempo / base[1]:5.1%})"
+        )
+    # El formato anterior sigue leyéndose con la ruta nueva
+    valor = formatos["anterior (objetos JSON)"]()
+    print(f"  lectura del formato anterior con la ruta nueva: {cronometrar(lambda: lectura(valor)) * 1000:6.2f} ms")
+
+if __name__ == "__main__":
+    medir(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,71 @@
+"""
+Benchmark: ahorro de la deduplicación de reportes.
+
+Simula un día de copias para varios municipios (copias repetidas cada pocos
+minutos, cambios de tiempo ocasionales) y compara los registros y bytes que
+irían al historial y al despacho con y sin deduplicación, además del tiempo
+por emisión.
+
+Uso:
+    python benchmarks/bench_deduplicacion.py [municipios] [copias_por_hora]
+"""
+import datetime
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalogos import obtener_catalogos
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from models import AppState, Operador
+from historial import RegistroHistorial
+
+TIEMPO = obtener_catalogos().tiempo
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+
+def simular(municipios: int, copias_por_hora: int, semilla: int = 7):
+    rng = random.Random(semilla)
+    operador = Operador("Operador Prueba", "Operador", "Bombero", "V-1.234.567")
+    nombres = [f"{MUNICIPIOS[i % len(MUNICIPIOS)]} {i}" for i in range(municipios)]
+    estado = {m: 0 for m in nombres}
+    inicio = datetime.datetime(2026, 1, 1)
+
+    eventos = []
+    for m in nombres:
+        for _ in range(24 * copias_por_hora):
+            eventos.append((rng.uniform(0, 24 * 3600), m))
+    eventos.sort()
+
+    app_state = AppState()
+    todos, guardados = [], []
+    t0 = time.perf_counter()
+    for segundos, municipio in eventos:
+        if rng.random() < 0.05:  # Cambio de tiempo ocasional
+            estado[municipio] = rng.randrange(len(TIEMPO))
+        momento = inicio + datetime.timedelta(seconds=segundos)
+        reporte, _, registro = app_state.emitir_reporte(estado[municipio], municipio, operador, momento)
+        todos.append(RegistroHistorial.desde_reporte(reporte))
+        if registro:
+            guardados.append(registro)
+    duracion = time.perf_counter() - t0
+
+    tamano = lambda registros: sum(len(json.dumps(r.to_dict(), ensure_ascii=False)) + 1 for r in registros)
+    confirmaciones = sum(r.confirmacion for r in guardados)
+    print(
+        f"{municipios} municipios, {copias_por_hora} copias/hora: {len(eventos)} copias, "
+        f"{duracion / len(eventos) * 1e6:.1f} µs/emisión, "
+        f"aciertos de caché {app_state.deduplicador.aciertos}"
+    )
+    print(f"  sin deduplicar: {len(todos):>7} registros, {tamano(todos) / 1024:9.1f} KiB")
+    print(
+        f"  deduplicado:    {len(guardados):>7} registros, {tamano(guardados) / 1024:9.1f} KiB "
+        f"({confirmaciones} confirmaciones)"
+    )
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    simular(*(argumentos + [20, 6][len(argumentos):]))
@@ -0,0 +1,118 @@
+"""
+Benchmark del despacho de reportes contra destinos locales de prueba.
+
+Levanta un servidor HTTP local que falla las primeras solicitudes (corte
+simulado), un directorio de entrega y un socket Unix, encola reportes y mide
+cuánto tarda en entregarse todo.
+
+Uso:
+    python benchmarks/bench_despacho.py [cantidad]
+"""
+import datetime
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import config
+config.DESPACHO["reintento_min"] = 0.05
+config.DESPACHO["reintento_max"] = 0.5
+
+from catalogos import obtener_catalogos
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from despacho import Despachador, DestinoWebhook, DestinoDirectorio, DestinoSocketUnix
+from formatos import a_dict, a_whatsapp
+from models import Operador, ReportGenerator
+
+TIEMPO = obtener_catalogos().tiempo
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+
+class ServidorPrueba(BaseHTTPRequestHandler):
+    fallos_restantes = 3
+    recibidos = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        cuerpo = self.rfile.read(int(self.headers["Content-Length"]))
+        with ServidorPrueba.lock:
+            if ServidorPrueba.fallos_restantes > 0:
+                ServidorPrueba.fallos_restantes -= 1
+                self.send_response(503)
+                self.end_headers()
+                return
+            ServidorPrueba.recibidos += len(json.loads(cuerpo)["reportes"])
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+def socket_prueba(ruta, contador):
+    servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    servidor.bind(ruta)
+    servidor.listen(16)
+
+    def aceptar():
+        while True:
+            conexion, _ = servidor.accept()
+            with conexion:
+                datos = b""
+                while True:
+                    bloque = conexion.recv(65536)
+                    if not bloque:
+                        break
+                    datos += bloque
+                contador[0] += datos.count(b"\n")
+
+    threading.Thread(target=aceptar, daemon=True).start()
+
+def main(cantidad: int = 2000):
+    temporal = tempfile.mkdtemp()
+    http = ThreadingHTTPServer(("127.0.0.1", 0), ServidorPrueba)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    recibidos_unix = [0]
+    ruta_socket = os.path.join(temporal, "destino.sock")
+    socket_prueba(ruta_socket, recibidos_unix)
+
+    directorio = os.path.join(temporal, "entregas")
+    despachador = Despachador([
+        DestinoWebhook(f"http://127.0.0.1:{http.server_address[1]}/reportes"),
+        DestinoDirectorio(directorio),
+        DestinoSocketUnix(ruta_socket)
+    ], directorio=os.path.join(temporal, "cola"))
+    despachador.iniciar()
+
+    operador = Operador("Rubén Rojas", "Analista de CEMUPRAD", "OPC I", "V-28.702.206")
+    momento = datetime.datetime.now()
+    cargas = []
+    for i in range(cantidad):
+        reporte = ReportGenerator.construir_reporte(
+            i % len(TIEMPO), operador, MUNICIPIOS[i % len(MUNICIPIOS)], "CEMUPRAD", momento
+        )
+        cargas.append({"texto": a_whatsapp(reporte), "reporte": a_dict(reporte)})
+
+    inicio = time.perf_counter()
+    for carga in cargas:
+        despachador.encolar(carga)
+    encolado = time.perf_counter() - inicio
+
+    while min(despachador.entregados.values()) < cantidad:
+        time.sleep(0.01)
+    total = time.perf_counter() - inicio
+    despachador.detener()
+
+    archivos = sum(1 for _ in os.scandir(directorio))
+    print(f"encolado: {cantidad} reportes en {encolado * 1000:.1f} ms ({cantidad / encolado:,.0f}/s)")
+    print(f"entregado a todos los destinos en {total:.2f} s ({cantidad / total:,.0f} reportes/s)")
+    print(f"webhook: {ServidorPrueba.recibidos} (fallos reintentados: {despachador.fallos['webhook']}), "
+          f"directorio: {archivos} lotes, unix: {recibidos_unix[0]}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
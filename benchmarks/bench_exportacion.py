@@ -0,0 +1,72 @@
+"""
+Benchmark de la exportación masiva del historial.
+
+Genera un historial sintético, lo exporta en cada formato en serie y con el
+pool de procesos, verifica que ambas salidas coincidan y muestra el pico de
+memoria del proceso principal.
+
+Uso:
+    python benchmarks/bench_exportacion.py [registros] [procesos]
+"""
+import filecmp
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalogos import obtener_catalogos
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from exportacion import FORMATOS_EXPORTACION, ExportadorHistorial
+from models import Operador
+
+TIEMPO = obtener_catalogos().tiempo
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+
+def generar_historial(ruta: str, cantidad: int, operadores):
+    inicio = 1_700_000_000
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        for i in range(cantidad):
+            archivo.write(json.dumps({
+                "momento": inicio + i * 60,
+                "municipio": MUNICIPIOS[i % len(MUNICIPIOS)],
+                "departamento": "CEMUPRAD",
+                "indice_tiempo": i % len(TIEMPO),
+                "operador": operadores[i % len(operadores)].nombre
+            }, ensure_ascii=False) + "\n")
+
+def medir(exportador, destino, formato):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    cantidad = exportador.exportar(destino, formato)
+    duracion = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cantidad, duracion, pico
+
+def main(cantidad: int = 100_000, procesos: int = os.cpu_count() or 2):
+    temporal = tempfile.mkdtemp()
+    ruta = os.path.join(temporal, "historial.jsonl")
+    operadores = [Operador(f"Operador {i}", "Operador de radio", "OPC", f"V-{i}") for i in range(50)]
+    generar_historial(ruta, cantidad, operadores)
+
+    for formato in FORMATOS_EXPORTACION:
+        resultados = {}
+        for n in (1, procesos):
+            destino = os.path.join(temporal, f"salida-{n}.{formato}")
+            exportados, duracion, pico = medir(ExportadorHistorial(ruta, operadores, procesos=n, paralelo_desde=0), destino, formato)
+            resultados[n] = destino
+            print(f"{formato:>5} procesos={n:<2}: {exportados} reportes en {duracion:6.2f} s "
+                  f"({exportados / duracion:9,.0f}/s), pico de memoria {pico / 1024 / 1024:6.1f} MiB")
+        iguales = filecmp.cmp(resultados[1], resultados[procesos], shallow=False)
+        print(f"{formato:>5} salidas idénticas: {iguales}")
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+    )
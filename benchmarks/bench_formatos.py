@@ -0,0 +1,67 @@
+"""
+Benchmark: construcción de reportes (plantilla predeterminada y personalizada)
+y serialización a todos los formatos.
+
+Uso:
+    python benchmarks/bench_formatos.py [cantidad]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalogos import obtener_catalogos
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from formatos import FORMATOS
+from models import Operador, ReportGenerator
+from plantillas import compilar_plantilla
+
+TIEMPO = obtener_catalogos().tiempo
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+
+PLANTILLA_PERSONALIZADA = (
+    "*{departamento} - {municipio_mayus}*\n"
+    "*Fecha:* {fecha} *Hora:* {hora}\n"
+    "{emoji} {descripcion}\n"
+    "*Novedad:* {novedad}\n"
+    "*Reporta:* {reporta}"
+)
+
+def main(cantidad: int = 5000):
+    operador = Operador("Rubén Rojas", "Analista de CEMUPRAD", "OPC I", "V-28.702.206")
+
+    inicio = time.perf_counter()
+    reportes = [
+        ReportGenerator.construir_reporte(
+            i % len(TIEMPO), operador, MUNICIPIOS[i % len(MUNICIPIOS)], "CEMUPRAD"
+        )
+        for i in range(cantidad)
+    ]
+    construccion = time.perf_counter() - inicio
+    print(f"construcción: {cantidad} reportes en {construccion * 1000:.1f} ms")
+
+    plantilla = compilar_plantilla(PLANTILLA_PERSONALIZADA)
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        ReportGenerator.construir_reporte(
+            i % len(TIEMPO), operador, MUNICIPIOS[i % len(MUNICIPIOS)], "CEMUPRAD",
+            plantilla=plantilla
+        )
+    personalizada = time.perf_counter() - inicio
+    print(f"construcción (plantilla personalizada): {personalizada * 1000:.1f} ms")
+
+    total = 0.0
+    for nombre, serializar in FORMATOS.items():
+        inicio = time.perf_counter()
+        for reporte in reportes:
+            serializar(reporte)
+        duracion = time.perf_counter() - inicio
+        total += duracion
+        print(f"{nombre:>10}: {duracion * 1000:8.1f} ms  ({duracion / cantidad * 1e6:.2f} µs/reporte)")
+
+    print(f"{'todos':>10}: {total * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
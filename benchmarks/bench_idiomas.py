@@ -0,0 +1,86 @@
+"""
+Benchmark: el mismo lote de reportes en varios idiomas.
+
+Compara el lote multilingüe del tablero (cada reporte se construye,
+deduplica y clasifica una vez y se renderiza en cada idioma desde sus campos
+estructurados) con emitir el lote completo una vez por idioma, y mide el
+costo de cambiar el idioma de los textos enlazados de la interfaz.
+
+Uso:
+    python benchmarks/bench_idiomas.py [municipios] [repeticiones]
+"""
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from idiomas import PREDETERMINADO, EnlacesIdioma, _fuente, idiomas_disponibles, obtener_idioma
+from models import AppState, FilaTablero
+
+def filas_sinteticas(cantidad: int):
+    return [FilaTablero(f"Municipio {i}", i % 12) for i in range(cantidad)]
+
+def por_idioma(app_state: AppState, filas, codigos):
+    """Referencia: un lote completo por idioma."""
+    textos = []
+    for codigo in codigos:
+        app_state.cambiar_idioma(codigo)
+        textos.extend(texto for _, texto, _ in app_state.emitir_lote(filas))
+    app_state.cambiar_idioma(codigos[0])
+    return textos
+
+def multilingue(app_state: AppState, filas, codigos):
+    """Un reporte por fila, renderizado en cada idioma."""
+    return [
+        texto
+        for _, textos, _ in app_state.emitir_lote_idiomas(filas, None, codigos)
+        for texto in textos.values()
+    ]
+
+def mejor(funcion, repeticiones: int, app_state: AppState, *args) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        app_state.deduplicador.vaciar_cache()  # Sin textos ya renderizados en el minuto
+        inicio = time.perf_counter()
+        funcion(app_state, *args)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+def main(cantidad: int = 1000, repeticiones: int = 5):
+    codigos = [codigo for codigo, _ in idiomas_disponibles()]
+    inicio = time.perf_counter()
+    idiomas = [obtener_idioma(codigo) for codigo in codigos]
+    compilacion = time.perf_counter() - inicio
+    app_state = AppState()
+    filas = filas_sinteticas(cantidad)
+
+    separados = mejor(por_idioma, repeticiones, app_state, filas, codigos)
+    juntos = mejor(multilingue, repeticiones, app_state, filas, codigos)
+    app_state.deduplicador.vaciar_cache()
+    iguales = sorted(por_idioma(app_state, filas, codigos)) == sorted(multilingue(app_state, filas, codigos))
+    print(f"{cantidad} reportes en {len(idiomas)} idiomas ({', '.join(codigos)}), "
+          f"catálogos compilados en {compilacion * 1000:.1f} ms")
+    print(f"  un lote por idioma: {separados * 1000:.1f} ms")
+    print(f"  lote multilingüe:   {juntos * 1000:.1f} ms ({separados / juntos:.2f}x), mismos textos {iguales}")
+
+    # Cambio de idioma de una interfaz con un control por cada texto del catálogo
+    enlaces = EnlacesIdioma(idiomas[0])
+    controles = [enlaces.enlazar(SimpleNamespace(value=""), clave) for clave in claves_de_texto()]
+    inicio = time.perf_counter()
+    for idioma in idiomas[1:] + idiomas[:1]:
+        enlaces.aplicar(idioma)
+    cambio = (time.perf_counter() - inicio) / len(idiomas)
+    print(f"  cambio de idioma de {len(controles)} textos enlazados: {cambio * 1e6:.0f} µs")
+
+def claves_de_texto():
+    """Claves de texto del idioma predeterminado."""
+    return list(_fuente(PREDETERMINADO)["textos"])
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    main(
+        int(argumentos[0]) if len(argumentos) > 0 else 1000,
+        int(argumentos[1]) if len(argumentos) > 1 else 5
+    )
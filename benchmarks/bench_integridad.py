@@ -0,0 +1,111 @@
+"""
+Benchmark: historial encadenado por hash con un millón de registros.
+
+Escribe el historial por lotes, como el tablero, y compara el costo con la
+escritura sin cadena. Mide la verificación incremental (la de cada apertura),
+la auditoría completa con uno y varios procesos, y comprueba que una
+alteración se detecta: antes del último punto de control solo en la
+auditoría, después también en la verificación incremental.
+
+Uso:
+    python benchmarks/bench_integridad.py [registros] [procesos]
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("REPORTE_HISTORIAL_CLAVE", "00" * 32)  # Clave fija: no se escribe la del usuario
+
+from historial import HistorialReportes, RegistroHistorial
+from integridad import ruta_puntos
+
+LOTE = 1000
+
+def registros_sinteticos(cantidad: int):
+    for i in range(cantidad):
+        yield RegistroHistorial(
+            1_700_000_000.0 + i * 60, f"Municipio {i % 21}", "CEMUPRAD", i % 12, f"Operador {i % 40}",
+            confirmacion=i % 7 == 0, novedad="Calle anegada en el sector 3" if i % 5 == 0 else ""
+        )
+
+def escribir(historial: HistorialReportes, cantidad: int) -> float:
+    lote, inicio = [], time.perf_counter()
+    for registro in registros_sinteticos(cantidad):
+        lote.append(registro)
+        if len(lote) == LOTE:
+            historial.registrar_lote(lote)
+            lote = []
+    historial.registrar_lote(lote)
+    return time.perf_counter() - inicio
+
+def escribir_sin_cadena(ruta: str, cantidad: int) -> float:
+    """La escritura previa a la cadena, como referencia."""
+    lote, inicio = [], time.perf_counter()
+    with open(ruta, "a", encoding="utf-8") as archivo:
+        for registro in registros_sinteticos(cantidad):
+            lote.append(json.dumps(registro.to_dict(), ensure_ascii=False) + "\n")
+            if len(lote) == LOTE:
+                archivo.write("".join(lote))
+                lote = []
+        archivo.write("".join(lote))
+    return time.perf_counter() - inicio
+
+def alterar(ruta: str, numero: int) -> None:
+    """Cambia el municipio del registro `numero` (desde 1) sin tocar su hash."""
+    with open(ruta, "rb") as archivo:
+        lineas = archivo.readlines()
+    lineas[numero - 1] = lineas[numero - 1].replace(b"Municipio", b"Munic1pio", 1)
+    with open(ruta, "wb") as archivo:
+        archivo.writelines(lineas)
+
+def cronometrar(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+def main(cantidad: int = 1_000_000, procesos: int = os.cpu_count() or 1):
+    directorio = tempfile.mkdtemp(prefix="bench_integridad_")
+    try:
+        ruta = os.path.join(directorio, "historial.jsonl")
+        sin_cadena = escribir_sin_cadena(os.path.join(directorio, "plano.jsonl"), cantidad)
+        historial = HistorialReportes(ruta)
+        con_cadena = escribir(historial, cantidad)
+        tamano = os.path.getsize(ruta)
+        plano = os.path.getsize(os.path.join(directorio, "plano.jsonl"))
+        print(f"{cantidad} registros, {tamano / 1024 ** 2:.1f} MiB (+{(tamano - plano) / plano:.0%} por el hash), "
+              f"{os.path.getsize(ruta_puntos(ruta)) / 1024:.0f} KiB de puntos de control")
+        print(f"  escritura por lotes de {LOTE}: {con_cadena:.2f} s con cadena, {sin_cadena:.2f} s sin cadena")
+
+        verificacion, duracion = cronometrar(HistorialReportes(ruta).verificar)
+        print(f"  verificación incremental: {duracion * 1000:.2f} ms "
+              f"({verificacion.verificados} registros verificados), válido {verificacion.valido}")
+
+        secuencial, duracion_secuencial = cronometrar(historial.auditar, 1)
+        paralela, duracion_paralela = cronometrar(historial.auditar, procesos)
+        print(f"  auditoría completa: {duracion_secuencial:.2f} s con 1 proceso, "
+              f"{duracion_paralela:.2f} s con {procesos} ({duracion_secuencial / duracion_paralela:.1f}x), "
+              f"válida {secuencial.valido and paralela.valido}")
+
+        mitad = cantidad // 2
+        alterar(ruta, mitad)
+        incremental = historial.verificar()
+        auditoria = historial.auditar(procesos)
+        print(f"  registro {mitad} alterado: incremental válido {incremental.valido}, "
+              f"auditoría detecta {[r for r, _ in auditoria.errores]}")
+
+        alterar(ruta, cantidad)
+        incremental = historial.verificar()
+        print(f"  registro {cantidad} alterado: incremental detecta {incremental.registro} ({incremental.error})")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    main(
+        int(argumentos[0]) if len(argumentos) > 0 else 1_000_000,
+        int(argumentos[1]) if len(argumentos) > 1 else (os.cpu_count() or 1)
+    )
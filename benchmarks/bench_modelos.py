@@ -0,0 +1,249 @@
+"""
+Suite de escala de la capa de modelos con líneas base.
+
+Mide con datos sintéticos cómo crecen el tiempo y la memoria pico de:
+  - OperadorManager: altas y bajas, y búsquedas, con rosters de 100 a 100k operadores
+  - AppState: arranque con el roster compartido y emisión del tablero por lote
+    (hasta 10k filas: un tablero real tiene decenas y el lote se guarda entero en memoria)
+  - ReportGenerator.generar_reporte y markdown_a_textspan, de 1 a 1M reportes
+
+Cada caso se compara con `lineas_base.json`. La suite falla (código de salida 1)
+si el tiempo o la memoria superan la línea base en más del umbral, o si un caso
+medido no tiene línea base (se graba con --guardar). Antes de cronometrar, cada
+caso corre una vez sin medir (importaciones y cachés en frío). Los casos de
+markdown_a_textspan requieren flet: se omiten solo si no está instalado.
+
+Uso:
+    python benchmarks/bench_modelos.py [--escala rapida|completa] [--umbral 0.25]
+                                       [--caso prefijo] [--guardar]
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from catalogos import obtener_catalogos
+from models import AppState, FilaTablero, Operador, OperadorManager, ReportGenerator
+from roster import ServicioRoster
+
+LINEAS_BASE = os.path.join(os.path.dirname(__file__), "lineas_base.json")
+
+ESCALAS = {
+    "rapida": {"operadores": (100, 1_000, 10_000), "reportes": (1, 100, 10_000)},
+    "completa": {"operadores": (100, 1_000, 10_000, 100_000), "reportes": (1, 100, 10_000, 1_000_000)},
+}
+
+OPERACIONES = 200  # Altas, bajas y búsquedas por caso de roster
+REPETICIONES = 3
+MAX_FILAS_LOTE = 10_000
+# Diferencias menores se consideran ruido aunque superen el umbral relativo
+# (en casos de pocos milisegundos la variación entre pasadas es de ese orden)
+TOLERANCIA_SEGUNDOS = 0.005
+TOLERANCIA_BYTES = 256 * 1024
+
+CARGOS = ("Operador de radio", "Analista de CEMUPRAD", "Coordinador de guardia")
+JERARQUIAS = ("OPC", "OPC I", "OPC II", "Inspector")
+
+Caso = Tuple[str, Callable[[], Callable[[], object]]]
+
+def operadores_sinteticos(cantidad: int) -> Tuple[Operador, ...]:
+    return tuple(
+        Operador(f"Operador {i:06d}", CARGOS[i % len(CARGOS)], JERARQUIAS[i % len(JERARQUIAS)], f"V-{10_000_000 + i}")
+        for i in range(cantidad)
+    )
+
+def casos_roster(cantidad: int) -> List[Caso]:
+    operadores = operadores_sinteticos(cantidad)
+    paso = max(1, cantidad // OPERACIONES)
+    nombres = [operadores[i].nombre for i in range(0, cantidad, paso)][:OPERACIONES]
+    cedulas = [operadores[i].cedula for i in range(0, cantidad, paso)][:OPERACIONES]
+
+    def preparar_manager() -> OperadorManager:
+        return OperadorManager(servicio=ServicioRoster(operadores))
+
+    def altas_bajas():
+        manager = preparar_manager()
+
+        def correr():
+            for i in range(OPERACIONES):
+                manager.agregar_operador(f"Temporal {i}", CARGOS[0], JERARQUIAS[0], f"T-{i}", guardar=False)
+            for i in range(OPERACIONES):
+                manager.eliminar_operador(f"Temporal {i}", guardar=False)
+        return correr
+
+    def busquedas():
+        manager = preparar_manager()
+
+        def correr():
+            for nombre, cedula in zip(nombres, cedulas):
+                manager.buscar_por_nombre(nombre)
+                manager.buscar_por_cedula(cedula)
+                manager.obtener_indice_por_nombre(nombre)
+        return correr
+
+    def arranque_estado():
+        servicio = ServicioRoster(operadores)
+        return lambda: AppState(servicio_roster=servicio)
+
+    return [
+        (f"roster.altas_bajas[{cantidad}]", altas_bajas),
+        (f"roster.busquedas[{cantidad}]", busquedas),
+        (f"estado.arranque[{cantidad}]", arranque_estado),
+    ]
+
+def casos_reportes(cantidad: int) -> List[Caso]:
+    tiempos = len(obtener_catalogos().tiempo)
+    operador = Operador("Rubén Rojas", "Analista de CEMUPRAD", "OPC I", "V-28.702.206")
+    municipios = [f"Municipio {i}" for i in range(min(cantidad, 1_000))]
+
+    def generar():
+        def correr():
+            for i in range(cantidad):
+                ReportGenerator.generar_reporte(i % tiempos, operador, municipios[i % len(municipios)], "CEMUPRAD")
+        return correr
+
+    def spans():
+        textos = [
+            ReportGenerator.generar_reporte(i % tiempos, operador, municipios[i % len(municipios)], "CEMUPRAD")
+            for i in range(min(cantidad, len(municipios) * tiempos))
+        ]
+
+        def correr():
+            for i in range(cantidad):
+                ReportGenerator.markdown_a_textspan(textos[i % len(textos)])
+        return correr
+
+    def lote():
+        # Un tablero con una fila por municipio; cada pasada usa un minuto nuevo
+        app_state = AppState(servicio_roster=ServicioRoster(operadores_sinteticos(100)))
+        filas = [FilaTablero(municipios[i % len(municipios)], i % tiempos) for i in range(cantidad)]
+
+        def correr():
+            app_state.deduplicador = type(app_state.deduplicador)()
+            return app_state.emitir_lote(filas, [operador])
+        return correr
+
+    casos = [(f"reportes.generar[{cantidad}]", generar)]
+    if cantidad <= MAX_FILAS_LOTE:
+        casos.append((f"estado.emitir_lote[{cantidad}]", lote))
+    if _flet_disponible():
+        casos.append((f"reportes.textspan[{cantidad}]", spans))
+    return casos
+
+def _flet_disponible() -> bool:
+    try:
+        import flet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def medir(preparar: Callable[[], Callable[[], object]], repeticiones: int) -> Dict[str, float]:
+    """Mejor tiempo de varias pasadas y memoria pico de una pasada aparte."""
+    preparar()()  # Calentamiento: la primera pasada paga importaciones y cachés
+    tiempos = []
+    for _ in range(repeticiones):
+        correr = preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        correr()
+        tiempos.append(time.perf_counter() - inicio)
+
+    # tracemalloc encarece cada asignación: la memoria se mide sin cronometrar
+    correr = preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        resultado = correr()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return {"segundos": min(tiempos), "pico_bytes": pico}
+
+def comparar(nombre: str, actual: Dict[str, float], base: Optional[Dict[str, float]], umbral: float) -> List[str]:
+    """Regresiones del caso frente a su línea base."""
+    if base is None:
+        return [f"{nombre}: sin línea base (grábala con --guardar)"]
+    regresiones = []
+    for metrica, tolerancia in (("segundos", TOLERANCIA_SEGUNDOS), ("pico_bytes", TOLERANCIA_BYTES)):
+        limite = base[metrica] * (1 + umbral)
+        if actual[metrica] > limite and actual[metrica] - base[metrica] > tolerancia:
+            regresiones.append(f"{nombre}: {metrica} {actual[metrica]:.6g} > {limite:.6g} (base {base[metrica]:.6g})")
+    return regresiones
+
+def _formato_bytes(cantidad: float) -> str:
+    return f"{cantidad / 1024:10.1f} KiB" if cantidad < 1024 ** 2 else f"{cantidad / 1024 ** 2:10.1f} MiB"
+
+def cargar_lineas_base() -> Dict:
+    try:
+        with open(LINEAS_BASE, encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return {"casos": {}}
+
+def guardar_lineas_base(lineas: Dict, resultados: Dict[str, Dict[str, float]]) -> None:
+    lineas["casos"].update(resultados)
+    lineas["entorno"] = {
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "fecha": datetime.date.today().isoformat(),
+    }
+    lineas["casos"] = dict(sorted(lineas["casos"].items()))
+    with open(LINEAS_BASE, "w", encoding="utf-8") as archivo:
+        json.dump(lineas, archivo, ensure_ascii=False, indent=2)
+        archivo.write("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de escala de la capa de modelos")
+    parser.add_argument("--escala", choices=ESCALAS, default="rapida")
+    parser.add_argument("--umbral", type=float, default=0.25, help="Regresión relativa tolerada (0.25 = 25 %%)")
+    parser.add_argument("--caso", default="", help="Solo los casos cuyo nombre empieza así")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--guardar", action="store_true", help="Actualizar las líneas base con estos resultados")
+    args = parser.parse_args()
+
+    escala = ESCALAS[args.escala]
+    casos: List[Caso] = []
+    for cantidad in escala["operadores"]:
+        casos += casos_roster(cantidad)
+    for cantidad in escala["reportes"]:
+        casos += casos_reportes(cantidad)
+    casos = [c for c in casos if c[0].startswith(args.caso)]
+    if not _flet_disponible():
+        print("flet no está instalado: se omiten los casos de markdown_a_textspan")
+
+    lineas = cargar_lineas_base()
+    resultados, regresiones = {}, []
+    for nombre, preparar in casos:
+        actual = medir(preparar, args.repeticiones)
+        base = lineas["casos"].get(nombre)
+        resultados[nombre] = actual
+        fallos = comparar(nombre, actual, base, args.umbral)
+        regresiones += fallos
+        relacion = f"{actual['segundos'] / base['segundos']:6.2f}x" if base else "   nuevo"
+        print(
+            f"{nombre:<32} {actual['segundos'] * 1000:10.2f} ms {_formato_bytes(actual['pico_bytes'])}"
+            f"  {relacion}{'  REGRESIÓN' if fallos else ''}"
+        )
+
+    if args.guardar:
+        guardar_lineas_base(lineas, resultados)
+        print(f"Líneas base actualizadas en {LINEAS_BASE}")
+        return 0
+    if regresiones:
+        print(f"\n{len(regresiones)} regresiones (umbral {args.umbral:.0%}):")
+        for regresion in regresiones:
+            print(f"  {regresion}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark: autocompletado de novedades con años de historial.
+
+Llena el índice con novedades sintéticas (muchas repetidas, como en la
+práctica) repartidas entre municipios y mide el costo de cada tecla al
+escribir novedades existentes, el de registrar una novedad nueva y la
+memoria del índice. Compara las sugerencias con un recorrido lineal de
+todas las novedades del municipio, también con prefijos más largos que la
+profundidad del trie.
+
+Uso:
+    python benchmarks/bench_novedades.py [novedades] [municipios]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from historial import RegistroHistorial
+from novedades import IndiceNovedades, normalizar
+
+EVENTOS = (
+    "Caída de árbol en {lugar}",
+    "Inundación en el sector {lugar}",
+    "Deslizamiento de tierra en {lugar}",
+    "Calle anegada en {lugar}",
+    "Poste eléctrico caído en {lugar}",
+    "Crecida de quebrada en {lugar}",
+    "Vivienda afectada por lluvias en {lugar}",
+    "Corte de vía en {lugar}",
+)
+
+def novedades_sinteticas(cantidad: int, municipios: int, rng: random.Random):
+    lugares = [f"{tipo} {n}" for tipo in ("calle", "avenida", "barrio", "vereda") for n in range(1, 60)]
+    for _ in range(cantidad):
+        # Pocos lugares concentran la mayoría de los eventos
+        lugar = lugares[min(int(rng.expovariate(1 / 25)), len(lugares) - 1)]
+        yield f"Municipio {rng.randrange(municipios)}", rng.choice(EVENTOS).format(lugar=lugar)
+
+def sugerir_lineal(frecuencias: Counter, municipio: str, prefijo: str, limite: int = 5):
+    clave = normalizar(prefijo)
+    candidatos = [(n, t) for (m, t), n in frecuencias.items() if m == municipio and normalizar(t).startswith(clave)]
+    return [t for _, t in sorted(candidatos, key=lambda c: -c[0])[:limite]]
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+def main(cantidad: int = 500_000, municipios: int = 21):
+    rng = random.Random(3)
+    datos = list(novedades_sinteticas(cantidad, municipios, rng))
+
+    registros = [RegistroHistorial(float(i), m, "CEMUPRAD", 0, "", novedad=t) for i, (m, t) in enumerate(datos)]
+
+    inicio = time.perf_counter()
+    indice = IndiceNovedades()
+    indice.cargar(registros)
+    carga = time.perf_counter() - inicio
+    tracemalloc.start()
+    IndiceNovedades().cargar(registros)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    print(f"{cantidad} novedades ({len(indice)} distintas, {municipios} municipios)")
+    print(f"  carga desde el historial: {carga:.2f} s, memoria pico {pico / 1024 ** 2:.1f} MiB")
+
+    # Cada tecla al escribir novedades existentes
+    teclas = []
+    for municipio, texto in rng.sample(datos, 300):
+        for i in range(len(texto) + 1):
+            inicio = time.perf_counter()
+            indice.sugerir(municipio, texto[:i])
+            teclas.append(time.perf_counter() - inicio)
+    print(
+        f"  por tecla ({len(teclas)}): p50 {percentil(teclas, 0.5) * 1e6:.1f} µs, "
+        f"p99 {percentil(teclas, 0.99) * 1e6:.1f} µs, máx {max(teclas) * 1e6:.1f} µs"
+    )
+
+    frecuencias = Counter(datos)
+    registros = []
+    for municipio, texto in rng.sample(datos, 2000):
+        inicio = time.perf_counter()
+        indice.registrar(municipio, texto)
+        registros.append(time.perf_counter() - inicio)
+        frecuencias[(municipio, texto)] += 1
+    print(f"  registrar: p50 {percentil(registros, 0.5) * 1e6:.1f} µs, máx {max(registros) * 1e6:.1f} µs")
+
+    # Mismas frecuencias que el recorrido lineal (los empates pueden ordenarse distinto)
+    consultas = [(m, t[:rng.randrange(0, 12)]) for m, t in rng.sample(datos, 200)]
+    diferencias = contrastar(indice, frecuencias, consultas)
+    inicio = time.perf_counter()
+    for municipio, prefijo in consultas:
+        sugerir_lineal(frecuencias, municipio, prefijo)
+    lineal = (time.perf_counter() - inicio) / len(consultas)
+    print(f"  recorrido lineal: {lineal * 1000:.2f} ms por tecla, {diferencias} diferencias con el índice")
+
+    # Prefijos más largos que el trie: se resuelven con las claves del nodo del corte
+    largas = [(m, t) for m, t in datos if len(normalizar(t)) > indice.profundidad + 1]
+    consultas = [(m, t[:rng.randrange(indice.profundidad + 1, len(t) + 1)]) for m, t in rng.sample(largas, 200)]
+    print(f"  prefijos de más de {indice.profundidad} caracteres: "
+          f"{contrastar(indice, frecuencias, consultas)} diferencias con el recorrido lineal")
+
+def contrastar(indice: IndiceNovedades, frecuencias: Counter, consultas) -> int:
+    """Consultas cuyas frecuencias sugeridas difieren del recorrido lineal."""
+    diferencias = 0
+    for municipio, prefijo in consultas:
+        esperadas = [frecuencias[(municipio, t)] for t in sugerir_lineal(frecuencias, municipio, prefijo)]
+        obtenidas = [frecuencias[(municipio, t)] for t in indice.sugerir(municipio, prefijo)]
+        diferencias += esperadas != obtenidas
+    return diferencias
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    main(
+        int(argumentos[0]) if len(argumentos) > 0 else 500_000,
+        int(argumentos[1]) if len(argumentos) > 1 else 21
+    )
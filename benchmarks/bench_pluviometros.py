@@ -0,0 +1,71 @@
+"""
+Benchmark: ingesta de pluviómetros a 1 Hz.
+
+Simula N sensores repartidos entre los municipios, cada uno escribiendo una
+lectura por segundo en el CSV de su estación (diez sensores por archivo), y
+mide cuánto tarda cada ciclo de la ingesta (leer las líneas nuevas,
+interpretarlas, acumularlas y recalcular las tasas y sugerencias) frente al
+presupuesto de un segundo. Requiere NumPy.
+
+Uso:
+    python benchmarks/bench_pluviometros.py [100 1000 5000]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from pluviometros import IngestaPluviometros
+
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+SENSORES_POR_ESTACION = 10
+
+def medir(sensores: int, segundos: int = 120, semilla: int = 3):
+    rng = random.Random(semilla)
+    inicio = time.time() - segundos
+    with tempfile.TemporaryDirectory() as directorio:
+        estaciones = [
+            open(os.path.join(directorio, f"estacion_{i}.csv"), "a", encoding="utf-8")
+            for i in range((sensores + SENSORES_POR_ESTACION - 1) // SENSORES_POR_ESTACION)
+        ]
+        municipio_de = [MUNICIPIOS[(i // SENSORES_POR_ESTACION) % len(MUNICIPIOS)] for i in range(sensores)]
+        # Intensidad (mm/h) de cada municipio; cambia de vez en cuando
+        intensidad = {m: rng.choice((0, 0, 1, 4, 12)) for m in MUNICIPIOS}
+
+        ingesta = IngestaPluviometros(directorio)
+        ingesta.leer_lecturas()  # Primer recorrido: los archivos vacíos se siguen desde el final
+        ciclos, sugerencias = [], 0
+        for segundo in range(segundos):
+            momento = inicio + segundo
+            if rng.random() < 0.05:
+                intensidad[rng.choice(MUNICIPIOS)] = rng.choice((0, 1, 4, 12))
+            for sensor in range(sensores):
+                municipio = municipio_de[sensor]
+                mm = max(0.0, rng.gauss(intensidad[municipio], 0.3)) / 3600
+                estaciones[sensor // SENSORES_POR_ESTACION].write(f"{momento:.1f},s{sensor},{municipio},{mm:.6f}\n")
+            for estacion in estaciones:
+                estacion.flush()
+
+            t0 = time.perf_counter()
+            sugerencias += len(ingesta.procesar(ingesta.leer_lecturas(), momento))
+            ciclos.append(time.perf_counter() - t0)
+
+        for estacion in estaciones:
+            estacion.close()
+
+    ciclos.sort()
+    print(
+        f"{sensores:>5} sensores ({len(estaciones)} archivos): ciclo mediano {statistics.median(ciclos) * 1000:7.2f} ms, "
+        f"p99 {ciclos[int(len(ciclos) * 0.99)] * 1000:7.2f} ms, "
+        f"uso del segundo {sum(ciclos) / segundos * 100:5.1f} %, {sugerencias} sugerencias publicadas"
+    )
+
+if __name__ == "__main__":
+    for cantidad in (int(n) for n in (sys.argv[1:] or ["100", "1000", "5000"])):
+        medir(cantidad)
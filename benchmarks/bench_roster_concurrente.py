@@ -0,0 +1,75 @@
+"""
+Prueba de estrés del roster compartido: rendimiento de lectura con y sin
+escritores concurrentes.
+
+Uso:
+    python benchmarks/bench_roster_concurrente.py [operadores] [segundos]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models import Operador, OperadorManager
+from roster import ServicioRoster
+
+LECTORES = 4
+ESCRITORES = 2
+
+def fase(servicio: ServicioRoster, nombres, segundos: float, escritores: int):
+    detener = threading.Event()
+    lecturas = [0] * LECTORES
+    escrituras = [0] * escritores
+
+    def lector(n):
+        manager = OperadorManager(servicio=servicio)
+        i = 0
+        while not detener.is_set():
+            manager.buscar_por_nombre(nombres[i % len(nombres)])
+            manager.obtener_operador_por_indice(i % 50)
+            i += 1
+        lecturas[n] = i
+
+    def escritor(n):
+        manager = OperadorManager(servicio=servicio)
+        i = 0
+        while not detener.is_set():
+            nombre = f"Temporal {n}-{i}"
+            manager.agregar_operador(nombre, "Operador de radio", "OPC", f"T-{n}-{i}", guardar=False)
+            manager.eliminar_operador(nombre, guardar=False)
+            i += 1
+        escrituras[n] = i * 2
+
+    hilos = [threading.Thread(target=lector, args=(n,)) for n in range(LECTORES)]
+    hilos += [threading.Thread(target=escritor, args=(n,)) for n in range(escritores)]
+    conflictos = servicio.conflictos
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(segundos)
+    detener.set()
+    for hilo in hilos:
+        hilo.join()
+
+    print(
+        f"escritores={escritores}: {sum(lecturas) / segundos:12,.0f} lecturas/s, "
+        f"{sum(escrituras) / segundos:9,.0f} escrituras/s, "
+        f"{servicio.conflictos - conflictos} conflictos"
+    )
+
+def main(cantidad: int = 1000, segundos: float = 2.0):
+    operadores = tuple(
+        Operador(f"Operador {i}", "Operador de radio", "OPC", f"V-{i}") for i in range(cantidad)
+    )
+    servicio = ServicioRoster(operadores)
+    nombres = [op.nombre for op in operadores]
+
+    fase(servicio, nombres, segundos, 0)
+    fase(servicio, nombres, segundos, ESCRITORES)
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    )
@@ -0,0 +1,85 @@
+"""
+Benchmark: memoria y tiempo de construcción por sesión web.
+
+Construye N sesiones simultáneas (estado y componentes de la interfaz) sobre
+una página mínima en memoria y mide el tiempo y la memoria asignada por
+sesión con tracemalloc. Requiere flet instalado.
+
+Uso:
+    python benchmarks/bench_sesiones.py [1 10 100]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import DEFAULT_OPERATORS
+from models import AppState
+from ui_components import (
+    ReportDisplay, WeatherSelector, OperatorSelector, ActionButtons, SettingsDialog
+)
+
+class AlmacenamientoEnMemoria:
+    """Almacenamiento con la misma interfaz que page.client_storage."""
+
+    def __init__(self):
+        self._datos = {"operators": json.dumps(DEFAULT_OPERATORS)}
+
+    def get(self, clave):
+        return self._datos.get(clave)
+
+    def set(self, clave, valor):
+        self._datos[clave] = valor
+
+    def contains_key(self, clave):
+        return clave in self._datos
+
+    def remove(self, clave):
+        self._datos.pop(clave, None)
+
+class PaginaEnMemoria:
+    """Página mínima para construir los componentes sin cliente conectado."""
+
+    def __init__(self):
+        self.client_storage = AlmacenamientoEnMemoria()
+
+def construir_sesion():
+    page = PaginaEnMemoria()
+    app_state = AppState(page=page)
+    noop = lambda *args: None
+    operator_selector = OperatorSelector(app_state, noop)
+    componentes = (
+        app_state,
+        WeatherSelector(app_state, noop),
+        operator_selector,
+        SettingsDialog(app_state, page, noop),
+        ReportDisplay(app_state),
+        ActionButtons(app_state, operator_selector, page)
+    )
+    componentes[4].update_report()
+    return componentes
+
+def medir(cantidad: int):
+    construir_sesion()  # Calentar cachés compartidas e importaciones
+
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    inicio = time.perf_counter()
+    sesiones = [construir_sesion() for _ in range(cantidad)]
+    duracion = time.perf_counter() - inicio
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{cantidad:>4} sesiones: {duracion / cantidad * 1000:7.2f} ms/sesión, "
+        f"{(actual - base) / cantidad / 1024:8.1f} KiB/sesión, "
+        f"pico {(pico - base) / 1024 / 1024:6.2f} MiB"
+    )
+    return sesiones
+
+if __name__ == "__main__":
+    for cantidad in (int(n) for n in (sys.argv[1:] or ["1", "10", "100"])):
+        medir(cantidad)
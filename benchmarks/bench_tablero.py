@@ -0,0 +1,88 @@
+"""
+Benchmark: construcción y refresco del tablero de municipios.
+
+Arma un tablero con N municipios sobre una página mínima en memoria y mide
+cuánto tarda en abrirse (solo se construye la primera tanda de filas), en
+construir todas las filas al desplazarse y en refrescarlo cuando cambia el
+minuto o cuando no cambia nada. Requiere flet instalado.
+
+Uso:
+    python benchmarks/bench_tablero.py [50 200 1000]
+"""
+import datetime
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import DEFAULT_OPERATORS, ESTADO
+from territorio import obtener_catalogo_territorial
+from models import AppState
+from ui_components import DashboardView
+
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+
+class AlmacenamientoEnMemoria:
+    """Almacenamiento con la misma interfaz que page.client_storage."""
+
+    def __init__(self, tablero):
+        self._datos = {"operators": json.dumps(DEFAULT_OPERATORS), "dashboard": json.dumps(tablero)}
+
+    def get(self, clave):
+        return self._datos.get(clave)
+
+    def set(self, clave, valor):
+        self._datos[clave] = valor
+
+    def contains_key(self, clave):
+        return clave in self._datos
+
+class PaginaEnMemoria:
+    """Página mínima que cuenta los controles enviados en cada actualización."""
+
+    def __init__(self, tablero):
+        self.client_storage = AlmacenamientoEnMemoria(tablero)
+        self.enviados = 0
+
+    def update(self, *controles):
+        self.enviados += len(controles)
+
+def medir(cantidad: int):
+    tablero = [[f"{MUNICIPIOS[i % len(MUNICIPIOS)]} {i}", i % 10] for i in range(cantidad)]
+    page = PaginaEnMemoria(tablero)
+    app_state = AppState(page=page)
+
+    inicio = time.perf_counter()
+    vista = DashboardView(app_state, page)
+    apertura = time.perf_counter() - inicio
+    filas_iniciales = len(vista.rows)
+
+    inicio = time.perf_counter()
+    while vista._build_more():
+        pass
+    completo = time.perf_counter() - inicio
+
+    ahora = datetime.datetime.now()
+    for row in vista.rows:
+        row.refrescar(ahora)
+    inicio = time.perf_counter()
+    for row in vista.rows:
+        row.refrescar(ahora)
+    sin_cambios = time.perf_counter() - inicio
+
+    page.enviados = 0
+    inicio = time.perf_counter()
+    vista.refresh(momento=ahora + datetime.timedelta(minutes=1))
+    minuto = time.perf_counter() - inicio
+
+    print(
+        f"{cantidad:>5} municipios: apertura {apertura * 1000:7.2f} ms ({filas_iniciales} filas), "
+        f"resto {completo * 1000:8.2f} ms, refresco sin cambios {sin_cambios * 1000:6.2f} ms, "
+        f"refresco de minuto {minuto * 1000:6.2f} ms ({page.enviados} controles enviados)"
+    )
+
+if __name__ == "__main__":
+    for cantidad in (int(n) for n in (sys.argv[1:] or ["50", "200", "1000"])):
+        medir(cantidad)
@@ -0,0 +1,110 @@
+"""
+Benchmark: consulta del operador de guardia.
+
+Genera seis meses de rotaciones para cientos de operadores repartidos entre
+los municipios, más excepciones puntuales, y compara el índice de intervalos
+(construcción por ventana y consulta por bisección) con un recorrido lineal
+de todos los turnos. Verifica que ambos coincidan en una muestra aleatoria.
+
+Uso:
+    python benchmarks/bench_turnos.py [operadores] [excepciones]
+"""
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import ESTADO
+from territorio import obtener_catalogo_territorial
+from turnos import TODOS, CalendarioTurnos
+
+MUNICIPIOS = tuple(m.nombre for m in obtener_catalogo_territorial().municipios_de(ESTADO))
+HORA = 3600
+
+def generar(operadores: int, excepciones: int, inicio: float, dias: int, rng: random.Random) -> CalendarioTurnos:
+    """Turnos de 12 horas rotando entre los operadores de cada municipio."""
+    por_municipio = max(2, operadores // len(MUNICIPIOS))
+    datos = {"rotaciones": [], "excepciones": []}
+    nombre = 0
+    for municipio in MUNICIPIOS:
+        for turno in range(por_municipio):
+            datos["rotaciones"].append([
+                f"Operador {nombre}", municipio, inicio + turno * 12 * HORA,
+                12, 12 * por_municipio, inicio + dias * 86400
+            ])
+            nombre += 1
+    # Guardia estatal de respaldo, un operador por semana
+    for semana in range(dias // 7 + 1):
+        datos["rotaciones"].append([
+            f"Operador {semana % nombre}", TODOS, inicio + semana * 7 * 86400, 7 * 24, 1e9, None
+        ])
+    for _ in range(excepciones):
+        desde = inicio + rng.uniform(0, dias * 86400)
+        municipio = rng.choice(MUNICIPIOS + (TODOS,))
+        datos["excepciones"].append([
+            f"Operador {rng.randrange(nombre)}", municipio, desde, desde + rng.uniform(1, 48) * HORA
+        ])
+    return CalendarioTurnos.desde_dict(datos)
+
+def en_guardia_lineal(calendario: CalendarioTurnos, momento: float, municipio: str):
+    """Misma precedencia que el índice, recorriendo todos los turnos."""
+    mejor = None
+    for secuencia, excepcion in enumerate(calendario.excepciones):
+        if excepcion.municipio in (municipio, TODOS) and excepcion.inicio <= momento < excepcion.fin:
+            clave = (3 if excepcion.municipio == municipio else 2, excepcion.inicio, secuencia)
+            if mejor is None or clave > mejor[0]:
+                mejor = (clave, excepcion.operador)
+    if mejor:
+        return mejor[1]
+    for secuencia, rotacion in enumerate(calendario.rotaciones):
+        if rotacion.municipio in (municipio, TODOS):
+            for inicio, fin in rotacion.turnos(momento, momento + 1):
+                if inicio <= momento < fin:
+                    clave = (1 if rotacion.municipio == municipio else 0, inicio, secuencia)
+                    if mejor is None or clave > mejor[0]:
+                        mejor = (clave, rotacion.operador)
+    return mejor[1] if mejor else None
+
+def medir(operadores: int, excepciones: int, dias: int = 182, consultas: int = 100_000, semilla: int = 11):
+    rng = random.Random(semilla)
+    inicio = datetime.datetime(2026, 1, 1).timestamp()
+    calendario = generar(operadores, excepciones, inicio, dias, rng)
+    print(
+        f"{operadores} operadores, {len(calendario.rotaciones)} rotaciones, "
+        f"{len(calendario.excepciones)} excepciones, {dias} días"
+    )
+
+    # Consultas agrupadas en el tiempo, como las del minutero y los lotes
+    momentos = sorted(inicio + rng.uniform(0, dias * 86400) for _ in range(consultas))
+    pares = [(m, rng.choice(MUNICIPIOS)) for m in momentos]
+
+    t0 = time.perf_counter()
+    for municipio in MUNICIPIOS:
+        calendario.en_guardia(inicio, municipio)
+    construccion = (time.perf_counter() - t0) / len(MUNICIPIOS)
+
+    t0 = time.perf_counter()
+    for momento, municipio in pares:
+        calendario.en_guardia(momento, municipio)
+    indice = time.perf_counter() - t0
+
+    muestra = pares[::max(1, consultas // 500)]
+    t0 = time.perf_counter()
+    lineales = [en_guardia_lineal(calendario, m, municipio) for m, municipio in muestra]
+    lineal = (time.perf_counter() - t0) / len(muestra)
+
+    distintos = sum(
+        calendario.en_guardia(m, municipio) != esperado
+        for (m, municipio), esperado in zip(muestra, lineales)
+    )
+    print(f"  índice por municipio y ventana: {construccion * 1000:8.2f} ms de construcción")
+    print(f"  consulta con índice:            {indice / consultas * 1e6:8.2f} µs (incluye reconstrucciones)")
+    print(f"  consulta lineal:                {lineal * 1e6:8.2f} µs")
+    print(f"  discrepancias en {len(muestra)} muestras: {distintos}")
+
+if __name__ == "__main__":
+    argumentos = [int(a) for a in sys.argv[1:]]
+    medir(*(argumentos + [300, 1000][len(argumentos):]))
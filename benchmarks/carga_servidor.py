@@ -0,0 +1,82 @@
+"""
+Prueba de carga del servidor JSON de reportes.
+
+Abre varias conexiones persistentes en paralelo y reporta solicitudes por
+segundo y latencias (p50/p99). Si no se indica --url, levanta un servidor
+local en un puerto libre.
+
+Uso:
+    python benchmarks/carga_servidor.py [--url http://127.0.0.1:8765] [--conexiones 8] [--solicitudes 2000]
+"""
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+RUTAS = (
+    "/reporte?municipio=Guanta&tiempo=3&operador=Rub%C3%A9n%20Rojas&formato=json",
+    "/reporte?municipio=Anaco&tiempo=5&formato=whatsapp",
+    "/operadores",
+    "/catalogo"
+)
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+def cliente(host, puerto, solicitudes, latencias, errores):
+    conexion = http.client.HTTPConnection(host, puerto, timeout=10)
+    for i in range(solicitudes):
+        inicio = time.perf_counter()
+        conexion.request("GET", RUTAS[i % len(RUTAS)])
+        respuesta = conexion.getresponse()
+        respuesta.read()
+        latencias.append(time.perf_counter() - inicio)
+        if respuesta.status != 200:
+            errores.append(respuesta.status)
+    conexion.close()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--conexiones", type=int, default=8)
+    parser.add_argument("--solicitudes", type=int, default=2000, help="Solicitudes por conexión")
+    args = parser.parse_args()
+
+    servidor = None
+    if args.url:
+        url = urlparse(args.url)
+        host, puerto = url.hostname, url.port
+    else:
+        from servidor import ApiReportes, cargar_roster, crear_servidor
+        servidor = crear_servidor("127.0.0.1", 0, ApiReportes(cargar_roster(None)))
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        host, puerto = servidor.server_address
+
+    latencias, errores = [], []
+    hilos = [
+        threading.Thread(target=cliente, args=(host, puerto, args.solicitudes, latencias, errores))
+        for _ in range(args.conexiones)
+    ]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    print(f"{len(latencias)} solicitudes en {duracion:.2f} s con {args.conexiones} conexiones")
+    print(f"{len(latencias) / duracion:,.0f} solicitudes/s, "
+          f"p50 {percentil(latencias, 0.50) * 1000:.2f} ms, p99 {percentil(latencias, 0.99) * 1000:.2f} ms, "
+          f"errores: {len(errores)}")
+
+    if servidor:
+        servidor.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Simulación: recordatorios con reloj virtual.
+
+Conduce ProgramadorRecordatorios con RelojVirtual a lo largo de varias horas
+simuladas y verifica que los avisos de reportes vencidos salgan exactamente
+cuando corresponde (último reporte + cadencia + tolerancia, y luego cada
+cadencia), que el reloj de minutos marque cada frontera de minuto, que un
+reporte nuevo reprograme el aviso y que, tras un reinicio, un programador
+cargado desde el historial avise una sola vez por lo atrasado y siga el
+mismo calendario.
+
+Uso:
+    python benchmarks/sim_recordatorios.py [horas]
+"""
+import asyncio
+import os
+import sys
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import RECORDATORIOS
+from historial import RegistroHistorial
+from recordatorios import ProgramadorRecordatorios, RelojVirtual
+
+INICIO = 36000.0  # Múltiplo de 60 para que los minutos caigan en la frontera
+CADENCIAS = {"Municipio A": 1800, "Municipio B": 1200}
+
+def historial_inicial() -> List[RegistroHistorial]:
+    """Seis reportes por municipio con cadencia regular, el último en INICIO."""
+    registros = []
+    for municipio, intervalo in CADENCIAS.items():
+        for i in range(6, 0, -1):
+            registros.append(RegistroHistorial(INICIO - (i - 1) * intervalo, municipio, "CEMUPRAD", 0, ""))
+    return sorted(registros, key=lambda r: r.momento)
+
+def esperados(ultimos: dict, desde: float, hasta: float) -> List[Tuple[float, str]]:
+    """Avisos que deberían salir en (desde, hasta] según el último reporte de cada municipio."""
+    avisos = []
+    for municipio, ultimo in ultimos.items():
+        momento = ultimo + CADENCIAS[municipio] + RECORDATORIOS["tolerancia"]
+        while momento <= hasta:
+            if momento > desde:
+                avisos.append((momento, municipio))
+            momento += CADENCIAS[municipio]
+    return sorted(avisos)
+
+class Sesion:
+    """Un programador en marcha sobre un reloj virtual, con lo que va avisando."""
+
+    def __init__(self, inicio: float, registros: List[RegistroHistorial]):
+        self.reloj = RelojVirtual(inicio)
+        self.avisos: List[Tuple[float, str]] = []
+        self.minutos: List[float] = []
+        self.programador = ProgramadorRecordatorios(
+            on_vencido=lambda municipio, ultimo: self.avisos.append((self.reloj.ahora(), municipio)),
+            on_minuto=lambda: self.minutos.append(self.reloj.ahora()),
+            reloj=self.reloj
+        )
+        self.programador.cargar_historial(registros)
+        self.tarea = None
+
+    async def arrancar(self) -> None:
+        self.tarea = asyncio.create_task(self.programador.ejecutar())
+        await self.reloj.avanzar(0)
+
+    async def detener(self) -> None:
+        self.programador.detener()
+        await self.tarea
+
+def verificar(nombre: str, obtenido, esperado) -> bool:
+    correcto = obtenido == esperado
+    print(f"  {nombre}: {'ok' if correcto else 'FALLA'}")
+    if not correcto:
+        print(f"    esperado: {esperado}")
+        print(f"    obtenido: {obtenido}")
+    return correcto
+
+async def simular(horas: int) -> bool:
+    registros = historial_inicial()
+    ultimos = {m: INICIO for m in CADENCIAS}
+    correcto = True
+
+    # 1. Sin reportes nuevos: avisos a su hora y un tic por minuto
+    sesion = Sesion(INICIO, registros)
+    await sesion.arrancar()
+    fin = INICIO + horas * 3600
+    await sesion.reloj.avanzar(fin - INICIO)
+    print(f"Primera sesión ({horas} h simuladas)")
+    correcto &= verificar("avisos a su hora", sesion.avisos, esperados(ultimos, INICIO, fin))
+    correcto &= verificar("tic en cada minuto", sesion.minutos, [INICIO + 60 * (i + 1) for i in range(horas * 60)])
+
+    # 2. Los reportes nuevos reprograman el aviso de su municipio
+    momento = fin + 600
+    await sesion.reloj.avanzar(600)
+    sesion.avisos.clear()
+    for municipio in CADENCIAS:
+        sesion.programador.registrar_reporte(municipio, momento)
+        registros.append(RegistroHistorial(momento, municipio, "CEMUPRAD", 0, ""))
+        ultimos[municipio] = momento
+    await sesion.reloj.avanzar(3600)
+    print("Reportes nuevos")
+    correcto &= verificar("avisos reprogramados", sesion.avisos, esperados(ultimos, momento, momento + 3600))
+    await sesion.detener()
+
+    # 3. Reinicio tras horas apagado: un solo aviso por municipio atrasado y luego el calendario de siempre
+    reinicio = momento + horas * 3600 + 120
+    sesion = Sesion(reinicio, registros)
+    await sesion.arrancar()
+    await sesion.reloj.avanzar(3600)
+    print("Reinicio")
+    atrasados = sorted((reinicio, m) for m in CADENCIAS)
+    correcto &= verificar(
+        "avisos tras cargar el historial", sorted(sesion.avisos), atrasados + esperados(ultimos, reinicio, reinicio + 3600)
+    )
+
+    # 4. Un reporte registrado después del reinicio también reprograma
+    momento = reinicio + 3600
+    sesion.avisos.clear()
+    sesion.programador.registrar_reporte("Municipio B", momento)
+    ultimos["Municipio B"] = momento
+    await sesion.reloj.avanzar(horas * 3600)
+    correcto &= verificar(
+        "registro tras el reinicio", sesion.avisos, esperados(ultimos, momento, momento + horas * 3600)
+    )
+    minutos = [reinicio + 60 * (i + 1) for i in range((horas + 1) * 60)]
+    correcto &= verificar("tic en cada minuto", sesion.minutos, minutos)
+    await sesion.detener()
+    return correcto
+
+def main(horas: int) -> int:
+    correcto = asyncio.run(simular(horas))
+    print("Recordatorios correctos" if correcto else "Recordatorios con errores")
+    return 0 if correcto else 1
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    sys.exit(main(int(argumentos[0]) if argumentos else 6))
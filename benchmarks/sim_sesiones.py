@@ -0,0 +1,121 @@
+"""
+Simulación: sesiones abiertas por días con presupuesto de memoria.
+
+Abre N sesiones con su propia copia del roster y reportes en caché, deja la
+mayoría inactiva y revisa el registro de sesiones: primero solo por
+presupuesto y después por inactividad. Informa la memoria medida por el
+registro, la memoria real (tracemalloc) antes y después de liberar, el costo
+de cada revisión y comprueba que una sesión liberada vuelve a tener el
+roster completo al usarse.
+
+Uso:
+    python benchmarks/sim_sesiones.py [sesiones] [operadores] [presupuesto_mb]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from codificacion import codificar_operadores
+from models import AppState
+from sesiones import INACTIVIDAD, PRESUPUESTO, RegistroSesiones, tamano_profundo
+
+class AlmacenamientoEnMemoria:
+    """Almacenamiento con la misma interfaz que page.client_storage."""
+
+    def __init__(self, datos):
+        self._datos = dict(datos)
+        self.lecturas = 0
+
+    def get(self, clave):
+        self.lecturas += 1
+        return self._datos.get(clave)
+
+    def set(self, clave, valor):
+        self._datos[clave] = valor
+
+    def contains_key(self, clave):
+        return clave in self._datos
+
+    def remove(self, clave):
+        self._datos.pop(clave, None)
+
+def abrir_sesion(registro: RegistroSesiones, roster: str):
+    page = SimpleNamespace(client_storage=AlmacenamientoEnMemoria({"operators": roster}))
+    app_state = AppState(page=page)
+    for indice in range(12):
+        app_state.cambiar_tiempo(indice)
+        app_state.emitir_reporte_actual()  # Llena la caché de reportes renderizados
+
+    def medir():
+        estructuras = app_state.liberables()
+        return tamano_profundo(estructuras, excluir=(page, app_state))
+
+    sesion = registro.registrar(app_state.liberar, medir)
+    return sesion, app_state
+
+def memoria_real() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def simular(cantidad: int, operadores: int, presupuesto_mb: float):
+    roster = codificar_operadores(
+        (f"Operador {i}", "Operador de radio", "OPC", f"V-{i}") for i in range(operadores)
+    )
+    registro = RegistroSesiones(inactividad=1800, presupuesto=int(presupuesto_mb * 1024 ** 2), inactividad_minima=120)
+
+    tracemalloc.start()
+    base = memoria_real()
+    sesiones = [abrir_sesion(registro, roster) for _ in range(cantidad)]
+    abiertas = memoria_real() - base
+
+    # Una de cada diez sesiones sigue en uso; el resto lleva de 3 a 27 minutos sin actividad
+    ahora = time.monotonic()
+    for i, (sesion, _) in enumerate(sesiones):
+        sesion.ultima_actividad = ahora - (0 if i % 10 == 0 else 180 + i * 1440 / cantidad)
+
+    def revisar(momento, motivo):
+        inicio = time.perf_counter()
+        liberadas = [s for s, m in registro.revisar(momento) if m == motivo]
+        duracion = time.perf_counter() - inicio
+        medida = sum(s.memoria for s, _ in sesiones)
+        print(
+            f"  revisión por {motivo}: {len(liberadas)} sesiones liberadas en {duracion * 1000:.1f} ms, "
+            f"quedan {medida / 1024 ** 2:.1f} MiB liberables, memoria real {(memoria_real() - base) / 1024 ** 2:.1f} MiB"
+        )
+
+    inicio = time.perf_counter()
+    medida = sum(s.medir() for s, _ in sesiones)
+    primera = time.perf_counter() - inicio
+    print(f"{cantidad} sesiones con {operadores} operadores cada una, presupuesto {presupuesto_mb:.0f} MiB")
+    print(f"  abiertas: memoria real {abiertas / 1024 ** 2:.1f} MiB, liberable medida {medida / 1024 ** 2:.1f} MiB "
+          f"({primera / cantidad * 1000:.1f} ms por sesión en la primera medición, con tracemalloc activo)")
+    revisar(ahora, PRESUPUESTO)
+    revisar(ahora + 3600, INACTIVIDAD)
+    tracemalloc.stop()
+
+    # Una sesión liberada conserva al operador elegido y recupera el roster al usarlo
+    sesion, app_state = sesiones[1]
+    almacenamiento = app_state.page.client_storage
+    lecturas = almacenamiento.lecturas
+    operador = app_state.obtener_operador_actual()
+    sin_recarga = almacenamiento.lecturas == lecturas and app_state.operador_manager.liberado
+    app_state.cambiar_operador(f"Operador {operadores - 1}")
+    sesion.tocar()
+    print(
+        f"  sesión liberada: operador retenido {operador is not None and sin_recarga}, "
+        f"roster rehidratado {app_state.operador_manager.cantidad == operadores}, "
+        f"operador elegido {app_state.obtener_operador_actual().nombre}"
+    )
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    simular(
+        int(argumentos[0]) if len(argumentos) > 0 else 200,
+        int(argumentos[1]) if len(argumentos) > 1 else 2000,
+        float(argumentos[2]) if len(argumentos) > 2 else 64
+    )
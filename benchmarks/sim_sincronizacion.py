@@ -0,0 +1,121 @@
+"""
+Simulación: sincronización de estaciones con cortes de enlace.
+
+Varias estaciones editan el roster (con altas y bajas concurrentes de los
+mismos nombres y cédulas repetidas) y emiten reportes mientras su enlace con
+un nodo central local se cae al azar: a veces se pierde la solicitud y a
+veces la respuesta. Al final se restablece el enlace y se verifica que todas
+las estaciones converjan al mismo roster y al mismo historial. También se
+informa cuántos bytes viajaron comprimidos frente al JSON sin comprimir.
+
+Uso:
+    python benchmarks/sim_sincronizacion.py [estaciones] [pasos] [probabilidad_de_corte]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from historial import HistorialReportes, RegistroHistorial
+from models import OperadorManager
+from sincronizacion import ErrorEnlace, NodoCentral, Sincronizador, comprimir, descomprimir
+
+NOMBRES = [f"Operador {i}" for i in range(40)]
+
+class EnlaceInestable:
+    """Transporte en proceso hacia el nodo central que se corta al azar."""
+
+    def __init__(self, central: NodoCentral, rng: random.Random, corte: float):
+        self.central = central
+        self.rng = rng
+        self.corte = corte
+        self.caido = False
+        self.json_sin_comprimir = 0
+
+    def __call__(self, cuerpo: bytes) -> bytes:
+        if self.caido or self.rng.random() < self.corte / 2:
+            raise ErrorEnlace("solicitud perdida")
+        solicitud = descomprimir(cuerpo)
+        respuesta = self.central.intercambiar(solicitud)
+        self.json_sin_comprimir += len(json.dumps(solicitud, ensure_ascii=False)) + len(json.dumps(respuesta, ensure_ascii=False))
+        if self.rng.random() < self.corte / 2:
+            raise ErrorEnlace("respuesta perdida")  # El central ya aplicó los cambios
+        return comprimir(respuesta)
+
+class Estacion:
+    def __init__(self, directorio: str, central: NodoCentral, rng: random.Random, corte: float):
+        self.enlace = EnlaceInestable(central, rng, corte)
+        self.historial = HistorialReportes(os.path.join(directorio, "historial.jsonl"))
+        self.sincronizador = Sincronizador(self.enlace, directorio, self.historial)
+        self.operadores = OperadorManager(sincronizador=self.sincronizador)
+        self.sincronizador.suscribir(lambda cambios: self.operadores.aplicar_roster_sincronizado())
+
+    def sincronizar(self) -> bool:
+        try:
+            self.sincronizador.sincronizar()
+            return True
+        except ErrorEnlace:
+            return False
+
+def simular(estaciones: int, pasos: int, corte: float, semilla: int = 5):
+    rng = random.Random(semilla)
+    with tempfile.TemporaryDirectory() as base:
+        central = NodoCentral(os.path.join(base, "central.jsonl"))
+        red = [Estacion(os.path.join(base, f"estacion_{i}"), central, rng, corte) for i in range(estaciones)]
+        reportes = fallos = 0
+        inicio = time.perf_counter()
+        for paso in range(pasos):
+            estacion = rng.choice(red)
+            accion = rng.random()
+            if accion < 0.3:
+                nombre = rng.choice(NOMBRES)
+                cedula = f"V-{rng.randrange(60)}"  # Cédulas repetidas a propósito
+                estacion.operadores.agregar_operador(nombre, "Operador de radio", "OPC", cedula)
+            elif accion < 0.45:
+                nombres = estacion.operadores.obtener_nombres()
+                if nombres:
+                    estacion.operadores.eliminar_operador(rng.choice(nombres))
+            else:
+                registro = RegistroHistorial(time.time() + paso, f"Municipio {rng.randrange(21)}", "CEMUPRAD", rng.randrange(13), "x")
+                estacion.historial.registrar(registro)
+                estacion.sincronizador.registrar_reportes([registro])
+                reportes += 1
+            # Tormenta: enlaces que se caen por varios pasos
+            if rng.random() < corte / 10:
+                rng.choice(red).enlace.caido = True
+            if rng.random() < 0.05:
+                rng.choice(red).enlace.caido = False
+            if rng.random() < 0.3:
+                fallos += not rng.choice(red).sincronizar()
+
+        # Se restablece el enlace: dos vueltas completas bastan para converger
+        for estacion in red:
+            estacion.enlace.caido = False
+            estacion.enlace.corte = 0
+        for _ in range(2):
+            for estacion in red:
+                estacion.sincronizar()
+        duracion = time.perf_counter() - inicio
+
+        rosters = {json.dumps(e.sincronizador.roster(), sort_keys=True) for e in red}
+        locales = {tuple(sorted(e.operadores.obtener_nombres())) for e in red}
+        historiales = {sum(1 for _ in e.historial.iterar()) for e in red}
+        comprimidos = sum(e.sincronizador.bytes_enviados + e.sincronizador.bytes_recibidos for e in red)
+        sin_comprimir = sum(e.enlace.json_sin_comprimir for e in red)
+
+        print(f"{estaciones} estaciones, {pasos} pasos, corte {corte:.0%}: {duracion:.2f} s, {fallos} intercambios fallidos")
+        print(f"  rosters idénticos: {len(rosters) == 1 and len(locales) == 1} ({len(next(iter(locales)))} operadores)")
+        print(f"  historiales completos: {historiales == {reportes}} ({reportes} reportes)")
+        print(f"  tráfico: {comprimidos / 1024:.1f} KiB comprimido frente a {sin_comprimir / 1024:.1f} KiB en JSON")
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    simular(
+        int(argumentos[0]) if len(argumentos) > 0 else 8,
+        int(argumentos[1]) if len(argumentos) > 1 else 5000,
+        float(argumentos[2]) if len(argumentos) > 2 else 0.3
+    )
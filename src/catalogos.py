@@ -0,0 +1,167 @@
+"""
+Catálogos de la aplicación (estados del tiempo y jerarquías).
+
+Se leen de un archivo JSON externo: el del directorio de datos si existe, o
+el incluido con la aplicación. El archivo se valida una sola vez por versión
+y el resultado, inmutable, se comparte entre todas las sesiones; solo se
+vuelve a leer cuando cambia su fecha de modificación.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Generic, Optional, Tuple, TypeVar
+from config import CATALOGOS
+
+T = TypeVar("T")
+
+class CatalogoError(ValueError):
+    """El archivo de catálogos no es válido."""
+
+@dataclass(frozen=True)
+class EstadoTiempo:
+    """Un estado del tiempo con su índice y su clave estables."""
+    indice: int
+    descripcion: str
+    emoji: str
+    nombre: str
+    clave: str = ""
+
+@dataclass(frozen=True)
+class Catalogos:
+    """Versión inmutable de los catálogos."""
+    tiempo: Tuple[EstadoTiempo, ...]
+    jerarquias: Tuple[str, ...]
+    origen: str = ""
+    # (clave, texto) de las opciones del selector de tiempo
+    opciones_tiempo: Tuple[Tuple[str, str], ...] = field(init=False, repr=False, compare=False)
+    _por_clave: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "opciones_tiempo", tuple(
+            (str(t.indice), f"{t.emoji}  {t.nombre}") for t in self.tiempo
+        ))
+        object.__setattr__(self, "_por_clave", {t.clave: t.indice for t in self.tiempo if t.clave})
+
+    def indice_de(self, clave: str) -> int:
+        """Índice del estado del tiempo con esa clave (KeyError si no existe)."""
+        return self._por_clave[clave]
+
+    def estado_tiempo(self, indice: int) -> EstadoTiempo:
+        """Estado del tiempo por índice; el primero si el índice no existe."""
+        return self.tiempo[indice] if 0 <= indice < len(self.tiempo) else self.tiempo[0]
+
+def validar_catalogos(datos: Dict, origen: str = "") -> Catalogos:
+    """Valida el contenido del archivo y construye los catálogos."""
+    try:
+        entradas = datos["tiempo"]
+        jerarquias = datos["jerarquias"]
+    except (KeyError, TypeError):
+        raise CatalogoError("Faltan las secciones 'tiempo' o 'jerarquias'") from None
+
+    tiempo = []
+    for entrada in entradas:
+        try:
+            estado = EstadoTiempo(
+                int(entrada["indice"]), entrada["descripcion"], entrada["emoji"], entrada["nombre"],
+                entrada.get("clave", "")
+            )
+        except (KeyError, TypeError, ValueError):
+            raise CatalogoError(f"Estado del tiempo incompleto: {entrada}") from None
+        if not all(isinstance(v, str) and v.strip() for v in (estado.descripcion, estado.emoji, estado.nombre)):
+            raise CatalogoError(f"Estado del tiempo con campos vacíos: {entrada}")
+        tiempo.append(estado)
+
+    # Los índices se guardan en el historial: deben ser 0..n-1 sin huecos ni repetidos
+    tiempo.sort(key=lambda t: t.indice)
+    if not tiempo or [t.indice for t in tiempo] != list(range(len(tiempo))):
+        raise CatalogoError("Los índices del tiempo deben ser consecutivos desde 0")
+
+    # Otros módulos eligen estados por clave (p. ej. las transiciones de lluvia):
+    # las claves no se repiten y las que se usan deben existir
+    claves = [t.clave for t in tiempo if t.clave]
+    if len(set(claves)) != len(claves):
+        raise CatalogoError("Hay claves del tiempo repetidas")
+    faltantes = [c for c in CATALOGOS["claves_requeridas"] if c not in claves]
+    if faltantes:
+        raise CatalogoError(f"Faltan estados del tiempo con las claves: {', '.join(faltantes)}")
+
+    if not jerarquias or not all(isinstance(j, str) and j.strip() for j in jerarquias):
+        raise CatalogoError("Las jerarquías deben ser textos no vacíos")
+    if len(set(jerarquias)) != len(jerarquias):
+        raise CatalogoError("Hay jerarquías repetidas")
+
+    return Catalogos(tuple(tiempo), tuple(jerarquias), origen)
+
+def cargar_catalogos(ruta: str) -> Catalogos:
+    """Lee y valida un archivo de catálogos."""
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+    except json.JSONDecodeError as e:
+        raise CatalogoError(f"JSON inválido: {e}") from None
+    return validar_catalogos(datos, ruta)
+
+class ArchivoVigilado(Generic[T]):
+    """Valor cargado desde un archivo y recargado solo si cambia su mtime."""
+
+    def __init__(self, rutas: Callable[[], Tuple[str, ...]], cargar: Callable[[str], T], intervalo: float = 1.0):
+        self._rutas = rutas
+        self._cargar = cargar
+        # Como mucho una consulta de mtime por intervalo (segundos)
+        self.intervalo = intervalo
+        self._verificado = float("-inf")
+        self._firma: Optional[Tuple[str, int, int]] = None
+        self._valor: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def _firma_actual(self) -> Optional[Tuple[str, int, int]]:
+        for ruta in self._rutas():
+            try:
+                info = os.stat(ruta)
+            except OSError:
+                continue
+            return ruta, info.st_mtime_ns, info.st_size
+        return None
+
+    def obtener(self) -> T:
+        """Devuelve el valor vigente, recargándolo si el archivo cambió."""
+        ahora = time.monotonic()
+        if self._valor is not None and ahora - self._verificado < self.intervalo:
+            return self._valor
+        self._verificado = ahora
+        firma = self._firma_actual()
+        if firma == self._firma and self._valor is not None:
+            return self._valor
+        with self._lock:
+            if firma != self._firma or self._valor is None:
+                if firma is None:
+                    raise CatalogoError(f"No existe ninguno de: {', '.join(self._rutas())}")
+                try:
+                    self._valor = self._cargar(firma[0])
+                except (OSError, CatalogoError) as e:
+                    print(f"Error al cargar {firma[0]}: {e}")
+                    # Se conserva la versión anterior hasta el próximo cambio del archivo
+                    if self._valor is None:
+                        self._valor = self._cargar_respaldo(firma[0])
+                self._firma = firma
+            return self._valor
+
+    def _cargar_respaldo(self, fallida: str) -> T:
+        rutas = self._rutas()
+        for ruta in rutas[rutas.index(fallida) + 1:]:
+            try:
+                return self._cargar(ruta)
+            except (OSError, CatalogoError) as e:
+                print(f"Error al cargar {ruta}: {e}")
+        raise CatalogoError("No hay catálogos válidos")
+
+def _rutas_catalogos() -> Tuple[str, ...]:
+    return (CATALOGOS["archivo"], CATALOGOS["predeterminado"])
+
+_catalogos = ArchivoVigilado(_rutas_catalogos, cargar_catalogos)
+
+def obtener_catalogos() -> Catalogos:
+    """Catálogos vigentes del proceso."""
+    return _catalogos.obtener()
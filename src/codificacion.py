@@ -0,0 +1,82 @@
+"""
+Codificación compacta del estado guardado en client_storage.
+
+El roster se guarda por columnas: una lista por campo, con cargo y jerarquía
+como códigos de un vocabulario, en lugar de repetir las claves y los textos
+en cada registro. Los valores grandes se comprimen con zlib y se guardan en
+base64 con el prefijo "z:". La lectura reconoce los tres formatos, incluido
+el anterior (lista de objetos JSON).
+"""
+import base64
+import json
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import ALMACENAMIENTO
+
+VERSION = 2
+PREFIJO_COMPRIMIDO = "z:"
+
+FilaOperador = Tuple[str, str, str, str]  # (nombre, cargo, jerarquia, cedula)
+
+class ErrorCodificacion(ValueError):
+    """El valor guardado no está en ningún formato conocido."""
+
+def empaquetar(texto: str, comprimir_desde: Optional[int] = None) -> str:
+    """Comprime el texto si supera el umbral (en bytes)."""
+    umbral = ALMACENAMIENTO["comprimir_desde"] if comprimir_desde is None else comprimir_desde
+    if umbral < 0 or len(texto) < umbral:
+        return texto
+    datos = zlib.compress(texto.encode("utf-8"), 6)
+    return PREFIJO_COMPRIMIDO + base64.b64encode(datos).decode("ascii")
+
+def desempaquetar(valor: str) -> str:
+    if valor.startswith(PREFIJO_COMPRIMIDO):
+        try:
+            return zlib.decompress(base64.b64decode(valor[len(PREFIJO_COMPRIMIDO):])).decode("utf-8")
+        except (ValueError, zlib.error) as e:
+            raise ErrorCodificacion(f"Valor comprimido inválido: {e}") from None
+    return valor
+
+def _codificar(valores: List[str]) -> Tuple[List[str], List[int]]:
+    """Valores distintos (en orden de aparición) y el código de cada valor."""
+    codigos: Dict[str, int] = {}
+    indices = [codigos.setdefault(v, len(codigos)) for v in valores]
+    return list(codigos), indices
+
+def codificar_operadores(filas: Iterable[FilaOperador], comprimir_desde: Optional[int] = None) -> str:
+    """Codifica el roster por columnas."""
+    filas = list(filas)
+    nombres, cargos, jerarquias, cedulas = (list(c) for c in zip(*filas)) if filas else ([], [], [], [])
+    vocabulario_cargos, codigos_cargos = _codificar(cargos)
+    vocabulario_jerarquias, codigos_jerarquias = _codificar(jerarquias)
+    texto = json.dumps({
+        "v": VERSION,
+        "cargos": vocabulario_cargos,
+        "jerarquias": vocabulario_jerarquias,
+        "nombre": nombres,
+        "cargo": codigos_cargos,
+        "jerarquia": codigos_jerarquias,
+        "cedula": cedulas
+    }, ensure_ascii=False, separators=(",", ":"))
+    return empaquetar(texto, comprimir_desde)
+
+def decodificar_operadores(valor: str) -> List[FilaOperador]:
+    """Lee el roster en cualquiera de los formatos guardados."""
+    try:
+        datos = json.loads(desempaquetar(valor))
+    except json.JSONDecodeError as e:
+        raise ErrorCodificacion(f"JSON inválido: {e}") from None
+    try:
+        if isinstance(datos, list):  # Formato anterior: un objeto por operador
+            return [(d["nombre"], d["cargo"], d["jerarquia"], d["cedula"]) for d in datos]
+        if not isinstance(datos, dict):
+            raise ErrorCodificacion(f"Formato de roster desconocido: {type(datos).__name__}")
+        if datos.get("v") != VERSION:
+            raise ErrorCodificacion(f"Versión desconocida: {datos.get('v')}")
+        cargos, jerarquias = datos["cargos"], datos["jerarquias"]
+        return [
+            (nombre, cargos[cargo], jerarquias[jerarquia], cedula)
+            for nombre, cargo, jerarquia, cedula in zip(datos["nombre"], datos["cargo"], datos["jerarquia"], datos["cedula"])
+        ]
+    except (KeyError, TypeError, IndexError) as e:
+        raise ErrorCodificacion(f"Roster incompleto: {e}") from None
@@ -2,6 +2,8 @@
 """
 Configuración y constantes de la aplicación de reportes meteorológicos.
 """
+import os
+from functools import lru_cache
 
 # Configuración de la aplicación
 DEPARTAMENTO = "CEMUPRAD"
@@ -16,6 +18,132 @@ DEFAULT_OPERATORS = [
     }
 ]
 
+# Directorio de datos locales (historial, colas, etc.)
+DATA_DIR = os.getenv("FLET_APP_STORAGE_DATA") or os.path.join(
+    os.path.expanduser("~"), ".reporte_del_tiempo"
+)
+HISTORIAL_ARCHIVO = os.path.join(DATA_DIR, "historial.jsonl")
+
+# Integridad del historial: cada `punto_cada` registros se firma un punto de
+# control con la clave HMAC (hex en REPORTE_HISTORIAL_CLAVE o, si no está,
+# generada una vez en `archivo_clave`). Solo protege contra alteraciones si la
+# clave está fuera del alcance de quien puede editar el historial
+INTEGRIDAD = {
+    "punto_cada": 1000,
+    "archivo_clave": os.getenv("REPORTE_HISTORIAL_CLAVE_ARCHIVO") or os.path.join(DATA_DIR, "historial.clave"),
+    "clave": os.getenv("REPORTE_HISTORIAL_CLAVE", "")
+}
+
+# Exportación del historial: por debajo de `paralelo_desde` bytes (o donde no
+# hay multiprocesamiento) se renderiza en el mismo proceso
+EXPORTACION = {
+    "paralelo_desde": 4 * 1024 * 1024
+}
+
+# Despacho de reportes a destinos locales (webhook, directorio, socket Unix)
+DESPACHO = {
+    "directorio": os.path.join(DATA_DIR, "despacho"),
+    "archivo_destinos": os.path.join(DATA_DIR, "despacho.json"),
+    "tamano_lote": 100,
+    "reintento_min": 1.0,
+    "reintento_max": 300.0
+}
+
+# Roster de operadores compartido entre sesiones (modo web)
+ROSTER_COMPARTIDO = os.getenv("REPORTE_ROSTER_COMPARTIDO", "0") == "1"
+
+# Sesiones: tras `inactividad` segundos sin uso se liberan sus diálogos, su
+# copia del roster y sus cachés. Con presupuesto (MiB, 0 = sin límite) también
+# se liberan las menos recientes, con al menos `inactividad_minima` sin uso,
+# cuando el total del proceso lo supera. Una sesión activa se vuelve a medir
+# como mucho cada `remedicion` segundos
+SESIONES = {
+    "inactividad": 1800,
+    "inactividad_minima": 120,
+    "intervalo": 60,
+    "remedicion": 600,
+    "presupuesto_mb": float(os.getenv("REPORTE_PRESUPUESTO_MB", "0"))
+}
+
+# Recordatorios de reportes (segundos)
+RECORDATORIOS = {
+    "cadencia_por_defecto": 3600,
+    "cadencia_minima": 900,
+    "cadencia_maxima": 6 * 3600,
+    "tolerancia": 300,
+    "muestras": 24
+}
+
+# Deduplicación de reportes: un mismo estado se vuelve a registrar como
+# confirmación solo cuando pasó la ventana (segundos) desde el último registro
+DEDUPLICACION = {
+    "ventana_confirmacion": 3600,
+    "cache_textos": 128
+}
+
+# Calendario de turnos (turnos.json en el directorio de datos). Los índices
+# cubren una ventana de días hacia adelante y unas horas hacia atrás
+TURNOS = {
+    "archivo": os.path.join(DATA_DIR, "turnos.json"),
+    "ventana_dias": 31,
+    "margen_horas": 24
+}
+
+# Autocompletado de novedades: claves guardadas por prefijo, profundidad
+# máxima del trie y sugerencias mostradas
+NOVEDADES = {
+    "capacidad": 8,
+    "profundidad": 32,
+    "sugerencias": 5
+}
+
+# Servidor HTTP/JSON: máximo de registros que devuelve /historial por solicitud
+SERVIDOR = {
+    "limite_historial": 1000
+}
+
+# Almacenamiento del cliente: los valores más grandes que este umbral (bytes)
+# se guardan comprimidos; -1 nunca comprime
+ALMACENAMIENTO = {
+    "comprimir_desde": 4096
+}
+
+# Sincronización con un nodo central (REPORTE_SINCRONIZACION_URL, p. ej.
+# http://central:8765/sync). Los cambios esperan en disco mientras no hay enlace
+SINCRONIZACION = {
+    "url": os.getenv("REPORTE_SINCRONIZACION_URL", ""),
+    "directorio": DATA_DIR,
+    "central": os.path.join(DATA_DIR, "central.jsonl"),
+    "intervalo": 30.0,
+    "tamano_lote": 500,
+    "timeout": 10.0,
+    "reintento_min": 1.0,
+    "reintento_max": 300.0
+}
+
+# Pluviómetros: CSV de las estaciones en el directorio de datos. Tasas en mm/h
+# promediadas por municipio en una ventana (segundos) comparada con la anterior;
+# los umbrales separan sin lluvia, leve, moderada y fuerte
+PLUVIOMETROS = {
+    "directorio": os.path.join(DATA_DIR, "pluviometros"),
+    "ventana": 600,
+    "paso": 10,
+    "intervalo": 1.0,
+    "umbrales": (0.1, 2.5, 7.6)
+}
+
+# Métricas de operación (REPORTE_METRICAS=1). El formato "prometheus" sirve
+# para el textfile collector de node_exporter; también se admite "json"
+_FORMATO_METRICAS = os.getenv("REPORTE_METRICAS_FORMATO", "prometheus")
+METRICAS = {
+    "habilitadas": os.getenv("REPORTE_METRICAS", "0") == "1",
+    "formato": _FORMATO_METRICAS,
+    "archivo": os.getenv("REPORTE_METRICAS_ARCHIVO") or os.path.join(
+        DATA_DIR, "metricas.json" if _FORMATO_METRICAS == "json" else "metricas.prom"
+    ),
+    "intervalo": 15
+}
+
 # Configuración de la ventana
 WINDOW_CONFIG = {
     "width": 500,
@@ -25,61 +153,63 @@ WINDOW_CONFIG = {
     "title": "Reporte del tiempo"
 }
 
-# Estados del tiempo
-TIEMPO = [
-    "Cielo despejado", 
-    "Cielo parcialmente nublado", 
-    "Cielo con nubosidad fragmentada",
-    "Cielo con nubosidad dispersa", 
-    "Cielo nublado",
-    "Inicia evento meteorológico, precipitaciones de leve intensidad.",
-    "Inicia evento meteorológico, precipitaciones de moderada intensidad",
-    "Inicia evento meteorológico, precipitaciones de fuerte intensidad",
-    "Se reporta el aumento de las precipitaciones de leves a moderadas",
-    "Se reporta el aumento de las precipitaciones de moderadas a fuertes",
-    "Se reporta disminución de las precipitaciones de moderadas a leves",
-    "Se reporta disminución de las precipitaciones de fuertes a moderadas",
-    "Finaliza evento meteorológico"
-]
+# Catálogos (estados del tiempo y jerarquías). Se pueden actualizar sin
+# redistribuir la app dejando un catalogos.json en el directorio de datos.
+# `claves_requeridas`: claves de estados del tiempo que otros módulos usan por
+# su significado (las transiciones de los pluviómetros); deben existir
+DATOS_APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CATALOGOS = {
+    "archivo": os.path.join(DATA_DIR, "catalogos.json"),
+    "predeterminado": os.path.join(DATOS_APP, "catalogos.json"),
+    "claves_requeridas": (
+        "lluvia_leve", "lluvia_moderada", "lluvia_fuerte",
+        "aumento_leve_moderada", "aumento_moderada_fuerte",
+        "disminucion_moderada_leve", "disminucion_fuerte_moderada", "cese_lluvia"
+    )
+}
 
-EMOJI_TIEMPO = [
-    "☀", "⛅", "🌤", "🌤", "☁", "🌧", "🌧", "🌧", 
-    "🌧", "🌧", "🌧", "🌧", "☁"
-]
+# Idiomas del reporte y de la interfaz: un JSON por idioma en `directorio`.
+# Los textos que le falten a un idioma se toman del predeterminado
+IDIOMAS = {
+    "directorio": os.path.join(DATOS_APP, "idiomas"),
+    "predeterminado": os.getenv("REPORTE_IDIOMA", "es")
+}
 
-NOMBRES_TIEMPO = [
-    "Despejado", "Parcialmente nublado", "Nubosidad fragmentada", 
-    "Nubosidad dispersa", "Nublado", "Precipitaciones leves", 
-    "Precipitaciones moderadas", "Precipitaciones fuertes",
-    "Leves a moderadas", "Moderadas a fuertes", "Moderadas a leves", 
-    "Fuertes a moderadas", "Cese de las precipitaciones"
-]
+# Plantilla del reporte (negritas con *texto* y campos entre llaves).
+# Las plantillas compiladas se guardan en una caché LRU de este tamaño
+PLANTILLAS_EN_CACHE = 256
+NOVEDAD_POR_DEFECTO = "Sin novedades para la hora."
+
+PLANTILLA_REPORTE = (
+    "*PROTECCIÓN CIVIL MUNICIPIO {municipio_mayus}* 🚨\n\n"
+    "*·   REPORTE DEL ESTADO DEL TIEMPO:* {emoji}\n"
+    "*·   FECHA:* {fecha}\n"
+    "*·   HORA:* {hora} HLV\n\n"
+    "*·   DESCRIPCIÓN:* {descripcion}\n\n"
+    "*·   NOVEDAD:* {novedad}\n\n"
+    "*·   REPORTA:* {reporta}\n\n"
+    "*SOLO QUEREMOS SALVAR VIDAS 🚨🚑*"
+)
 
-# Cargos y jerarquías
-def get_cargos(departamento: str) -> list[str]:
-    """Genera la lista de cargos dinámicamente."""
-    return [
+# Cargos
+@lru_cache(maxsize=64)
+def get_cargos(departamento: str) -> tuple[str, ...]:
+    """Genera la lista de cargos dinámicamente (memorizada por departamento)."""
+    return (
         f"Analista de {departamento}",
         f"Auxiliar de {departamento}",
         f"Coordinador de {departamento}",
         "Jefe de los servicios",
         "Operador de radio"
-    ]
+    )
 
-JERARQUIAS = [
-    "OPC", "OPC I", "OPC II", "OPC III",
-    "OSPC I", "OSPC II", "OSPC III", 
-    "OCPC I", "OCPC II"
-]
-
-# Municipios
-MUNICIPIOS = [
-    "Anaco", "Aragua", "Bolívar", "Bruzual", "Carvajal", "Cajigal",
-    "Urbaneja", "Freites", "Guanta", "Guanipa",
-    "Independencia", "Libertad", "McGregor", "Miranda", "Monagas",
-    "Peñalver", "Píritu", "Capistrano", "Santa Ana",
-    "Simón Rodríguez", "Sotillo"
-]
+# División territorial (estado → municipio → parroquia), con el mismo
+# mecanismo que los catálogos: la del directorio de datos tiene prioridad
+DIVISION_TERRITORIAL = {
+    "archivo": os.path.join(DATA_DIR, "division_territorial.json"),
+    "predeterminado": os.path.join(DATOS_APP, "division_territorial.json")
+}
+ESTADO = "Anzoátegui"
 
 # Configuración de estilos
 FONT_FAMILY = "Segoe UI"
@@ -0,0 +1,109 @@
+"""
+Deduplicación de reportes por municipio y ventana de tiempo.
+
+Cada reporte se resume en una huella de su estado (municipio, departamento,
+tiempo y operador), sin la hora. Si el estado no cambió desde el último
+registro del municipio firmado por el mismo operador, la copia se sirve desde
+la caché y no se registra ni se despacha; pasada la ventana se registra una
+sola confirmación. Así un lote firmado por varios operadores no se cuenta
+como cambio en cada emisión.
+
+Hay un deduplicador por archivo de historial, compartido por todas las
+sesiones que escriben en él: un municipio copiado desde dos sesiones se
+registra una sola vez.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+from config import DEDUPLICACION
+from historial import RegistroHistorial
+
+CAMBIO = "cambio"
+CONFIRMACION = "confirmacion"
+REPETIDO = "repetido"
+
+T = TypeVar("T")
+
+def huella_estado(municipio: str, departamento: str, indice_tiempo: int, operador: str, novedad: str = "") -> str:
+    """Huella del estado reportado, independiente de la hora."""
+    estado = [municipio, departamento, indice_tiempo, operador]
+    if novedad:
+        estado.append(novedad)  # Sin novedad la huella es la misma que antes de existir el campo
+    datos = json.dumps(estado, ensure_ascii=False)
+    return hashlib.sha256(datos.encode("utf-8")).hexdigest()[:16]
+
+def huella_registro(registro: RegistroHistorial) -> str:
+    return huella_estado(
+        registro.municipio, registro.departamento, registro.indice_tiempo, registro.operador, registro.novedad
+    )
+
+class Deduplicador:
+    """Clasifica cada emisión como cambio, confirmación o repetición."""
+
+    def __init__(self, ventana: Optional[float] = None, capacidad: Optional[int] = None):
+        self.ventana = ventana if ventana is not None else DEDUPLICACION["ventana_confirmacion"]
+        self.capacidad = capacidad or DEDUPLICACION["cache_textos"]
+        # (municipio, operador) -> (huella, momento del último registro guardado)
+        self._ultimos: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._cache: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+
+    def cargar_historial(self, registros: Iterable[RegistroHistorial]) -> None:
+        """Toma el último estado registrado de cada municipio y operador (nunca retrocede)."""
+        with self._lock:
+            for registro in registros:
+                clave = (registro.municipio, registro.operador)
+                anterior = self._ultimos.get(clave)
+                if anterior is None or registro.momento >= anterior[1]:
+                    self._ultimos[clave] = (huella_registro(registro), registro.momento)
+
+    def clasificar(self, huella: str, municipio: str, momento: float, operador: str = "") -> str:
+        """Decide qué hacer con una emisión y, si se registra, la anota."""
+        clave = (municipio, operador)
+        with self._lock:
+            anterior = self._ultimos.get(clave)
+            if anterior is None or anterior[0] != huella:
+                accion = CAMBIO
+            elif momento - anterior[1] >= self.ventana:
+                accion = CONFIRMACION
+            else:
+                return REPETIDO
+            self._ultimos[clave] = (huella, momento)
+            return accion
+
+    def vaciar_cache(self) -> None:
+        """Descarta los reportes renderizados (se reconstruyen al pedirlos)."""
+        with self._lock:
+            self._cache.clear()
+
+    def renderizado(self, clave: Hashable, construir: Callable[[], T]) -> T:
+        """Devuelve el valor en caché para la clave o lo construye (LRU acotada)."""
+        with self._lock:
+            if clave in self._cache:
+                self._cache.move_to_end(clave)
+                self.aciertos += 1
+                return self._cache[clave]
+        valor = construir()
+        with self._lock:
+            self._cache[clave] = valor
+            if len(self._cache) > self.capacidad:
+                self._cache.popitem(last=False)
+        return valor
+
+_deduplicadores: Dict[str, Deduplicador] = {}
+_creacion = threading.Lock()
+
+def obtener_deduplicador(ruta_historial: str) -> Deduplicador:
+    """Devuelve el deduplicador del proceso para un archivo de historial."""
+    ruta = os.path.abspath(ruta_historial)
+    deduplicador = _deduplicadores.get(ruta)
+    if deduplicador is None:
+        with _creacion:
+            deduplicador = _deduplicadores.get(ruta)
+            if deduplicador is None:
+                deduplicador = _deduplicadores[ruta] = Deduplicador()
+    return deduplicador
@@ -0,0 +1,279 @@
+"""
+Despacho de reportes a destinos locales.
+
+Cada reporte emitido se anexa a una cola persistente en disco (JSON Lines).
+Un hilo por destino lee la cola desde su propio desplazamiento, entrega lotes
+y solo avanza el desplazamiento cuando la entrega tuvo éxito; si falla,
+reintenta con espera exponencial. La interfaz solo anexa a la cola.
+"""
+import json
+import os
+import random
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+from typing import Dict, List, Optional
+from config import DESPACHO
+
+class ErrorEntrega(Exception):
+    """Un destino no pudo recibir un lote."""
+
+class Destino:
+    """Destino de entrega de lotes de reportes."""
+
+    nombre = "destino"
+
+    def entregar(self, lote: List[Dict]) -> None:
+        raise NotImplementedError
+
+class DestinoWebhook(Destino):
+    """Envía cada lote como JSON por HTTP POST."""
+
+    def __init__(self, url: str, timeout: float = 10.0, nombre: Optional[str] = None):
+        self.url = url
+        self.timeout = timeout
+        self.nombre = nombre or "webhook"
+
+    def entregar(self, lote: List[Dict]) -> None:
+        cuerpo = json.dumps({"reportes": lote}, ensure_ascii=False).encode("utf-8")
+        solicitud = urllib.request.Request(
+            self.url, data=cuerpo, method="POST",
+            headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.timeout) as respuesta:
+                if not 200 <= respuesta.status < 300:
+                    raise ErrorEntrega(f"HTTP {respuesta.status}")
+        except OSError as e:
+            raise ErrorEntrega(str(e)) from e
+
+class DestinoDirectorio(Destino):
+    """Deja cada lote como un archivo JSON Lines en un directorio."""
+
+    def __init__(self, ruta: str, nombre: Optional[str] = None):
+        self.ruta = ruta
+        self.nombre = nombre or "directorio"
+
+    def entregar(self, lote: List[Dict]) -> None:
+        try:
+            os.makedirs(self.ruta, exist_ok=True)
+            base = os.path.join(self.ruta, f"lote-{time.time_ns()}-{uuid.uuid4().hex[:8]}")
+            with open(base + ".tmp", "w", encoding="utf-8") as archivo:
+                archivo.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in lote)
+            # El archivo aparece completo o no aparece
+            os.replace(base + ".tmp", base + ".jsonl")
+        except OSError as e:
+            raise ErrorEntrega(str(e)) from e
+
+class DestinoSocketUnix(Destino):
+    """Escribe el lote como JSON Lines en un socket Unix."""
+
+    def __init__(self, ruta: str, timeout: float = 10.0, nombre: Optional[str] = None):
+        self.ruta = ruta
+        self.timeout = timeout
+        self.nombre = nombre or "unix"
+
+    def entregar(self, lote: List[Dict]) -> None:
+        datos = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in lote).encode("utf-8")
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexion:
+                conexion.settimeout(self.timeout)
+                conexion.connect(self.ruta)
+                conexion.sendall(datos)
+        except OSError as e:
+            raise ErrorEntrega(str(e)) from e
+
+def crear_destino(config: Dict) -> Destino:
+    """Crea un destino a partir de su configuración."""
+    tipo = config.get("tipo")
+    if tipo == "webhook":
+        return DestinoWebhook(config["url"], config.get("timeout", 10.0), config.get("nombre"))
+    if tipo == "directorio":
+        return DestinoDirectorio(config["ruta"], config.get("nombre"))
+    if tipo == "unix":
+        return DestinoSocketUnix(config["ruta"], config.get("timeout", 10.0), config.get("nombre"))
+    raise ValueError(f"Tipo de destino desconocido: {tipo}")
+
+def cargar_destinos(ruta: Optional[str] = None) -> List[Destino]:
+    """Lee la lista de destinos configurados; sin archivo no hay destinos."""
+    ruta = ruta or DESPACHO["archivo_destinos"]
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return [crear_destino(c) for c in json.load(archivo)]
+    except FileNotFoundError:
+        return []
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"Error en la configuración de despacho {ruta}: {e}")
+        return []
+
+class ColaPersistente:
+    """Cola de solo anexado con un desplazamiento confirmado por consumidor."""
+
+    def __init__(self, directorio: str, consumidores: List[str]):
+        self.directorio = directorio
+        self.ruta = os.path.join(directorio, "cola.jsonl")
+        os.makedirs(directorio, exist_ok=True)
+        self._lock = threading.Condition()
+        self._archivo = open(self.ruta, "ab")
+        self._desplazamientos = {c: self._leer_desplazamiento(c) for c in consumidores}
+
+    def _ruta_desplazamiento(self, consumidor: str) -> str:
+        return os.path.join(self.directorio, f"{consumidor}.offset")
+
+    def _leer_desplazamiento(self, consumidor: str) -> int:
+        try:
+            with open(self._ruta_desplazamiento(consumidor), encoding="utf-8") as archivo:
+                return int(archivo.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _escribir_desplazamiento(self, consumidor: str, valor: int) -> None:
+        ruta = self._ruta_desplazamiento(consumidor)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+            archivo.write(str(valor))
+        os.replace(ruta + ".tmp", ruta)
+
+    def anexar(self, registros: List[Dict]) -> None:
+        """Anexa registros a la cola y despierta a los consumidores."""
+        datos = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in registros).encode("utf-8")
+        with self._lock:
+            self._archivo.write(datos)
+            self._archivo.flush()
+            self._lock.notify_all()
+
+    def leer_lote(self, consumidor: str, maximo: int, espera: Optional[float] = None):
+        """Devuelve (registros, desplazamiento_final) esperando si la cola está vacía."""
+        with self._lock:
+            inicio = self._desplazamientos[consumidor]
+            if inicio >= self._archivo.tell():
+                self._lock.wait(espera)
+                inicio = self._desplazamientos[consumidor]
+            fin_archivo = self._archivo.tell()
+
+        registros = []
+        fin = inicio
+        if inicio < fin_archivo:
+            with open(self.ruta, "rb") as lector:
+                lector.seek(inicio)
+                while len(registros) < maximo and fin < fin_archivo:
+                    linea = lector.readline()
+                    if not linea.endswith(b"\n"):
+                        break  # Escritura en curso
+                    fin += len(linea)
+                    try:
+                        registros.append(json.loads(linea))
+                    except json.JSONDecodeError as e:
+                        print(f"Registro de despacho inválido descartado: {e}")
+        return registros, fin
+
+    def confirmar(self, consumidor: str, desplazamiento: int) -> None:
+        """Confirma la entrega hasta el desplazamiento indicado."""
+        with self._lock:
+            self._desplazamientos[consumidor] = desplazamiento
+            self._escribir_desplazamiento(consumidor, desplazamiento)
+            self._compactar()
+
+    def desplazamiento(self, consumidor: str) -> int:
+        """Posición confirmada de un consumidor."""
+        with self._lock:
+            return self._desplazamientos[consumidor]
+
+    def despertar(self) -> None:
+        """Despierta a los consumidores que esperan registros nuevos."""
+        with self._lock:
+            self._lock.notify_all()
+
+    def pendientes(self, consumidor: str) -> int:
+        """Bytes pendientes de entregar a un consumidor."""
+        with self._lock:
+            return self._archivo.tell() - self._desplazamientos[consumidor]
+
+    def _compactar(self) -> None:
+        # Cuando todos los consumidores llegaron al final, se vacía el archivo
+        fin = self._archivo.tell()
+        if fin and all(d >= fin for d in self._desplazamientos.values()):
+            self._archivo.truncate(0)
+            self._archivo.seek(0)
+            for consumidor in self._desplazamientos:
+                self._desplazamientos[consumidor] = 0
+                self._escribir_desplazamiento(consumidor, 0)
+
+    def cerrar(self) -> None:
+        with self._lock:
+            self._archivo.close()
+
+class Despachador:
+    """Entrega en segundo plano los reportes encolados a cada destino."""
+
+    def __init__(self, destinos: List[Destino], directorio: Optional[str] = None):
+        self.destinos = destinos
+        self.cola = ColaPersistente(directorio or DESPACHO["directorio"], [d.nombre for d in destinos])
+        self._detener = threading.Event()
+        self._hilos = [
+            threading.Thread(target=self._trabajar, args=(d,), name=f"despacho-{d.nombre}", daemon=True)
+            for d in destinos
+        ]
+        self.entregados: Dict[str, int] = {d.nombre: 0 for d in destinos}
+        self.fallos: Dict[str, int] = {d.nombre: 0 for d in destinos}
+
+    def iniciar(self) -> None:
+        for hilo in self._hilos:
+            hilo.start()
+
+    def detener(self, espera: float = 5.0) -> None:
+        self._detener.set()
+        self.cola.despertar()
+        for hilo in self._hilos:
+            hilo.join(espera)
+        self.cola.cerrar()
+
+    def encolar(self, reporte: Dict) -> None:
+        """Encola un reporte (diccionario serializable) para todos los destinos."""
+        self.encolar_lote([reporte])
+
+    def encolar_lote(self, reportes: List[Dict]) -> None:
+        """Encola varios reportes con una sola escritura."""
+        if self.destinos:
+            self.cola.anexar([{"id": uuid.uuid4().hex, **r} for r in reportes])
+
+    def _trabajar(self, destino: Destino) -> None:
+        intentos = 0
+        while not self._detener.is_set():
+            lote, fin = self.cola.leer_lote(destino.nombre, DESPACHO["tamano_lote"], espera=1.0)
+            if not lote:
+                # Líneas inválidas al frente de la cola: se saltan
+                if fin > 0 and fin != self.cola.desplazamiento(destino.nombre):
+                    self.cola.confirmar(destino.nombre, fin)
+                continue
+            try:
+                destino.entregar(lote)
+            except ErrorEntrega as e:
+                intentos += 1
+                self.fallos[destino.nombre] += 1
+                espera = min(DESPACHO["reintento_min"] * 2 ** (intentos - 1), DESPACHO["reintento_max"])
+                espera *= random.uniform(0.8, 1.2)
+                print(f"Fallo entregando a {destino.nombre} (intento {intentos}): {e}")
+                self._detener.wait(espera)
+                continue
+            intentos = 0
+            self.entregados[destino.nombre] += len(lote)
+            self.cola.confirmar(destino.nombre, fin)
+
+_despachador: Optional[Despachador] = None
+_inicializado = False
+_creacion = threading.Lock()
+
+def obtener_despachador() -> Optional[Despachador]:
+    """Devuelve el despachador del proceso, o None si no hay destinos configurados."""
+    global _despachador, _inicializado
+    if not _inicializado:
+        with _creacion:
+            if not _inicializado:
+                destinos = cargar_destinos()
+                if destinos:
+                    _despachador = Despachador(destinos)
+                    _despachador.iniciar()
+                _inicializado = True
+    return _despachador
@@ -0,0 +1,256 @@
+"""
+Exportación masiva del historial de reportes (CSV, JSON Lines, HTML).
+
+El proceso principal solo lee el historial en bloques de líneas crudas; el
+filtrado, la interpretación y el renderizado se hacen en un pool de procesos.
+Los bloques se envían con una ventana acotada y se escriben en el orden
+original a medida que terminan, así la memoria no crece con el rango.
+
+Los historiales pequeños, y las plataformas sin multiprocesamiento (Android,
+iOS, ejecutables congelados), se renderizan en el mismo proceso; si el pool
+no arranca o se rompe a mitad de camino, los bloques pendientes también.
+"""
+import csv
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import pickle
+import sys
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config import EXPORTACION
+from formatos import a_html, a_json, a_whatsapp
+from historial import RegistroHistorial
+from idiomas import obtener_idioma
+from models import Operador, ReportGenerator
+from plantillas import compilar_plantilla
+
+FORMATOS_EXPORTACION = ("csv", "jsonl", "html")
+
+COLUMNAS_CSV = (
+    "momento", "fecha", "hora", "municipio", "departamento",
+    "indice_tiempo", "descripcion", "novedad", "operador", "reporte"
+)
+
+# {lang} es el código del idioma de la exportación
+CABECERA_HTML = (
+    "<!DOCTYPE html>\n<html lang=\"{lang}\">\n<head>\n<meta charset=\"utf-8\">\n"
+    "<title>Historial de reportes</title>\n"
+    "<style>article{{page-break-inside:avoid;margin:0 0 1.5em;font-family:sans-serif}}</style>\n"
+    "</head>\n<body>\n"
+)
+PIE_HTML = "</body>\n</html>\n"
+
+@dataclass(frozen=True)
+class _Contexto:
+    """Operadores, plantilla e idioma de una exportación."""
+    operadores: Dict[str, Operador]
+    plantilla_texto: Optional[str]
+    idioma: Optional[str]
+
+def _crear_contexto(operadores: List[Dict[str, str]], plantilla_texto: Optional[str], idioma: Optional[str] = None) -> _Contexto:
+    return _Contexto({op["nombre"]: Operador.from_dict(op) for op in operadores}, plantilla_texto, idioma)
+
+# Contexto de cada proceso del pool, fijado por _inicializar. En el proceso
+# principal no se usa: varias sesiones pueden exportar a la vez
+_contexto: Optional[_Contexto] = None
+
+def _inicializar(operadores: List[Dict[str, str]], plantilla_texto: Optional[str], idioma: Optional[str] = None) -> None:
+    global _contexto
+    _contexto = _crear_contexto(operadores, plantilla_texto, idioma)
+
+def _procesar_bloque(
+    lineas: List[bytes],
+    formato: str,
+    desde: Optional[float],
+    hasta: Optional[float],
+    municipio: Optional[str],
+    contexto: Optional[_Contexto] = None
+) -> Tuple[str, int]:
+    """Filtra y renderiza un bloque; devuelve el texto a escribir y cuántos reportes incluye.
+
+    Sin `contexto` se usa el del proceso del pool.
+    """
+    contexto = contexto or _contexto
+    idioma = obtener_idioma(contexto.idioma)
+    # Sin plantilla explícita, la del idioma
+    plantilla = compilar_plantilla(contexto.plantilla_texto) if contexto.plantilla_texto else None
+    salida = io.StringIO()
+    escritor_csv = csv.writer(salida) if formato == "csv" else None
+    cantidad = 0
+
+    for linea in lineas:
+        try:
+            registro = RegistroHistorial.from_dict(json.loads(linea))
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+        if desde is not None and registro.momento < desde:
+            continue
+        if hasta is not None and registro.momento >= hasta:
+            continue
+        if municipio is not None and registro.municipio != municipio:
+            continue
+
+        reporte = ReportGenerator.construir_reporte(
+            registro.indice_tiempo,
+            contexto.operadores.get(registro.operador),
+            registro.municipio,
+            registro.departamento,
+            momento=datetime.datetime.fromtimestamp(registro.momento),
+            plantilla=plantilla,
+            novedad=registro.novedad,
+            idioma=idioma
+        )
+        if escritor_csv:
+            escritor_csv.writerow((
+                registro.momento, reporte.fecha, reporte.hora, reporte.municipio,
+                reporte.departamento, reporte.indice_tiempo, reporte.descripcion,
+                reporte.novedad, registro.operador, a_whatsapp(reporte)
+            ))
+        elif formato == "jsonl":
+            salida.write(a_json(reporte) + "\n")
+        else:
+            salida.write(f"<article>{a_html(reporte)}</article>\n")
+        cantidad += 1
+
+    return salida.getvalue(), cantidad
+
+# Errores del pool que se resuelven renderizando en el mismo proceso
+ERRORES_POOL = (BrokenProcessPool, NotImplementedError, ImportError, pickle.PicklingError)
+
+@lru_cache(maxsize=1)
+def multiprocesamiento_disponible() -> bool:
+    """False donde no se pueden lanzar procesos de trabajo (se comprueba una vez)."""
+    if getattr(sys, "frozen", False) or sys.platform in ("android", "ios", "emscripten", "wasi"):
+        return False
+    try:
+        # Falta en algunas compilaciones móviles, o no hay semáforos (sem_open)
+        multiprocessing.get_context().Lock()
+    except (ImportError, OSError, NotImplementedError):
+        return False
+    return True
+
+def _leer_bloques(ruta: str, tamano_bloque: int) -> Iterator[Tuple[List[bytes], int]]:
+    """Lee el historial en bloques de líneas crudas junto con los bytes leídos."""
+    try:
+        archivo = open(ruta, "rb")
+    except FileNotFoundError:
+        return
+    with archivo:
+        leidos = 0
+        bloque: List[bytes] = []
+        for linea in archivo:
+            leidos += len(linea)
+            if linea.strip():
+                bloque.append(linea)
+            if len(bloque) >= tamano_bloque:
+                yield bloque, leidos
+                bloque = []
+        if bloque:
+            yield bloque, leidos
+
+class ExportadorHistorial:
+    """Exporta un rango del historial a un archivo en el formato indicado."""
+
+    def __init__(
+        self,
+        ruta_historial: str,
+        operadores: List[Operador],
+        plantilla_texto: Optional[str] = None,
+        procesos: Optional[int] = None,
+        tamano_bloque: int = 2000,
+        idioma: Optional[str] = None,
+        paralelo_desde: Optional[int] = None
+    ):
+        self.ruta_historial = ruta_historial
+        self.operadores = [op.to_dict() for op in operadores]
+        self.plantilla_texto = plantilla_texto
+        self.procesos = procesos if procesos is not None else (os.cpu_count() or 1)
+        self.tamano_bloque = tamano_bloque
+        self.idioma = idioma
+        self.paralelo_desde = EXPORTACION["paralelo_desde"] if paralelo_desde is None else paralelo_desde
+
+    def exportar(
+        self,
+        destino: str,
+        formato: str,
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        municipio: Optional[str] = None,
+        progreso: Optional[Callable[[float, int], None]] = None
+    ) -> int:
+        """Escribe la exportación y devuelve la cantidad de reportes exportados."""
+        if formato not in FORMATOS_EXPORTACION:
+            raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+        try:
+            total_bytes = os.path.getsize(self.ruta_historial)
+        except OSError:
+            total_bytes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(destino)), exist_ok=True)
+        exportados = 0
+        with open(destino, "w", encoding="utf-8", newline="") as salida:
+            if formato == "csv":
+                csv.writer(salida).writerow(COLUMNAS_CSV)
+            elif formato == "html":
+                salida.write(CABECERA_HTML.format(lang=obtener_idioma(self.idioma).codigo))
+
+            for texto, cantidad, leidos in self._renderizar(formato, desde, hasta, municipio, total_bytes):
+                salida.write(texto)
+                exportados += cantidad
+                if progreso:
+                    progreso(leidos / total_bytes if total_bytes else 1.0, exportados)
+
+            if formato == "html":
+                salida.write(PIE_HTML)
+        return exportados
+
+    def _renderizar(self, formato, desde, hasta, municipio, total_bytes: int = 0) -> Iterator[Tuple[str, int, int]]:
+        bloques = _leer_bloques(self.ruta_historial, self.tamano_bloque)
+        argumentos = (formato, desde, hasta, municipio)
+        # Con pocos bloques el arranque del pool cuesta más de lo que ahorra
+        procesos = min(self.procesos, max(1, total_bytes // max(self.paralelo_desde, 1)) * 2)
+        if procesos <= 1 or total_bytes < self.paralelo_desde or not multiprocesamiento_disponible():
+            yield from self._en_serie(bloques, argumentos)
+            return
+
+        en_vuelo = deque()
+        leido = None  # Bloque leído que todavía no llegó al pool
+        try:
+            with ProcessPoolExecutor(
+                max_workers=procesos,
+                initializer=_inicializar,
+                initargs=(self.operadores, self.plantilla_texto, self.idioma)
+            ) as pool:
+                # Ventana acotada de bloques en vuelo: orden preservado y memoria constante
+                for leido in bloques:
+                    en_vuelo.append((pool.submit(_procesar_bloque, leido[0], *argumentos), *leido))
+                    leido = None
+                    if len(en_vuelo) >= procesos * 2:
+                        futuro, _, leidos_bloque = en_vuelo[0]
+                        resultado = futuro.result()
+                        en_vuelo.popleft()
+                        yield (*resultado, leidos_bloque)
+                while en_vuelo:
+                    futuro, _, leidos_bloque = en_vuelo[0]
+                    resultado = futuro.result()
+                    en_vuelo.popleft()
+                    yield (*resultado, leidos_bloque)
+        except ERRORES_POOL as e:
+            print(f"Exportación en paralelo no disponible, se continúa en este proceso: {e}")
+            # Los bloques sin escribir (en vuelo y sin leer) se renderizan aquí, en orden
+            pendientes = [(lineas, leidos) for _, lineas, leidos in en_vuelo] + ([leido] if leido else [])
+            yield from self._en_serie(pendientes, argumentos)
+            yield from self._en_serie(bloques, argumentos)
+
+    def _en_serie(self, bloques, argumentos) -> Iterator[Tuple[str, int, int]]:
+        contexto = _crear_contexto(self.operadores, self.plantilla_texto, self.idioma)
+        for lineas, leidos in bloques:
+            yield (*_procesar_bloque(lineas, *argumentos, contexto), leidos)
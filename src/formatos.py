@@ -0,0 +1,60 @@
+"""
+Serializadores de reportes a los distintos formatos de salida.
+
+Todos trabajan sobre la representación estructurada (`Reporte`) que construye
+`ReportGenerator.construir_reporte`, sin volver a interpretar texto.
+"""
+import html
+import json
+from typing import Callable, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models import Reporte
+
+def a_whatsapp(reporte: "Reporte") -> str:
+    """Texto con negritas al estilo WhatsApp (*texto*)."""
+    return "".join(f"*{texto}*" if negrita else texto for texto, negrita in reporte.segmentos)
+
+def a_texto_plano(reporte: "Reporte") -> str:
+    """Texto sin marcas de formato, apto para SMS."""
+    return "".join(texto for texto, _ in reporte.segmentos)
+
+def a_html(reporte: "Reporte") -> str:
+    """Fragmento HTML para boletines por correo."""
+    partes = []
+    for texto, negrita in reporte.segmentos:
+        texto = html.escape(texto).replace("\n", "<br>\n")
+        partes.append(f"<b>{texto}</b>" if negrita else texto)
+    return "<p>" + "".join(partes) + "</p>"
+
+def a_dict(reporte: "Reporte") -> Dict:
+    """Diccionario con los campos del reporte."""
+    return {
+        "municipio": reporte.municipio,
+        "departamento": reporte.departamento,
+        "indice_tiempo": reporte.indice_tiempo,
+        "emoji": reporte.emoji,
+        "descripcion": reporte.descripcion,
+        "fecha": reporte.fecha,
+        "hora": reporte.hora,
+        "novedad": reporte.novedad,
+        "operador": reporte.operador.to_dict() if reporte.operador else None
+    }
+
+def a_json(reporte: "Reporte") -> str:
+    """JSON para el sistema de ingesta."""
+    return json.dumps(a_dict(reporte), ensure_ascii=False)
+
+FORMATOS: Dict[str, Callable[["Reporte"], str]] = {
+    "whatsapp": a_whatsapp,
+    "texto": a_texto_plano,
+    "html": a_html,
+    "json": a_json
+}
+
+def renderizar(reporte: "Reporte", formato: str = "whatsapp") -> str:
+    """Serializa el reporte en el formato indicado."""
+    try:
+        return FORMATOS[formato](reporte)
+    except KeyError:
+        raise ValueError(f"Formato desconocido: {formato}") from None
@@ -0,0 +1,183 @@
+"""
+Historial de reportes emitidos.
+
+Se guarda como un archivo JSON Lines de solo anexado en el directorio de datos,
+de modo que puede recorrerse como flujo sin cargarlo completo en memoria. Cada
+línea va encadenada por hash a la anterior (ver integridad.py).
+"""
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Iterator, List, Optional
+from config import HISTORIAL_ARCHIVO
+from idiomas import obtener_idioma
+from integridad import Auditoria, Verificacion, anexar, auditar, verificar
+
+@dataclass
+class RegistroHistorial:
+    """Un reporte emitido. `confirmacion` marca la repetición periódica de un estado sin cambios
+    y `novedad` queda vacía cuando se reportó la novedad por defecto."""
+    momento: float
+    municipio: str
+    departamento: str
+    indice_tiempo: int
+    operador: str
+    confirmacion: bool = False
+    novedad: str = ""
+
+    def to_dict(self) -> Dict:
+        datos = asdict(self)
+        if not self.confirmacion:
+            del datos["confirmacion"]  # Los cambios de estado conservan el formato original
+        if not self.novedad:
+            del datos["novedad"]
+        return datos
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RegistroHistorial':
+        return cls(
+            momento=data["momento"],
+            municipio=data["municipio"],
+            departamento=data["departamento"],
+            indice_tiempo=data["indice_tiempo"],
+            operador=data["operador"],
+            confirmacion=data.get("confirmacion", False),
+            novedad=data.get("novedad", "")
+        )
+
+    @classmethod
+    def desde_reporte(cls, reporte, confirmacion: bool = False) -> 'RegistroHistorial':
+        return cls(
+            momento=reporte.momento.timestamp(),
+            municipio=reporte.municipio,
+            departamento=reporte.departamento,
+            indice_tiempo=reporte.indice_tiempo,
+            operador=reporte.operador.nombre if reporte.operador else "",
+            confirmacion=confirmacion,
+            novedad="" if reporte.novedad == obtener_idioma(reporte.idioma).novedad_por_defecto else reporte.novedad
+        )
+
+class HistorialReportes:
+    """Historial de reportes en un archivo JSON Lines."""
+
+    def __init__(self, ruta: Optional[str] = None):
+        self.ruta = ruta or HISTORIAL_ARCHIVO
+
+    def registrar(self, registro: RegistroHistorial) -> None:
+        """Anexa un registro al historial."""
+        self.registrar_lote([registro])
+
+    def registrar_lote(self, registros: Iterable[RegistroHistorial]) -> None:
+        """Anexa varios registros con una sola escritura."""
+        lineas = [json.dumps(r.to_dict(), ensure_ascii=False) for r in registros]
+        if not lineas:
+            return
+        try:
+            anexar(self.ruta, lineas)
+        except OSError as e:
+            print(f"Error guardando el historial: {e}")
+
+    def verificar(self) -> Verificacion:
+        """Verifica la cadena desde el último punto de control (rápido, para cada apertura)."""
+        return verificar(self.ruta)
+
+    def auditar(self, procesos: Optional[int] = None) -> Auditoria:
+        """Verifica todo el historial repartiendo los tramos en varios procesos."""
+        return auditar(self.ruta, procesos)
+
+    def iterar(
+        self,
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        municipio: Optional[str] = None
+    ) -> Iterator[RegistroHistorial]:
+        """Recorre el historial en orden, filtrando por rango y municipio."""
+        try:
+            archivo = open(self.ruta, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with archivo:
+            for linea in archivo:
+                registro = self._parsear(linea)
+                if registro is None:
+                    continue
+                if desde is not None and registro.momento < desde:
+                    continue
+                if hasta is not None and registro.momento >= hasta:
+                    continue
+                if municipio is not None and registro.municipio != municipio:
+                    continue
+                yield registro
+
+    def ultimos(
+        self,
+        limite: int,
+        desde: Optional[float] = None,
+        hasta: Optional[float] = None,
+        municipio: Optional[str] = None,
+        tamano_bloque: int = 64 * 1024
+    ) -> List[RegistroHistorial]:
+        """Los últimos `limite` registros del rango, en orden, leyendo desde el final del archivo.
+
+        El historial es de solo anexado, así que la lectura se detiene al
+        llegar a registros anteriores a `desde`.
+        """
+        if limite <= 0:
+            return []
+        try:
+            archivo = open(self.ruta, "rb")
+        except FileNotFoundError:
+            return []
+        encontrados: List[RegistroHistorial] = []
+        with archivo:
+            posicion = archivo.seek(0, os.SEEK_END)
+            resto = b""  # Comienzo de una línea cortada por el bloque anterior
+            while posicion > 0 and len(encontrados) < limite:
+                inicio = max(0, posicion - tamano_bloque)
+                archivo.seek(inicio)
+                lineas = (archivo.read(posicion - inicio) + resto).split(b"\n")
+                posicion = inicio
+                resto = lineas.pop(0) if posicion > 0 else b""
+                for linea in reversed(lineas):
+                    registro = self._parsear(linea.decode("utf-8", errors="replace"))
+                    if registro is None:
+                        continue
+                    if desde is not None and registro.momento < desde:
+                        posicion = 0
+                        break
+                    if hasta is not None and registro.momento >= hasta:
+                        continue
+                    if municipio is not None and registro.municipio != municipio:
+                        continue
+                    encontrados.append(registro)
+                    if len(encontrados) == limite:
+                        break
+        encontrados.reverse()
+        return encontrados
+
+    def recientes(self, max_bytes: int = 256 * 1024) -> List[RegistroHistorial]:
+        """Lee los registros más recientes desde el final del archivo."""
+        try:
+            with open(self.ruta, "rb") as archivo:
+                archivo.seek(0, os.SEEK_END)
+                tamano = archivo.tell()
+                archivo.seek(max(0, tamano - max_bytes))
+                datos = archivo.read()
+        except FileNotFoundError:
+            return []
+
+        lineas = datos.decode("utf-8", errors="ignore").splitlines()
+        if tamano > max_bytes and lineas:
+            lineas = lineas[1:]  # La primera línea puede estar cortada
+        return [r for r in map(self._parsear, lineas) if r is not None]
+
+    @staticmethod
+    def _parsear(linea: str) -> Optional[RegistroHistorial]:
+        linea = linea.strip()
+        if not linea:
+            return None
+        try:
+            return RegistroHistorial.from_dict(json.loads(linea))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"Registro de historial inválido: {e}")
+            return None
@@ -0,0 +1,203 @@
+"""
+Catálogos de idiomas del reporte y de la interfaz.
+
+Cada idioma es un JSON en data/idiomas con los textos de la interfaz, su
+plantilla de reporte y los nombres y descripciones de los estados del tiempo
+por índice. Se compilan una sola vez por proceso en tablas indexadas: las
+claves de los textos se numeran según el idioma predeterminado y cada idioma
+queda como una tupla alineada a esa numeración, completada con el
+predeterminado donde le falte algo. Los estados del tiempo salen del catálogo
+vigente (catalogos.py), así que un idioma se vuelve a compilar solo si ese
+catálogo se recarga.
+
+Los controles se enlazan a una clave con `EnlacesIdioma`: cambiar de idioma
+reescribe sus atributos sin reconstruir ningún componente.
+"""
+import json
+import os
+import re
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+from config import IDIOMAS, NOVEDAD_POR_DEFECTO, PLANTILLA_REPORTE
+from catalogos import Catalogos, obtener_catalogos
+from plantillas import PlantillaCompilada, compilar_plantilla
+
+PREDETERMINADO = IDIOMAS["predeterminado"]
+
+@dataclass(frozen=True)
+class Idioma:
+    """Un idioma compilado: textos por índice y tablas del tiempo por índice del tiempo."""
+    codigo: str
+    nombre: str
+    textos: Tuple[str, ...]
+    plantilla: PlantillaCompilada
+    novedad_por_defecto: str
+    sin_operador: str
+    formato_fecha: str
+    emojis: Tuple[str, ...]
+    nombres_tiempo: Tuple[str, ...]
+    descripciones: Tuple[str, ...]
+    # (clave, texto) de las opciones del selector de tiempo
+    opciones_tiempo: Tuple[Tuple[str, str], ...]
+    catalogos: Catalogos = field(repr=False, compare=False)
+
+    def texto(self, clave: str, **valores) -> str:
+        """Texto de la interfaz; los valores completan sus campos entre llaves."""
+        texto = self.textos[indice_texto(clave)]
+        return texto.format(**valores) if valores else texto
+
+    def indice_tiempo(self, indice: int) -> int:
+        """El índice si existe en el catálogo; si no, el primero."""
+        return indice if 0 <= indice < len(self.descripciones) else 0
+
+_fuentes: Dict[str, Dict] = {}
+_indices: Dict[str, int] = {}
+_compilados: Dict[str, Idioma] = {}
+_creacion = threading.RLock()  # _compilar numera las claves con el lock tomado
+
+# Un código es el nombre de un archivo del directorio, sin rutas
+_CODIGO = re.compile(r"[A-Za-z0-9_-]{1,32}")
+
+def _fuente(codigo: str) -> Dict:
+    """Contenido del archivo del idioma, leído una vez."""
+    fuente = _fuentes.get(codigo)
+    if fuente is None:
+        if not _CODIGO.fullmatch(codigo):
+            raise ValueError(f"Código de idioma inválido: {codigo!r}")
+        with open(os.path.join(IDIOMAS["directorio"], f"{codigo}.json"), encoding="utf-8") as archivo:
+            fuente = _fuentes[codigo] = json.load(archivo)
+    return fuente
+
+def indice_texto(clave: str) -> int:
+    """Posición de la clave en las tablas de textos (KeyError si no existe)."""
+    if not _indices:
+        with _creacion:
+            if not _indices:
+                _indices.update({c: i for i, c in enumerate(_fuente(PREDETERMINADO)["textos"])})
+    return _indices[clave]
+
+def idiomas_disponibles() -> Tuple[Tuple[str, str], ...]:
+    """(código, nombre) de los idiomas instalados, el predeterminado primero."""
+    try:
+        codigos = sorted(
+            os.path.splitext(nombre)[0] for nombre in os.listdir(IDIOMAS["directorio"]) if nombre.endswith(".json")
+        )
+    except OSError:
+        codigos = []
+    codigos = [PREDETERMINADO] + [c for c in codigos if c != PREDETERMINADO]
+    disponibles = []
+    for codigo in codigos:
+        try:
+            disponibles.append((codigo, _fuente(codigo).get("nombre", codigo)))
+        except (OSError, ValueError) as e:
+            print(f"Idioma {codigo} ignorado: {e}")
+    return tuple(disponibles)
+
+def _compilar(codigo: str, catalogos: Catalogos) -> Idioma:
+    base = _fuente(PREDETERMINADO)
+    fuente = _fuente(codigo)
+    textos = fuente.get("textos", {})
+    tabla = tuple(textos.get(clave) or base["textos"][clave] for clave in base["textos"])
+
+    tiempo = fuente.get("tiempo", {})
+    nombres = tuple(tiempo.get(str(t.indice), {}).get("nombre") or t.nombre for t in catalogos.tiempo)
+    descripciones = tuple(tiempo.get(str(t.indice), {}).get("descripcion") or t.descripcion for t in catalogos.tiempo)
+    emojis = tuple(t.emoji for t in catalogos.tiempo)
+
+    return Idioma(
+        codigo=codigo,
+        nombre=fuente.get("nombre", codigo),
+        textos=tabla,
+        plantilla=compilar_plantilla(fuente.get("plantilla") or PLANTILLA_REPORTE),
+        novedad_por_defecto=fuente.get("novedad_por_defecto") or NOVEDAD_POR_DEFECTO,
+        sin_operador=fuente.get("sin_operador") or base.get("sin_operador", ""),
+        formato_fecha=fuente.get("formato_fecha") or base.get("formato_fecha", "%d/%m/%Y"),
+        emojis=emojis,
+        nombres_tiempo=nombres,
+        descripciones=descripciones,
+        opciones_tiempo=tuple((str(i), f"{emojis[i]}  {nombres[i]}") for i in range(len(nombres))),
+        catalogos=catalogos
+    )
+
+def codigo_disponible(codigo: Optional[str]) -> bool:
+    """True si el código es el de un idioma instalado."""
+    return bool(codigo) and codigo in dict(idiomas_disponibles())
+
+def obtener_idioma(codigo: Optional[str] = None) -> Idioma:
+    """Idioma compilado del proceso; el predeterminado si no existe o no es válido."""
+    codigo = codigo or PREDETERMINADO
+    catalogos = obtener_catalogos()
+    idioma = _compilados.get(codigo)
+    if idioma is not None and idioma.catalogos is catalogos:
+        return idioma
+    if not _CODIGO.fullmatch(codigo):
+        return obtener_idioma(PREDETERMINADO)  # Ni se busca el archivo ni se guarda en caché
+    with _creacion:
+        idioma = _compilados.get(codigo)
+        if idioma is None or idioma.catalogos is not catalogos:
+            try:
+                idioma = _compilados[codigo] = _compilar(codigo, catalogos)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                if codigo == PREDETERMINADO:
+                    raise
+                print(f"Error al cargar el idioma {codigo}: {e}")
+                idioma = obtener_idioma(PREDETERMINADO)
+                if not isinstance(e, FileNotFoundError):
+                    # Archivo instalado pero inválido: se recuerda el reemplazo para no
+                    # reintentar en cada reporte (los códigos inexistentes no ocupan caché)
+                    _compilados[codigo] = idioma
+    return idioma
+
+def es_plantilla_de_idioma(texto: str) -> bool:
+    """True si el texto es la plantilla de algún idioma (no una plantilla propia del usuario)."""
+    return texto == PLANTILLA_REPORTE or any(
+        obtener_idioma(codigo).plantilla.texto == texto for codigo, _ in idiomas_disponibles()
+    )
+
+class EnlacesIdioma:
+    """Atributos de controles que muestran un texto del catálogo; se reescriben al cambiar de idioma.
+
+    Los controles se guardan con referencias débiles: los diálogos que se
+    descartan no quedan retenidos por los enlaces.
+    """
+
+    def __init__(self, idioma: Idioma):
+        self.idioma = idioma
+        # (id del control, atributo) -> (referencia, índice del texto, valores)
+        self._enlaces: Dict[Tuple[int, str], Tuple[Callable[[], object], int, Dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self._enlaces)
+
+    def enlazar(self, control, clave: str, atributo: str = "value", **valores):
+        """Muestra el texto de la clave en el atributo del control; devuelve el control."""
+        indice = indice_texto(clave)
+        setattr(control, atributo, self._texto(self.idioma, indice, valores))
+        try:
+            referencia = weakref.ref(control)
+        except TypeError:
+            referencia = lambda control=control: control  # noqa: E731
+        self._enlaces[(id(control), atributo)] = (referencia, indice, valores)
+        return control
+
+    @staticmethod
+    def _texto(idioma: Idioma, indice: int, valores: Dict) -> str:
+        texto = idioma.textos[indice]
+        return texto.format(**valores) if valores else texto
+
+    def aplicar(self, idioma: Idioma) -> list:
+        """Cambia al idioma; devuelve los controles cuyo texto cambió."""
+        self.idioma = idioma
+        cambiados = []
+        for clave, (referencia, indice, valores) in list(self._enlaces.items()):
+            control = referencia()
+            if control is None:
+                del self._enlaces[clave]
+                continue
+            texto = self._texto(idioma, indice, valores)
+            if getattr(control, clave[1], None) != texto:
+                setattr(control, clave[1], texto)
+                cambiados.append(control)
+        return cambiados
@@ -0,0 +1,454 @@
+"""
+Integridad del historial: cadena de hashes y puntos de control firmados.
+
+Cada registro del historial termina con el campo "h": el SHA-256 del hash del
+registro anterior seguido de la línea del registro sin ese campo. Cada
+`punto_cada` registros se anota en un archivo aparte un punto de control
+(cantidad de registros, posición en bytes y hash) firmado con HMAC-SHA256.
+
+La firma solo prueba algo si la clave no está al alcance de quien puede
+editar el historial: por defecto se genera junto a él y se avisa al usarla.
+Varios procesos pueden escribir el mismo historial; un bloqueo del sistema
+operativo sobre `<historial>.lock` serializa cada anexo con su verificación.
+
+Al abrir basta con verificar desde el último punto de control. La auditoría
+completa reparte los tramos entre puntos de control en un pool de procesos,
+ya que cada tramo empieza con un hash conocido. Los registros anteriores a la
+cadena (sin "h") quedan anclados por el hash de sus bytes.
+
+Uso (auditoría completa):
+    python src/integridad.py [ruta] [--procesos N]
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+from config import HISTORIAL_ARCHIVO, INTEGRIDAD
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+SUFIJO = b', "h": "'
+LARGO_SUFIJO = len(SUFIJO) + 64 + 2  # , "h": "<64 hex>"}
+INICIO = hashlib.sha256(b"").hexdigest()  # Hash de un historial sin registros previos a la cadena
+
+@dataclass(frozen=True)
+class PuntoControl:
+    """Estado de la cadena al terminar el registro número `registros`."""
+    registros: int
+    posicion: int
+    hash: str
+    firma: str = ""
+    legado: bool = False  # Ancla de los registros anteriores a la cadena
+
+    def mensaje(self) -> bytes:
+        return f"{self.registros}:{self.posicion}:{self.hash}:{int(self.legado)}".encode()
+
+    def to_dict(self) -> Dict:
+        datos = {"n": self.registros, "pos": self.posicion, "h": self.hash, "firma": self.firma}
+        if self.legado:
+            datos["legado"] = True
+        return datos
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PuntoControl':
+        return cls(data["n"], data["pos"], data["h"], data["firma"], data.get("legado", False))
+
+@dataclass
+class Verificacion:
+    """Resultado de verificar el historial; `registro` es el primero con problemas (desde 1)."""
+    valido: bool
+    registros: int = 0
+    verificados: int = 0
+    ultimo: str = INICIO
+    posicion: int = 0
+    desde_punto: int = 0
+    legado: bool = False  # El archivo solo tiene registros anteriores a la cadena
+    error: Optional[str] = None
+    registro: Optional[int] = None
+
+@dataclass
+class Auditoria:
+    """Resultado de la auditoría completa."""
+    registros: int = 0
+    puntos: int = 0
+    errores: List[Tuple[Optional[int], str]] = field(default_factory=list)
+
+    @property
+    def valido(self) -> bool:
+        return not self.errores
+
+_clave: Optional[bytes] = None
+_creacion = threading.Lock()
+
+def obtener_clave() -> bytes:
+    """Clave HMAC de los puntos de control; se genera la primera vez si no está configurada."""
+    global _clave
+    if _clave is None:
+        with _creacion:
+            if _clave is None:
+                if INTEGRIDAD["clave"]:
+                    _clave = bytes.fromhex(INTEGRIDAD["clave"])
+                else:
+                    _clave = _leer_o_crear_clave(INTEGRIDAD["archivo_clave"])
+                    _avisar_clave_local(INTEGRIDAD["archivo_clave"])
+    return _clave
+
+def _avisar_clave_local(ruta: str) -> None:
+    """Avisa si la clave está en el mismo directorio que el historial."""
+    if os.path.dirname(os.path.abspath(ruta)) == os.path.dirname(os.path.abspath(HISTORIAL_ARCHIVO)):
+        print(
+            f"AVISO: la clave de los puntos de control ({ruta}) está junto al historial; "
+            "quien pueda editar el historial puede volver a firmarlo. Para que las alteraciones "
+            "se detecten, configure REPORTE_HISTORIAL_CLAVE o REPORTE_HISTORIAL_CLAVE_ARCHIVO "
+            "fuera del directorio de datos."
+        )
+
+def _leer_o_crear_clave(ruta: str) -> bytes:
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Bajo bloqueo: si dos procesos arrancan a la vez, solo uno la crea
+    with _bloqueo_entre_procesos(ruta):
+        try:
+            with open(ruta, encoding="ascii") as archivo:
+                return bytes.fromhex(archivo.read().strip())
+        except FileNotFoundError:
+            pass
+        clave = secrets.token_bytes(32)
+        descriptor = os.open(ruta, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w", encoding="ascii") as archivo:
+            archivo.write(clave.hex())
+        return clave
+
+@contextmanager
+def _bloqueo_entre_procesos(ruta: str) -> Iterator[None]:
+    """Bloqueo exclusivo del sistema operativo sobre `<ruta>.lock`."""
+    with open(f"{ruta}.lock", "a+b") as archivo:
+        if fcntl is not None:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            archivo.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK se rinde tras unos 10 s; se sigue esperando
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+
+def firmar(punto: PuntoControl) -> PuntoControl:
+    firma = hmac.new(obtener_clave(), punto.mensaje(), hashlib.sha256).hexdigest()
+    return PuntoControl(punto.registros, punto.posicion, punto.hash, firma, punto.legado)
+
+def firma_valida(punto: PuntoControl) -> bool:
+    return hmac.compare_digest(firmar(punto).firma, punto.firma)
+
+def ruta_puntos(ruta: str) -> str:
+    """historial.jsonl -> historial.puntos.jsonl"""
+    base, extension = os.path.splitext(ruta)
+    return f"{base}.puntos{extension}"
+
+def leer_puntos(ruta: str) -> Tuple[List[PuntoControl], int]:
+    """Puntos de control del historial y cantidad de líneas ilegibles."""
+    puntos, ilegibles = [], 0
+    try:
+        archivo = open(ruta_puntos(ruta), encoding="utf-8")
+    except FileNotFoundError:
+        return puntos, ilegibles
+    with archivo:
+        for linea in archivo:
+            if not linea.strip():
+                continue
+            try:
+                puntos.append(PuntoControl.from_dict(json.loads(linea)))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                ilegibles += 1
+    return puntos, ilegibles
+
+def hash_registro(anterior: str, linea: bytes) -> str:
+    """Hash de una línea (sin el campo "h") encadenado al anterior."""
+    return hashlib.sha256(anterior.encode("ascii") + linea).hexdigest()
+
+def _hash_de_linea(cuerpo: bytes) -> Optional[str]:
+    """Campo "h" de una línea sin salto final, o None si no está encadenada."""
+    if len(cuerpo) > LARGO_SUFIJO and cuerpo[-LARGO_SUFIJO:-66] == SUFIJO and cuerpo.endswith(b'"}'):
+        return cuerpo[-66:-2].decode("ascii", errors="replace")
+    return None
+
+def _leer_final(ruta: str, posicion: int) -> List[bytes]:
+    """Las dos últimas líneas (sin salto) que terminan justo en `posicion`."""
+    with open(ruta, "rb") as archivo:
+        inicio = max(0, posicion - 64 * 1024)
+        archivo.seek(inicio)
+        datos = archivo.read(posicion - inicio)
+    if not datos.endswith(b"\n"):
+        return []
+    return datos[:-1].rsplit(b"\n", 2)[-2:]
+
+def _hash_en(ruta: str, posicion: int) -> Optional[str]:
+    """Campo "h" de la línea que termina justo en `posicion`."""
+    lineas = _leer_final(ruta, posicion)
+    return _hash_de_linea(lineas[-1]) if lineas else None
+
+def _desde_punto(ruta: str, punto: PuntoControl, puntos: List[PuntoControl]) -> Optional[Tuple[int, str]]:
+    """Inicio del registro del punto de control y hash del anterior, para verificar también ese registro."""
+    lineas = _leer_final(ruta, punto.posicion)
+    if not lineas:
+        return None
+    comienzo = punto.posicion - len(lineas[-1]) - 1
+    if comienzo == 0:
+        return 0, INICIO
+    anterior = _hash_de_linea(lineas[0]) if len(lineas) == 2 else None
+    if anterior is None and puntos[0].legado and puntos[0].posicion == comienzo:
+        anterior = puntos[0].hash  # El registro anterior es el último previo a la cadena
+    return (comienzo, anterior) if anterior is not None else None
+
+def verificar_tramo(
+    ruta: str,
+    inicio: int,
+    fin: Optional[int],
+    anterior: str,
+    puntos: List[Tuple[int, str]],
+    primer_registro: int,
+    permitir_legado: bool = False
+) -> Verificacion:
+    """Recorre las líneas entre `inicio` y `fin` (None = fin de archivo) rehaciendo la cadena.
+
+    `puntos` son las posiciones y hashes de control dentro del tramo. Tras un
+    error sigue contando con el hash escrito en cada línea, para conocer el
+    estado al final del archivo.
+    """
+    resultado = Verificacion(valido=True, ultimo=anterior, posicion=inicio)
+    legado = hashlib.sha256() if permitir_legado else None
+    pendientes = iter(puntos)
+    control = next(pendientes, None)
+    numero = primer_registro - 1
+
+    def fallar(mensaje: str) -> None:
+        if resultado.valido:
+            resultado.valido, resultado.error, resultado.registro = False, mensaje, numero
+
+    with open(ruta, "rb") as archivo:
+        archivo.seek(inicio)
+        posicion = inicio
+        for linea in archivo:
+            if fin is not None and posicion >= fin:
+                break
+            posicion += len(linea)
+            numero += 1
+            cuerpo = linea[:-1] if linea.endswith(b"\n") else linea
+            escrito = _hash_de_linea(cuerpo)
+            if escrito is not None:
+                if legado is not None:
+                    anterior, legado = legado.hexdigest(), None
+                if hash_registro(anterior, cuerpo[:-LARGO_SUFIJO] + b"}") != escrito:
+                    fallar("el registro no coincide con su hash")
+                anterior = escrito
+            elif legado is not None:
+                legado.update(linea)
+            else:
+                fallar("registro sin hash dentro de la cadena")
+            while control is not None and control[0] <= posicion:
+                actual = legado.hexdigest() if legado is not None else anterior
+                if control[0] != posicion or control[1] != actual:
+                    fallar("el historial no coincide con un punto de control")
+                control = next(pendientes, None)
+
+    if control is not None or (fin is not None and posicion < fin):
+        fallar("el historial es más corto que un punto de control")
+    resultado.legado = legado is not None and numero >= primer_registro
+    resultado.ultimo = legado.hexdigest() if legado is not None else anterior
+    resultado.posicion = posicion
+    resultado.verificados = numero - primer_registro + 1
+    resultado.registros = numero
+    resultado.desde_punto = resultado.verificados
+    return resultado
+
+def verificar(ruta: str) -> Verificacion:
+    """Verificación incremental: el último punto de control y los registros posteriores."""
+    if not os.path.exists(ruta):
+        return Verificacion(valido=True)
+    puntos, _ = leer_puntos(ruta)
+    if not puntos:
+        return verificar_tramo(ruta, 0, None, INICIO, [], 1, permitir_legado=True)
+
+    punto = puntos[-1]
+    inicio, anterior, controles, primer_registro = punto.posicion, punto.hash, [], punto.registros + 1
+    problema = None
+    if not firma_valida(punto):
+        problema = "firma inválida en el último punto de control"
+    elif punto.legado:
+        # Único punto: el ancla de los registros previos, que se verifica por sus bytes
+        anclaje = verificar_tramo(ruta, 0, punto.posicion, INICIO, [(punto.posicion, punto.hash)], 1, True)
+        if not anclaje.valido:
+            problema = anclaje.error
+    else:
+        desde = _desde_punto(ruta, punto, puntos)
+        if desde is None:
+            problema = "el historial no coincide con el último punto de control"
+        else:
+            inicio, anterior = desde
+            controles, primer_registro = [(punto.posicion, punto.hash)], punto.registros
+
+    resultado = verificar_tramo(ruta, inicio, None, anterior, controles, primer_registro)
+    resultado.desde_punto = resultado.registros - punto.registros
+    if problema:
+        resultado.valido, resultado.error, resultado.registro = False, problema, punto.registros
+    return resultado
+
+def _dividir(puntos: List[PuntoControl], tamano: int, tareas: int) -> List[Tuple]:
+    """Agrupa los tramos entre puntos de control en tareas de tamaño parecido."""
+    objetivo = max(1, tamano // max(1, tareas))
+    divisiones = []
+    inicio, anterior, primer_registro, controles = 0, INICIO, 1, []
+    for punto in puntos:
+        controles.append((punto.posicion, punto.hash))
+        if punto.posicion - inicio >= objetivo:
+            divisiones.append((inicio, punto.posicion, anterior, controles, primer_registro, inicio == 0))
+            inicio, anterior, primer_registro, controles = punto.posicion, punto.hash, punto.registros + 1, []
+    divisiones.append((inicio, None, anterior, controles, primer_registro, inicio == 0))
+    return divisiones
+
+def _auditar_tramo(argumentos: Tuple) -> Verificacion:
+    return verificar_tramo(*argumentos)
+
+def auditar(ruta: str, procesos: Optional[int] = None) -> Auditoria:
+    """Auditoría completa: firmas de todos los puntos y toda la cadena, por tramos en paralelo."""
+    auditoria = Auditoria()
+    if not os.path.exists(ruta):
+        return auditoria
+    procesos = procesos if procesos is not None else (os.cpu_count() or 1)
+    puntos, ilegibles = leer_puntos(ruta)
+    auditoria.puntos = len(puntos)
+    if ilegibles:
+        auditoria.errores.append((None, f"{ilegibles} puntos de control ilegibles"))
+
+    validos = []
+    for punto in puntos:
+        if not firma_valida(punto):
+            auditoria.errores.append((punto.registros, "firma inválida en un punto de control"))
+        elif validos and (punto.posicion <= validos[-1].posicion or punto.registros <= validos[-1].registros):
+            auditoria.errores.append((punto.registros, "punto de control fuera de orden"))
+        else:
+            validos.append(punto)
+
+    tareas = [(ruta, *tarea) for tarea in _dividir(validos, os.path.getsize(ruta), procesos * 4)]
+    if procesos <= 1 or len(tareas) == 1:
+        resultados = map(_auditar_tramo, tareas)
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_auditar_tramo, tareas))
+    for resultado in resultados:
+        auditoria.registros = max(auditoria.registros, resultado.registros)
+        if not resultado.valido:
+            auditoria.errores.append((resultado.registro, resultado.error))
+    auditoria.errores.sort(key=lambda e: e[0] or 0)
+    return auditoria
+
+@dataclass
+class _EstadoCadena:
+    ultimo: str
+    registros: int
+    posicion: int
+    desde_punto: int
+
+_estados: Dict[str, _EstadoCadena] = {}
+_locks: Dict[str, threading.Lock] = {}
+
+def _lock_de(ruta: str) -> threading.Lock:
+    with _creacion:
+        return _locks.setdefault(ruta, threading.Lock())
+
+def _cargar_estado(ruta: str) -> _EstadoCadena:
+    """Estado de la cadena al final del archivo, verificando desde el último punto de control."""
+    verificacion = verificar(ruta)
+    ultimo = verificacion.ultimo
+    if not verificacion.valido:
+        print(f"Historial alterado (registro {verificacion.registro}): {verificacion.error}")
+        # La cadena continúa desde lo escrito; la alteración queda para la auditoría
+        ultimo = _hash_en(ruta, verificacion.posicion) or ultimo
+    estado = _EstadoCadena(ultimo, verificacion.registros, verificacion.posicion, verificacion.desde_punto)
+    if verificacion.legado:
+        # Registros de antes de la cadena: se anclan con un punto de control
+        _anexar_puntos(ruta, [PuntoControl(estado.registros, estado.posicion, ultimo, legado=True)])
+        estado.desde_punto = 0
+    return estado
+
+def _anexar_puntos(ruta: str, puntos: List[PuntoControl]) -> None:
+    lineas = "".join(json.dumps(firmar(p).to_dict()) + "\n" for p in puntos)
+    with open(ruta_puntos(ruta), "a", encoding="utf-8") as archivo:
+        archivo.write(lineas)
+
+def anexar(ruta: str, lineas: List[str]) -> None:
+    """Encadena y anexa líneas JSON (objetos sin salto final); firma los puntos de control que toquen.
+
+    El estado de la cadena se comparte entre las sesiones del proceso, y el
+    bloqueo del sistema operativo hace atómicos la comprobación y el anexo
+    frente a otros procesos. Si el archivo cambió por fuera (otro proceso),
+    se vuelve a verificar desde el último punto de control antes de seguir.
+    """
+    if not lineas:
+        return
+    ruta = os.path.abspath(ruta)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with _lock_de(ruta), _bloqueo_entre_procesos(ruta):
+        estado = _estados.get(ruta)
+        tamano = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        if estado is None or estado.posicion != tamano:
+            estado = _cargar_estado(ruta)
+
+        partes, puntos = [], []
+        ultimo, registros, posicion, desde_punto = estado.ultimo, estado.registros, estado.posicion, estado.desde_punto
+        for linea in lineas:
+            cuerpo = linea.encode("utf-8")
+            ultimo = hash_registro(ultimo, cuerpo)
+            completa = cuerpo[:-1] + SUFIJO + ultimo.encode("ascii") + b'"}\n'
+            partes.append(completa)
+            registros += 1
+            desde_punto += 1
+            posicion += len(completa)
+            if desde_punto >= INTEGRIDAD["punto_cada"]:
+                puntos.append(PuntoControl(registros, posicion, ultimo))
+                desde_punto = 0
+
+        with open(ruta, "ab") as archivo:
+            archivo.write(b"".join(partes))
+        _estados[ruta] = _EstadoCadena(ultimo, registros, posicion, desde_punto)
+        if puntos:
+            _anexar_puntos(ruta, puntos)
+
+def main():
+    parser = argparse.ArgumentParser(description="Auditoría completa del historial de reportes")
+    parser.add_argument("ruta", nargs="?", default=HISTORIAL_ARCHIVO)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    auditoria = auditar(args.ruta, args.procesos)
+    print(f"{auditoria.registros} registros, {auditoria.puntos} puntos de control")
+    for registro, error in auditoria.errores:
+        print(f"  registro {registro if registro is not None else '-'}: {error}")
+    print("Historial íntegro" if auditoria.valido else f"{len(auditoria.errores)} problemas encontrados")
+    return 0 if auditoria.valido else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,30 +4,72 @@ Aplicación principal para generar reportes meteorológicos.
 Refactorizada con arquitectura limpia y componentes reutilizables.
 """
 import flet as ft
-import json
-from models import AppState
+import datetime
+import time
+from typing import Optional
+from models import AppState, OperadorManager
+from roster import obtener_servicio_roster
+from recordatorios import ProgramadorRecordatorios
+from tareas import en_segundo_plano
+from codificacion import codificar_operadores
+from despacho import obtener_despachador
+from pluviometros import obtener_ingesta
+from novedades import obtener_indice_novedades
+from sincronizacion import obtener_sincronizador
+from sesiones import obtener_registro_sesiones, tamano_profundo
+from catalogos import obtener_catalogos
+from territorio import obtener_catalogo_territorial
+from metricas import ARRANQUE, PRIMER_CUADRO, iniciar_escritura, instrumentar_pagina
+from primer_cuadro import CLAVE as CLAVE_INSTANTANEA, capturar, leer_instantanea, serializar
+from formatos import a_dict, a_whatsapp
 from ui_components import (
-    CustomAppBar, ReportDisplay, WeatherSelector, OperatorSelector,
-    ActionButtons, SettingsDialog, OperatorManagementDialog
+    CustomAppBar, ReportDisplay, WeatherSelector, OperatorSelector, NovedadField,
+    ActionButtons, SettingsDialog, OperatorManagementDialog, ExportDialog, DashboardView,
+    FirstFrame, MainLayout
 )
 from styles import ButtonStyles, ThemeManager, TextStyles, ContainerStyles, Colors
-from config import WINDOW_CONFIG, get_cargos, MUNICIPIOS, DEFAULT_OPERATORS
+from config import WINDOW_CONFIG, DEFAULT_OPERATORS, ROSTER_COMPARTIDO
 
 class WeatherReportApp:
     """Aplicación principal de reportes meteorológicos."""
 
-    def __init__(self, page: ft.Page):
+    def __init__(self, page: ft.Page, inicio: float = 0.0, primer_cuadro: Optional[FirstFrame] = None):
+        inicio = inicio or time.perf_counter()
         self.page = page
-        self.app_state = AppState(page=page)
+        # Con primer cuadro, los componentes adoptan sus controles ya pintados
+        self._primer_cuadro = primer_cuadro
+        self._instantanea_guardada = None
+        instrumentar_pagina(page)
+        self.sincronizador = obtener_sincronizador()
+        self.app_state = AppState(page=page, servicio_roster=self._shared_roster(), sincronizador=self.sincronizador)
+        self._catalogos = obtener_catalogos()
+        self._territorio = None  # Se lee la primera vez que se usa
+        self._export_dialog: Optional[ExportDialog] = None
         self._setup_page()
         self._create_components()
         self._build_ui()
         self._load_saved_theme()
         self._initial_update()
+        if primer_cuadro is None:
+            PRIMER_CUADRO.fijar(time.perf_counter() - inicio, "completa")
+        self._start_reminders()
+        self._start_pluviometros()
+        self._start_sincronizacion()
+        self.sesion = obtener_registro_sesiones().registrar(
+            lambda: self.page.run_thread(self._liberar), self._medir_liberable
+        )
+        ARRANQUE.fijar(time.perf_counter() - inicio)
+        iniciar_escritura()
+
+    def _shared_roster(self):
+        """Devuelve el roster compartido del proceso si está habilitado."""
+        if not ROSTER_COMPARTIDO:
+            return None
+        return obtener_servicio_roster(OperadorManager(page=self.page).leer_almacenamiento)
 
     def _setup_page(self):
         """Configura las propiedades básicas de la página."""
-        self.page.title = WINDOW_CONFIG["title"]
+        self.app_state.enlaces.enlazar(self.page, "app.titulo", "title")
         self.page.window.width = WINDOW_CONFIG["width"]
         self.page.window.height = WINDOW_CONFIG["height"]
         self.page.window.resizable = WINDOW_CONFIG["resizable"]
@@ -37,61 +79,62 @@ class WeatherReportApp:
 
     def _create_components(self):
         """Crea los componentes de la interfaz."""
-        self.weather_selector = WeatherSelector(self.app_state, self._on_data_change)
-        self.operator_selector = OperatorSelector(self.app_state, self._on_data_change)
-        self.settings_dialog = SettingsDialog(self.app_state, self.page, self._on_settings_save)
+        cuadro = self._primer_cuadro
+        self.weather_selector = WeatherSelector(
+            self.app_state, self._on_data_change, cuadro.weather_dropdown if cuadro else None
+        )
+        self.operator_selector = OperatorSelector(
+            self.app_state, self._on_data_change, self.page, cuadro.operator_dropdown if cuadro else None
+        )
+        self.novedades = obtener_indice_novedades(self.app_state.historial)
+        self.novedad_field = NovedadField(
+            self.app_state, self.novedades, self._on_novedad_change, self._save_snapshot,
+            field=cuadro.novedad_field if cuadro else None,
+            results=cuadro.novedad_results if cuadro else None
+        )
+        self._settings_dialog: Optional[SettingsDialog] = None  # Se construye al abrirlo
 
         self.app_bar = CustomAppBar(
             self.app_state,
             self._on_theme_toggle,
             self._show_operator_management_dialog,
-            self.settings_dialog.show,
-            self._show_about_dialog
+            self._show_settings_dialog,
+            self._show_about_dialog,
+            on_export=self._show_export_dialog,
+            on_dashboard=self._toggle_dashboard
         )
         self.page.appbar = self.app_bar.app_bar
 
-        self.report_display = ReportDisplay(self.app_state)
-        self.action_buttons = ActionButtons(self.app_state, self.operator_selector, self.page)
+        self.report_display = ReportDisplay(self.app_state, cuadro.report_container if cuadro else None)
+        self.dashboard = None  # Se construye la primera vez que se abre
+        self.action_buttons = ActionButtons(
+            self.app_state, self.operator_selector, self.page, on_copy=self._on_report_copied,
+            copy_button=cuadro.copy_button if cuadro else None
+        )
 
     def _build_ui(self):
         """Construye la interfaz de usuario."""
-        data_container = ft.Container(
-            ft.Column([
-                ft.Text("Datos del reporte", style=TextStyles.subtitle(self.app_state.is_dark_theme)),
+        if self._primer_cuadro:
+            layout = self._primer_cuadro.layout  # Ya está en la página
+        else:
+            layout = MainLayout(
+                self.app_state.is_dark_theme,
+                self.report_display.container,
                 self.weather_selector.dropdown,
                 self.operator_selector.dropdown,
-            ], alignment="center", horizontal_alignment="center", spacing=12),
-            **ContainerStyles.card(self.app_state.is_dark_theme),
-            width=500,
-            alignment=ft.alignment.center
-        )
-
-        credits = ft.Text("Creado por: Rubén Rojas", style=TextStyles.caption(self.app_state.is_dark_theme))
-
-        main_column = ft.Column([
-            self.report_display.container,
-            data_container,
-            ft.Row([self.action_buttons.copy_button], alignment=ft.MainAxisAlignment.CENTER),
-            ft.Row([credits], alignment=ft.MainAxisAlignment.CENTER)
-        ],
-        expand=True,
-        alignment=ft.MainAxisAlignment.CENTER,
-        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        spacing=18,
-        scroll=ft.ScrollMode.ADAPTIVE)
-
-        # Se envuelve la columna principal en un contenedor con el color de fondo
-        # para evitar un parpadeo gris (flickering) al cambiar de tema.
-        # Esta es una solución alternativa para un posible problema de renderizado.
-        self.main_container = ft.Container(
-            main_column,
-            expand=True,
-            bgcolor=ThemeManager.get_page_bgcolor(self.app_state.is_dark_theme)
-        )
-        self.page.add(self.main_container)
+                self.novedad_field.field,
+                self.novedad_field.results,
+                self.action_buttons.copy_button,
+                self.app_state.idioma
+            )
+            self.page.add(layout.main_container)
+        self.app_state.enlaces.enlazar(layout.title, "principal.datos")
+        self.app_state.enlaces.enlazar(layout.credits, "principal.creditos")
 
-        self.data_container = data_container
-        self.credits = credits
+        self.main_container = layout.main_container
+        self.main_column = layout.main_column
+        self.data_container = layout.data_container
+        self.credits = layout.credits
 
     def _load_saved_theme(self):
         """Carga el tema guardado en el almacenamiento del cliente."""
@@ -105,11 +148,13 @@ class WeatherReportApp:
 
     def _on_theme_toggle(self):
         """Cambia el tema de la aplicación."""
+        self._actividad()
         self.app_state.is_dark_theme = not self.app_state.is_dark_theme
         theme_value = "dark" if self.app_state.is_dark_theme else "light"
-        self.page.client_storage.set("theme", theme_value)
         self._apply_theme()
         self.page.update()
+        self.page.run_task(en_segundo_plano, self.page.client_storage.set, "theme", theme_value)
+        self._save_snapshot()
 
     def _apply_theme(self):
         """Aplica el tema actual a todos los componentes."""
@@ -129,8 +174,12 @@ class WeatherReportApp:
         self.report_display.update_theme()
         self.weather_selector.update_theme()
         self.operator_selector.update_theme()
+        self.novedad_field.update_theme()
         self.action_buttons.update_theme()
-        self.settings_dialog.update_theme()
+        if self._settings_dialog:
+            self._settings_dialog.update_theme()
+        if self.dashboard:
+            self.dashboard.update_theme()
 
         container_style = ContainerStyles.card(self.app_state.is_dark_theme)
         for key, value in container_style.items():
@@ -141,16 +190,249 @@ class WeatherReportApp:
 
     def _on_data_change(self, e=None):
         """Maneja los cambios en los datos (tiempo u operador)."""
+        self._actividad()
         self.report_display.update_report()
         self.page.update()
+        self._save_snapshot()
+
+    def _on_novedad_change(self):
+        """Refresca el reporte mientras se escribe la novedad; la instantánea se guarda al terminar."""
+        self._actividad()
+        self.report_display.update_report()
+        self.page.update()
+
+    def _save_snapshot(self):
+        """Guarda en segundo plano lo que se ve, para pintarlo en el próximo arranque."""
+        datos = serializar(capturar(self.app_state))
+        if datos != self._instantanea_guardada:
+            self._instantanea_guardada = datos
+            self.page.run_task(en_segundo_plano, self.page.client_storage.set, CLAVE_INSTANTANEA, datos)
 
     def _on_settings_save(self):
         """Se ejecuta cuando se guardan los ajustes."""
+        self._actividad()
+        self.reminders.vigilar(self.app_state.municipio)
+        ingesta = obtener_ingesta()
+        if ingesta:
+            self._apply_sugerencia(ingesta.sugerencia(self.app_state.municipio))
+        self._apply_language()
+        self.report_display.update_report()
+        self.page.update()
+        self._save_snapshot()
+        if self._dashboard_visible():
+            self.dashboard.refresh(forzar=True)
+
+    def _apply_language(self):
+        """Reescribe los textos enlazados y las opciones en el idioma vigente, sin reconstruir componentes."""
+        self.app_state.enlaces.aplicar(self.app_state.idioma)
+        self.weather_selector.actualizar_idioma()
+        self.novedad_field.actualizar_idioma()
+        if self.dashboard:
+            self.dashboard.actualizar_idioma()
+
+    def _start_reminders(self):
+        """Inicia los recordatorios de reportes y el refresco de la hora."""
+        self.reminders = ProgramadorRecordatorios(
+            on_vencido=self._on_report_due,
+            on_minuto=self._on_minute_tick
+        )
+        recientes = self.app_state.historial.recientes()
+        self.reminders.cargar_historial(recientes)
+        self.app_state.deduplicador.cargar_historial(recientes)
+        self.reminders.vigilar(self.app_state.municipio)
+        self.page.run_task(self.reminders.ejecutar)
+        self.page.run_task(self._verificar_historial)
+        self.page.on_disconnect = self._on_disconnect
+
+    async def _verificar_historial(self):
+        """Verifica el historial desde el último punto de control y avisa si fue alterado."""
+        verificacion = await en_segundo_plano(self.app_state.historial.verificar)
+        if verificacion.valido:
+            return
+        snackbar = ft.SnackBar(
+            ft.Text(
+                self.app_state.idioma.texto(
+                    "aviso.historial_alterado", registro=verificacion.registro, error=verificacion.error
+                ),
+                color=ft.Colors.WHITE
+            ),
+            bgcolor=Colors.ERROR,
+            duration=30000
+        )
+        self.page.open(snackbar)
+        self.page.update()
+
+    def _start_pluviometros(self):
+        """Preselecciona el tiempo que sugieren los pluviómetros, si hay ingesta."""
+        self._desuscribir_pluviometros = None
+        ingesta = obtener_ingesta()
+        if ingesta is None:
+            return
+        if self._apply_sugerencia(ingesta.sugerencia(self.app_state.municipio)):
+            self.page.update()
+        self._desuscribir_pluviometros = ingesta.suscribir(
+            lambda cambios: self.page.run_thread(self._on_sugerencias, cambios)
+        )
+
+    def _start_sincronizacion(self):
+        """Registra el roster local y aplica lo recibido del nodo central, si hay uno."""
+        self._desuscribir_sincronizacion = None
+        if self.sincronizador is None:
+            return
+        manager = self.app_state.operador_manager
+        self.sincronizador.sembrar_roster([op.to_dict() for op in manager.obtener_operadores()])
+        self._on_remote_roster()
+        self._desuscribir_sincronizacion = self.sincronizador.suscribir(
+            lambda cambios: self.page.run_thread(self._on_remote_roster)
+        )
+
+    def _on_remote_roster(self):
+        """Aplica en el hilo de la sesión los cambios de operadores de otras estaciones."""
+        seleccionado = self.app_state.obtener_operador_actual()
+        manager = self.app_state.operador_manager
+        if manager.aplicar_roster_sincronizado():
+            # Mantener al operador elegido aunque cambien los índices
+            if seleccionado:
+                self.app_state.cambiar_operador(seleccionado.nombre)
+            self.app_state.indice_operador = min(self.app_state.indice_operador, max(manager.cantidad - 1, 0))
+            self.operator_selector.refresh_options()
+            self.report_display.update_report()
+            self.page.update()
+
+    def _apply_sugerencia(self, sugerencia) -> bool:
+        """Aplica la sugerencia del municipio, o retira la anterior si ya no hay; True si cambió."""
+        if sugerencia is None or sugerencia.indice < 0:
+            if not self.weather_selector.retirar_sugerencia():
+                return False
+        else:
+            self.weather_selector.sugerir(sugerencia)
+        self.report_display.update_report()
+        return True
+
+    def _on_sugerencias(self, cambios):
+        """Aplica en el hilo de la sesión las sugerencias que cambiaron."""
+        if self.dashboard:
+            cambiadas = self.dashboard.aplicar_sugerencias(cambios)
+            if cambiadas and self._dashboard_visible():
+                self.page.update(*cambiadas)
+        municipio = self.app_state.municipio
+        if municipio in cambios and self._apply_sugerencia(cambios[municipio]) and not self._dashboard_visible():
+            self.page.update()
+
+    def _on_disconnect(self, e=None):
+        """Libera las tareas y suscripciones de la sesión."""
+        self.reminders.detener()
+        self.operator_selector.close()
+        self.sesion.cerrar()
+        if self._desuscribir_pluviometros:
+            self._desuscribir_pluviometros()
+        if self._desuscribir_sincronizacion:
+            self._desuscribir_sincronizacion()
+
+    def _on_report_copied(self, reporte, registro):
+        """Reprograma el recordatorio y encola el reporte para su despacho."""
+        self._actividad()
+        self.reminders.registrar_reporte(registro.municipio, registro.momento)
+        if registro.novedad:
+            self.novedades.registrar(registro.municipio, registro.novedad)
+        if self.sincronizador:
+            self.page.run_task(en_segundo_plano, self.sincronizador.registrar_reportes, [registro])
+        despachador = obtener_despachador()
+        if despachador:
+            carga = {"texto": a_whatsapp(reporte), "reporte": a_dict(reporte), "confirmacion": registro.confirmacion}
+            self.page.run_task(en_segundo_plano, despachador.encolar, carga)
+
+    def _on_batch_copied(self, reportes, registros):
+        """Reprograma los recordatorios y encola el lote con una sola escritura."""
+        self._actividad()
+        self.reminders.registrar_reportes(registros)
+        if self.sincronizador:
+            self.page.run_task(en_segundo_plano, self.sincronizador.registrar_reportes, registros)
+        despachador = obtener_despachador()
+        if despachador:
+            cargas = [
+                {"texto": a_whatsapp(r), "reporte": a_dict(r), "confirmacion": g.confirmacion}
+                for r, g in zip(reportes, registros)
+            ]
+            self.page.run_task(en_segundo_plano, despachador.encolar_lote, cargas)
+
+    def _on_report_due(self, municipio: str, ultimo: float):
+        """Muestra una alerta cuando un municipio tiene un reporte pendiente."""
+        hora = datetime.datetime.fromtimestamp(ultimo).strftime('%H:%M')
+        snackbar = ft.SnackBar(
+            ft.Text(self.app_state.idioma.texto("aviso.pendiente", municipio=municipio, hora=hora), color=ft.Colors.WHITE),
+            bgcolor=Colors.WARNING,
+            duration=15000
+        )
+        self.page.open(snackbar)
+        self.page.update()
+
+    def _on_minute_tick(self):
+        """Refresca la HORA del reporte al cambiar el minuto."""
+        cambiado = self._refresh_catalogs()
+        if self.app_state.actualizar_guardia():
+            # Relevo de guardia: el selector muestra al nuevo operador
+            self.operator_selector.refresh_options()
+            cambiado = True
+        if self._dashboard_visible() and not cambiado:
+            self.dashboard.refresh()
+            return
         self.report_display.update_report()
         self.page.update()
 
+    def _refresh_catalogs(self) -> bool:
+        """Aplica los catálogos si su archivo cambió; devuelve True si hubo cambios."""
+        return self._refresh_tiempo() | self._refresh_territorio()
+
+    def _refresh_tiempo(self) -> bool:
+        catalogos = obtener_catalogos()
+        if catalogos is self._catalogos:
+            return False
+        self._catalogos = catalogos
+        # El idioma se recompila con el catálogo nuevo
+        self.weather_selector.actualizar_idioma()
+        if self.dashboard:
+            self.dashboard.actualizar_idioma()
+        return True
+
+    def _refresh_territorio(self) -> bool:
+        """Rehace las opciones y coincidencias de municipios abiertas con la división nueva."""
+        territorio = obtener_catalogo_territorial()
+        anterior, self._territorio = self._territorio, territorio
+        if anterior is None or territorio is anterior:
+            return False
+        if self._settings_dialog:
+            self._settings_dialog.actualizar_territorio()
+        if self.dashboard:
+            self.dashboard.actualizar_territorio()
+        if self._export_dialog and self._export_dialog.dialog and self._export_dialog.dialog.open:
+            self._export_dialog.actualizar_municipios()
+        return True
+
+    def _dashboard_visible(self) -> bool:
+        return self.dashboard is not None and self.main_container.content is self.dashboard.container
+
+    def _toggle_dashboard(self, e=None):
+        """Alterna entre el reporte individual y el tablero de municipios."""
+        self._actividad()
+        if self._dashboard_visible():
+            self.report_display.update_report()
+            self.main_container.content = self.main_column
+            self.page.update()
+            return
+
+        construido = self.dashboard is not None
+        if not construido:
+            self.dashboard = DashboardView(self.app_state, self.page, on_copy=self._on_batch_copied)
+        self.main_container.content = self.dashboard.container
+        self.page.update()
+        if construido:
+            # Pudo cambiar la hora o los ajustes mientras estaba oculto
+            self.dashboard.refresh(forzar=True)
+
     def _show_operator_management_dialog(self, e=None):
         """Crea y muestra un nuevo diálogo de gestión de operadores."""
+        self._actividad()
         dialog = OperatorManagementDialog(
             app_state=self.app_state,
             operator_selector=self.operator_selector,
@@ -158,20 +440,72 @@ class WeatherReportApp:
         )
         dialog.show()
 
+    def _show_export_dialog(self, e=None):
+        """Crea y muestra el diálogo de exportación del historial."""
+        self._actividad()
+        self._export_dialog = ExportDialog(self.app_state, self.page)
+        self._export_dialog.show()
+
+    def _show_settings_dialog(self, e=None):
+        """Muestra los ajustes, construyendo el diálogo si no existe o se liberó."""
+        self._actividad()
+        if self._settings_dialog is None:
+            self._settings_dialog = SettingsDialog(self.app_state, self.page, self._on_settings_save)
+        self._settings_dialog.show()
+
+    def _actividad(self):
+        """Marca actividad del usuario; la sesión deja de contar como inactiva."""
+        sesion = getattr(self, "sesion", None)  # Aún no existe durante la construcción
+        if sesion:
+            sesion.tocar()
+
+    def _estructuras_liberables(self) -> list:
+        """Lo que la sesión puede soltar y reconstruir al volver a usarlo."""
+        estructuras = [self._settings_dialog, self._export_dialog, self.novedad_field.results]
+        estructuras += self.action_buttons.liberables() + self.app_state.liberables()
+        if self.dashboard and not self._dashboard_visible():
+            estructuras.append(self.dashboard)
+        if self._dashboard_visible():
+            estructuras.append(self.report_display.text_widget.spans)
+        return estructuras
+
+    def _medir_liberable(self) -> int:
+        """Bytes aproximados de las estructuras liberables (se llama desde el hilo de revisión)."""
+        return tamano_profundo(
+            self._estructuras_liberables(),
+            excluir=(self.page, self.app_state, self, self.main_container, self.main_column)
+        )
+
+    def _liberar(self):
+        """Suelta en el hilo de la sesión las estructuras pesadas; se reconstruyen al usarlas."""
+        if self._settings_dialog and not (self._settings_dialog.dialog and self._settings_dialog.dialog.open):
+            self._settings_dialog = None
+        if self._export_dialog and not (self._export_dialog.dialog and self._export_dialog.dialog.open):
+            self._export_dialog = None
+        self.action_buttons.liberar()
+        if self.dashboard and not self._dashboard_visible():
+            self.dashboard = None  # Se reconstruye al volver a abrirlo
+        elif self._dashboard_visible():
+            self.report_display.liberar()  # _toggle_dashboard lo redibuja al volver
+        self.app_state.liberar()
+        if self.novedad_field.liberar():
+            self.page.update()
+
     def _show_about_dialog(self, e=None):
         """Muestra el diálogo 'Acerca de'."""
         is_dark = self.app_state.is_dark_theme
         dialog_style = ContainerStyles.dialog(is_dark)
+        texto = self.app_state.idioma.texto
 
         about_dialog = ft.AlertDialog(
             modal=True,
-            title=ft.Text("Acerca de", style=TextStyles.subtitle(is_dark)),
+            title=ft.Text(texto("acerca.titulo"), style=TextStyles.subtitle(is_dark)),
             content=ft.Column(
                 [
                     ft.Image(src="icon.png", width=100, height=100),
-                    ft.Text("Creado por:", style=TextStyles.body(is_dark)),
+                    ft.Text(texto("acerca.creado_por"), style=TextStyles.body(is_dark)),
                     ft.Text("Rubén Rojas", weight=ft.FontWeight.BOLD, size=16),
-                    ft.Text("Versión 1.0.0", style=TextStyles.caption(is_dark)),
+                    ft.Text(texto("acerca.version", version="1.0.0"), style=TextStyles.caption(is_dark)),
                 ],
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER,
                 spacing=10,
@@ -180,7 +514,7 @@ class WeatherReportApp:
             ),
             actions=[
                 ft.ElevatedButton(
-                    "Cerrar",
+                    texto("comun.cerrar"),
                     on_click=lambda e: self.page.close(about_dialog),
                     style=ButtonStyles.secondary(is_dark)
                 )
@@ -197,15 +531,28 @@ class WeatherReportApp:
 
 def main(page: ft.Page):
     """Función principal de la aplicación."""
+    inicio = time.perf_counter()
 
+    # Arranque en frío: pintar lo último que se vio y cargar el resto después
+    instantanea = leer_instantanea(page.client_storage)
+    if instantanea:
+        primer_cuadro = FirstFrame(instantanea)
+        primer_cuadro.mostrar(page)
+        PRIMER_CUADRO.fijar(time.perf_counter() - inicio, "instantanea")
+        page.run_thread(_hidratar, page, inicio, primer_cuadro)
+        return
+
+    _hidratar(page, inicio)
+
+def _hidratar(page: ft.Page, inicio: float, primer_cuadro: Optional[FirstFrame] = None):
+    """Carga el estado completo y construye la aplicación."""
     # Inicialización de datos por defecto si no existen
     if not page.client_storage.contains_key("operators"):
-        page.client_storage.set("operators", json.dumps(DEFAULT_OPERATORS))
-
-    if not page.client_storage.contains_key("municipalities"):
-        page.client_storage.set("municipalities", json.dumps(MUNICIPIOS))
+        page.client_storage.set("operators", codificar_operadores(
+            (op["nombre"], op["cargo"], op["jerarquia"], op["cedula"]) for op in DEFAULT_OPERATORS
+        ))
 
-    app = WeatherReportApp(page)
+    WeatherReportApp(page, inicio, primer_cuadro)
 
 if __name__ == "__main__":
     ft.app(target=main, assets_dir="assets")
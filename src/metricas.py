@@ -0,0 +1,262 @@
+"""
+Métricas de operación (contadores, medidores e histogramas).
+
+Con las métricas habilitadas, un hilo escribe cada cierto intervalo un archivo
+en formato de texto de Prometheus (para el textfile collector de
+node_exporter) o JSON. Deshabilitadas, las métricas son objetos nulos cuyos
+métodos no hacen nada, así que instrumentar el código no cuesta casi nada.
+"""
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from config import METRICAS
+
+Etiquetas = Tuple[str, ...]
+
+class Metrica:
+    """Base de las métricas con etiquetas."""
+
+    tipo = ""
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas = tuple(etiquetas)
+        self._lock = threading.Lock()
+
+    def muestras(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """(sufijo, etiquetas, valor) de cada serie."""
+        raise NotImplementedError
+
+    def _nombres(self, valores: Etiquetas) -> Dict[str, str]:
+        return dict(zip(self.etiquetas, valores))
+
+class Contador(Metrica):
+    """Valor que solo aumenta."""
+
+    tipo = "counter"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self._valores: Dict[Etiquetas, float] = {}
+
+    def inc(self, *etiquetas: str, cantidad: float = 1) -> None:
+        with self._lock:
+            self._valores[etiquetas] = self._valores.get(etiquetas, 0) + cantidad
+
+    def muestras(self):
+        with self._lock:
+            return [("", self._nombres(k), v) for k, v in self._valores.items()]
+
+class Medidor(Metrica):
+    """Valor que puede subir o bajar."""
+
+    tipo = "gauge"
+
+    def __init__(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self._valores: Dict[Etiquetas, float] = {}
+
+    def fijar(self, valor: float, *etiquetas: str) -> None:
+        with self._lock:
+            self._valores[etiquetas] = valor
+
+    def muestras(self):
+        with self._lock:
+            return [("", self._nombres(k), v) for k, v in self._valores.items()]
+
+class Histograma(Metrica):
+    """Distribución de valores en cubetas acumuladas."""
+
+    tipo = "histogram"
+
+    def __init__(self, nombre: str, ayuda: str, cubetas: Sequence[float], etiquetas: Sequence[str] = ()):
+        super().__init__(nombre, ayuda, etiquetas)
+        self.cubetas = tuple(sorted(cubetas))
+        # etiquetas -> [conteos por cubeta..., suma, total]
+        self._valores: Dict[Etiquetas, List[float]] = {}
+
+    def observar(self, valor: float, *etiquetas: str) -> None:
+        with self._lock:
+            serie = self._valores.get(etiquetas)
+            if serie is None:
+                serie = self._valores[etiquetas] = [0] * (len(self.cubetas) + 2)
+            for i, limite in enumerate(self.cubetas):
+                if valor <= limite:
+                    serie[i] += 1
+                    break
+            serie[-2] += valor
+            serie[-1] += 1
+
+    def muestras(self):
+        resultado = []
+        with self._lock:
+            series = {k: list(v) for k, v in self._valores.items()}
+        for clave, serie in series.items():
+            nombres = self._nombres(clave)
+            acumulado = 0
+            for limite, conteo in zip(self.cubetas, serie):
+                acumulado += conteo
+                resultado.append(("_bucket", {**nombres, "le": repr(float(limite))}, acumulado))
+            resultado.append(("_bucket", {**nombres, "le": "+Inf"}, serie[-1]))
+            resultado.append(("_sum", nombres, serie[-2]))
+            resultado.append(("_count", nombres, serie[-1]))
+        return resultado
+
+class MetricaNula:
+    """Sustituto sin efecto cuando las métricas están deshabilitadas."""
+
+    def inc(self, *etiquetas, cantidad=1):
+        pass
+
+    def fijar(self, valor, *etiquetas):
+        pass
+
+    def observar(self, valor, *etiquetas):
+        pass
+
+class RegistroMetricas:
+    """Conjunto de métricas del proceso."""
+
+    def __init__(self, habilitado: bool):
+        self.habilitado = habilitado
+        self.metricas: List[Metrica] = []
+
+    def _registrar(self, metrica: Metrica):
+        if not self.habilitado:
+            return MetricaNula()
+        self.metricas.append(metrica)
+        return metrica
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Contador:
+        return self._registrar(Contador(nombre, ayuda, etiquetas))
+
+    def medidor(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Medidor:
+        return self._registrar(Medidor(nombre, ayuda, etiquetas))
+
+    def histograma(self, nombre: str, ayuda: str, cubetas: Sequence[float], etiquetas: Sequence[str] = ()) -> Histograma:
+        return self._registrar(Histograma(nombre, ayuda, cubetas, etiquetas))
+
+    def a_prometheus(self) -> str:
+        """Formato de exposición de texto de Prometheus."""
+        lineas = []
+        for metrica in self.metricas:
+            lineas.append(f"# HELP {metrica.nombre} {metrica.ayuda}")
+            lineas.append(f"# TYPE {metrica.nombre} {metrica.tipo}")
+            for sufijo, etiquetas, valor in metrica.muestras():
+                if etiquetas:
+                    texto = ",".join(f'{k}="{_escapar(v)}"' for k, v in etiquetas.items())
+                    lineas.append(f"{metrica.nombre}{sufijo}{{{texto}}} {valor}")
+                else:
+                    lineas.append(f"{metrica.nombre}{sufijo} {valor}")
+        return "\n".join(lineas) + "\n"
+
+    def a_json(self) -> str:
+        return json.dumps({
+            "momento": time.time(),
+            "metricas": [
+                {
+                    "nombre": metrica.nombre,
+                    "tipo": metrica.tipo,
+                    "ayuda": metrica.ayuda,
+                    "muestras": [
+                        {"nombre": metrica.nombre + sufijo, "etiquetas": etiquetas, "valor": valor}
+                        for sufijo, etiquetas, valor in metrica.muestras()
+                    ]
+                }
+                for metrica in self.metricas
+            ]
+        }, ensure_ascii=False)
+
+    def escribir(self, ruta: str, formato: str) -> None:
+        """Escribe todas las métricas de forma atómica."""
+        contenido = self.a_json() if formato == "json" else self.a_prometheus()
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+            archivo.write(contenido)
+        os.replace(ruta + ".tmp", ruta)
+
+def _escapar(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+REGISTRO = RegistroMetricas(METRICAS["habilitadas"])
+
+# Métricas de la aplicación
+REPORTES_EMITIDOS = REGISTRO.contador(
+    "reporte_tiempo_emitidos_total", "Reportes copiados por municipio y resultado de la deduplicación",
+    ("municipio", "accion")
+)
+LATENCIA_COPIA = REGISTRO.histograma(
+    "reporte_tiempo_copia_segundos", "Tiempo desde el clic de copiar hasta la actualización de la página",
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0), ("tipo",)
+)
+ACTUALIZACIONES_PAGINA = REGISTRO.contador(
+    "reporte_tiempo_actualizaciones_pagina_total", "Llamadas a page.update()"
+)
+ALMACENAMIENTO = REGISTRO.histograma(
+    "reporte_tiempo_almacenamiento_segundos", "Duración de las operaciones de client_storage",
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0), ("operacion",)
+)
+ARRANQUE = REGISTRO.medidor(
+    "reporte_tiempo_arranque_segundos", "Tiempo de arranque de la última sesión"
+)
+PRIMER_CUADRO = REGISTRO.medidor(
+    "reporte_tiempo_primer_cuadro_segundos", "Tiempo hasta el primer cuadro con el reporte visible",
+    ("ruta",)
+)
+MEMORIA_SESIONES = REGISTRO.medidor(
+    "reporte_tiempo_sesiones_memoria_bytes", "Memoria liberable estimada de las sesiones abiertas"
+)
+SESIONES_LIBERADAS = REGISTRO.contador(
+    "reporte_tiempo_sesiones_liberadas_total", "Sesiones cuyas estructuras pesadas se liberaron", ("motivo",)
+)
+
+_escritor: Optional[threading.Thread] = None
+_creacion = threading.Lock()
+
+def iniciar_escritura() -> None:
+    """Inicia, una vez por proceso, el hilo que escribe el archivo de métricas."""
+    global _escritor
+    if not REGISTRO.habilitado or _escritor is not None:
+        return
+    with _creacion:
+        if _escritor is None:
+            _escritor = threading.Thread(target=_escribir_periodicamente, name="metricas", daemon=True)
+            _escritor.start()
+
+def _escribir_periodicamente() -> None:
+    while True:
+        time.sleep(METRICAS["intervalo"])
+        try:
+            REGISTRO.escribir(METRICAS["archivo"], METRICAS["formato"])
+        except OSError as e:
+            print(f"Error escribiendo métricas: {e}")
+
+def instrumentar_pagina(page) -> None:
+    """Cuenta las actualizaciones de la página y mide el almacenamiento del cliente."""
+    if not REGISTRO.habilitado:
+        return
+
+    actualizar = page.update
+
+    def update(*controles):
+        ACTUALIZACIONES_PAGINA.inc()
+        return actualizar(*controles)
+    page.update = update
+
+    storage = page.client_storage
+    for operacion in ("get", "set", "contains_key", "remove"):
+        original = getattr(storage, operacion, None)
+        if original is not None:
+            setattr(storage, operacion, _medir(original, operacion))
+
+def _medir(funcion, operacion: str):
+    def medida(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            ALMACENAMIENTO.observar(time.perf_counter() - inicio, operacion)
+    return medida
@@ -6,9 +6,23 @@ import json
 import os
 import datetime
 import re
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import List, Dict, Optional, Sequence, Tuple
 from dataclasses import dataclass
-from config import TIEMPO, EMOJI_TIEMPO, DEPARTAMENTO
+from config import DEPARTAMENTO, ESTADO, IDIOMAS, PLANTILLA_REPORTE
+from catalogos import obtener_catalogos
+from formatos import a_whatsapp
+from idiomas import EnlacesIdioma, Idioma, codigo_disponible, es_plantilla_de_idioma, obtener_idioma
+from plantillas import PlantillaCompilada, compilar_plantilla, cargar_plantilla, guardar_plantilla
+from historial import HistorialReportes, RegistroHistorial
+from deduplicacion import CONFIRMACION, REPETIDO, huella_estado, obtener_deduplicador
+from metricas import REPORTES_EMITIDOS
+from tareas import en_paralelo
+from codificacion import ErrorCodificacion, codificar_operadores, decodificar_operadores, desempaquetar, empaquetar
+from turnos import CalendarioTurnos, obtener_calendario
+from sincronizacion import Sincronizador
+from roster import InstantaneaRoster, Modificacion, ServicioRoster
 
 @dataclass
 class Operador:
@@ -34,70 +48,163 @@ class Operador:
         return cls(**data)
 
 class OperadorManager:
-    """Gestor para manejar operadores."""
+    """Gestor para manejar operadores.
+
+    Sin `servicio` el roster es propio de la sesión; con un `ServicioRoster`
+    se comparte entre sesiones y las lecturas usan su instantánea actual.
+    """
     
-    def __init__(self, page=None):
+    def __init__(self, page=None, servicio: Optional[ServicioRoster] = None, sincronizador: Optional[Sincronizador] = None):
         self.page = page
-        self._operadores: List[Operador] = []
-        self.cargar_operadores()
+        self.servicio = servicio
+        self.sincronizador = sincronizador
+        self._local: Optional[InstantaneaRoster] = InstantaneaRoster(0, ())
+        self._version_liberada = 0
+        self._lock_guardado = threading.Lock()
+        if servicio is None:
+            self.cargar_operadores()
 
-    def cargar_operadores(self) -> None:
-        """Carga los operadores desde el almacenamiento del cliente."""
+    @property
+    def _instantanea(self) -> InstantaneaRoster:
+        if self.servicio:
+            return self.servicio.instantanea()
+        if self._local is None:
+            self.cargar_operadores()  # Liberado: se vuelve a leer al usarlo
+        return self._local
+
+    @property
+    def liberado(self) -> bool:
+        return self.servicio is None and self._local is None
+
+    def liberables(self) -> list:
+        """Lo que liberar() soltaría: la copia propia del roster, si la hay."""
+        return [] if self.servicio else [self._local]
+
+    def liberar(self) -> bool:
+        """Suelta la copia propia del roster si puede volver a leerse del almacenamiento."""
+        if self.servicio or self._local is None or not (self.page and self.page.client_storage):
+            return False
+        self._version_liberada = self._local.version
+        self._local = None
+        return True
+
+    @property
+    def _operadores(self) -> Tuple[Operador, ...]:
+        return self._instantanea.operadores
+
+    def leer_almacenamiento(self) -> List[Operador]:
+        """Lee los operadores guardados en el almacenamiento del cliente."""
         if self.page and self.page.client_storage:
             try:
                 data_str = self.page.client_storage.get("operators")
                 if data_str:
-                    data = json.loads(data_str)
-                    self._operadores = [Operador.from_dict(op) for op in data]
-            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    return [Operador(*fila) for fila in decodificar_operadores(data_str)]
+            except ErrorCodificacion as e:
                 print(f"Error cargando operadores desde client_storage: {e}")
-                self._operadores = []
+        return []
+
+    def cargar_operadores(self) -> None:
+        """Carga los operadores desde el almacenamiento del cliente."""
+        if self.page and self.page.client_storage:
+            version = self._local.version if self._local is not None else self._version_liberada
+            self._local = InstantaneaRoster(version + 1, tuple(self.leer_almacenamiento()))
 
     def guardar_operadores(self) -> None:
         """Guarda los operadores en el almacenamiento del cliente."""
         if self.page and self.page.client_storage:
             try:
-                data = [op.to_dict() for op in self._operadores]
-                self.page.client_storage.set("operators", json.dumps(data))
+                # Serializar y escribir juntos para que el último guardado sea el más reciente
+                with self._lock_guardado:
+                    data = codificar_operadores((op.nombre, op.cargo, op.jerarquia, op.cedula) for op in self._operadores)
+                    self.page.client_storage.set("operators", data)
             except Exception as e:
                 print(f"Error guardando operadores en client_storage: {e}")
+
+    def _modificar(self, modificacion: Modificacion) -> bool:
+        """Aplica una modificación al roster local o compartido."""
+        if self.servicio:
+            return self.servicio.modificar(modificacion)
+        actual = self._instantanea
+        operadores = modificacion(actual.operadores)
+        if operadores is None:
+            return False
+        self._local = InstantaneaRoster(actual.version + 1, operadores)
+        return True
     
-    def agregar_operador(self, nombre: str, cargo: str, jerarquia: str, cedula: str) -> bool:
-        """Agrega un nuevo operador."""
+    def agregar_operador(self, nombre: str, cargo: str, jerarquia: str, cedula: str, guardar: bool = True) -> bool:
+        """Agrega un nuevo operador. Con guardar=False la persistencia queda a cargo del llamador."""
         if not all([nombre.strip(), cargo, jerarquia, cedula.strip()]):
             return False
         
-        # Verificar si ya existe un operador con el mismo nombre o cédula
-        if self.buscar_por_nombre(nombre.strip()) or self.buscar_por_cedula(cedula.strip()):
-            return False
-        
         operador = Operador(nombre.strip(), cargo, jerarquia, cedula.strip())
-        self._operadores.append(operador)
-        self.guardar_operadores()
+
+        def agregar(operadores):
+            # Verificar si ya existe un operador con el mismo nombre o cédula
+            if any(op.nombre == operador.nombre or op.cedula == operador.cedula for op in operadores):
+                return None
+            return operadores + (operador,)
+
+        if not self._modificar(agregar):
+            return False
+        if self.sincronizador:
+            self.sincronizador.registrar_operador(operador.nombre, operador.to_dict())
+        if guardar:
+            self.guardar_operadores()
         return True
     
-    def eliminar_operador(self, nombre: str) -> bool:
+    def eliminar_operador(self, nombre: str, guardar: bool = True) -> bool:
         """Elimina un operador por nombre."""
-        operador = self.buscar_por_nombre(nombre)
-        if operador:
-            self._operadores.remove(operador)
+        def eliminar(operadores):
+            restantes = tuple(op for op in operadores if op.nombre != nombre)
+            return restantes if len(restantes) != len(operadores) else None
+
+        if not self._modificar(eliminar):
+            return False
+        if self.sincronizador:
+            self.sincronizador.registrar_operador(nombre, None)
+        if guardar:
             self.guardar_operadores()
-            return True
-        return False
+        return True
+
+    def aplicar_roster_sincronizado(self) -> bool:
+        """Iguala el roster al que resulta de la sincronización; devuelve True si cambió.
+
+        Conserva el orden de los operadores que ya estaban y agrega al final los nuevos.
+        """
+        vigentes = {datos["nombre"]: Operador.from_dict(datos) for datos in self.sincronizador.roster()}
+
+        def aplicar(operadores):
+            restantes = dict(vigentes)
+            resultado = tuple(restantes.pop(op.nombre) for op in operadores if op.nombre in restantes)
+            resultado += tuple(restantes.values())
+            return resultado if resultado != operadores else None
+
+        if not self._modificar(aplicar):
+            return False
+        self.guardar_operadores()
+        return True
     
+    @property
+    def turnos(self) -> CalendarioTurnos:
+        """Calendario de turnos vigente."""
+        return obtener_calendario()
+
+    def operador_en_guardia(self, municipio: str, momento: Optional[float] = None) -> Optional[Operador]:
+        """Operador de guardia en el municipio según el calendario, si está en el roster."""
+        nombre = self.turnos.en_guardia(time.time() if momento is None else momento, municipio)
+        return self.buscar_por_nombre(nombre) if nombre else None
+
     def buscar_por_nombre(self, nombre: str) -> Optional[Operador]:
         """Busca un operador por nombre."""
-        for op in self._operadores:
-            if op.nombre == nombre:
-                return op
-        return None
+        instantanea = self._instantanea
+        indice = instantanea.por_nombre.get(nombre)
+        return instantanea.operadores[indice] if indice is not None else None
     
     def buscar_por_cedula(self, cedula: str) -> Optional[Operador]:
         """Busca un operador por cédula."""
-        for op in self._operadores:
-            if op.cedula == cedula:
-                return op
-        return None
+        instantanea = self._instantanea
+        indice = instantanea.por_cedula.get(cedula)
+        return instantanea.operadores[indice] if indice is not None else None
     
     def obtener_nombres(self) -> List[str]:
         """Obtiene la lista de nombres de operadores."""
@@ -105,60 +212,129 @@ class OperadorManager:
     
     def obtener_operadores(self) -> List[Operador]:
         """Obtiene la lista completa de operadores."""
-        return self._operadores.copy()
+        return list(self._operadores)
     
     def obtener_operador_por_indice(self, indice: int) -> Optional[Operador]:
         """Obtiene un operador por índice."""
-        if 0 <= indice < len(self._operadores):
-            return self._operadores[indice]
+        operadores = self._operadores
+        if 0 <= indice < len(operadores):
+            return operadores[indice]
         return None
     
     def obtener_indice_por_nombre(self, nombre: str) -> int:
         """Obtiene el índice de un operador por nombre."""
-        for i, op in enumerate(self._operadores):
-            if op.nombre == nombre:
-                return i
-        return -1
+        return self._instantanea.por_nombre.get(nombre, -1)
     
     @property
     def cantidad(self) -> int:
         """Obtiene la cantidad de operadores."""
         return len(self._operadores)
 
+@dataclass(frozen=True)
+class Reporte:
+    """Representación estructurada de un reporte, independiente del formato de salida."""
+    municipio: str
+    departamento: str
+    indice_tiempo: int
+    emoji: str
+    descripcion: str
+    fecha: str
+    hora: str
+    novedad: str
+    operador: Optional[Operador]
+    momento: datetime.datetime
+    segmentos: Tuple[Tuple[str, bool], ...]
+    idioma: str = IDIOMAS["predeterminado"]
+
+    @property
+    def reporta(self) -> str:
+        return str(self.operador) if self.operador else obtener_idioma(self.idioma).sin_operador
+
 class ReportGenerator:
     """Generador de reportes meteorológicos."""
-    
+
     @staticmethod
-    def generar_reporte(
+    def construir_reporte(
         indice_tiempo: int,
         operador: Optional[Operador],
         municipio: str,
-        departamento: str
-    ) -> str:
-        """Genera el reporte meteorológico."""
-        fecha_actual = datetime.date.today().strftime('%d/%m/%Y')
-        hora_actual = datetime.datetime.now().strftime('%H:%M')
-        
+        departamento: str,
+        momento: Optional[datetime.datetime] = None,
+        plantilla: Optional[PlantillaCompilada] = None,
+        novedad: Optional[str] = None,
+        idioma: Optional[Idioma] = None
+    ) -> Reporte:
+        """Construye la representación estructurada del reporte en el idioma indicado."""
+        idioma = idioma or obtener_idioma()
+        momento = momento or datetime.datetime.now()
+        fecha_actual = momento.strftime(idioma.formato_fecha)
+        hora_actual = momento.strftime('%H:%M')
+
         # Validar índice de tiempo
-        if not (0 <= indice_tiempo < len(TIEMPO)):
-            indice_tiempo = 0
-        
+        indice_tiempo = idioma.indice_tiempo(indice_tiempo)
+        emoji = idioma.emojis[indice_tiempo]
+        descripcion = idioma.descripciones[indice_tiempo]
+
         # Formatear operador
-        operador_str = str(operador) if operador else "(Sin operador)"
-        
-        # Generar reporte
-        reporte = (
-            f"*PROTECCIÓN CIVIL MUNICIPIO {municipio.upper()}* 🚨\n\n"
-            f"*·   REPORTE DEL ESTADO DEL TIEMPO:* {EMOJI_TIEMPO[indice_tiempo]}\n"
-            f"*·   FECHA:* {fecha_actual}\n"
-            f"*·   HORA:* {hora_actual} HLV\n\n"
-            f"*·   DESCRIPCIÓN:* {TIEMPO[indice_tiempo]}\n\n"
-            f"*·   NOVEDAD:* Sin novedades para la hora.\n\n"
-            f"*·   REPORTA:* {operador_str}\n\n"
-            f"*SOLO QUEREMOS SALVAR VIDAS 🚨🚑*"
+        operador_str = str(operador) if operador else idioma.sin_operador
+        novedad = novedad or idioma.novedad_por_defecto
+
+        plantilla = plantilla or idioma.plantilla
+        segmentos = plantilla.renderizar({
+            "municipio": municipio,
+            "municipio_mayus": municipio.upper(),
+            "departamento": departamento,
+            "emoji": emoji,
+            "fecha": fecha_actual,
+            "hora": hora_actual,
+            "descripcion": descripcion,
+            "novedad": novedad,
+            "reporta": operador_str
+        })
+
+        return Reporte(
+            municipio=municipio,
+            departamento=departamento,
+            indice_tiempo=indice_tiempo,
+            emoji=emoji,
+            descripcion=descripcion,
+            fecha=fecha_actual,
+            hora=hora_actual,
+            novedad=novedad,
+            operador=operador,
+            momento=momento,
+            segmentos=segmentos,
+            idioma=idioma.codigo
         )
-        
-        return reporte
+
+    @staticmethod
+    def traducir(reporte: Reporte, idioma: Idioma, plantilla: Optional[PlantillaCompilada] = None) -> Reporte:
+        """El mismo reporte (estado, operador, hora y novedad) en otro idioma."""
+        if idioma.codigo == reporte.idioma and plantilla is None:
+            return reporte
+        novedad = reporte.novedad
+        if novedad == obtener_idioma(reporte.idioma).novedad_por_defecto:
+            novedad = None  # La novedad por defecto también se traduce
+        return ReportGenerator.construir_reporte(
+            reporte.indice_tiempo, reporte.operador, reporte.municipio, reporte.departamento,
+            momento=reporte.momento, plantilla=plantilla, novedad=novedad, idioma=idioma
+        )
+
+    @staticmethod
+    def generar_reporte(
+        indice_tiempo: int,
+        operador: Optional[Operador],
+        municipio: str,
+        departamento: str,
+        plantilla: Optional[PlantillaCompilada] = None,
+        novedad: Optional[str] = None,
+        idioma: Optional[Idioma] = None
+    ) -> str:
+        """Genera el reporte meteorológico en formato WhatsApp."""
+        reporte = ReportGenerator.construir_reporte(
+            indice_tiempo, operador, municipio, departamento, plantilla=plantilla, novedad=novedad, idioma=idioma
+        )
+        return a_whatsapp(reporte)
     
     @staticmethod
     def markdown_a_textspan(texto: str):
@@ -195,22 +371,42 @@ class ReportGenerator:
         
         return spans
 
+@dataclass
+class FilaTablero:
+    """Estado propio de un municipio en el tablero."""
+    municipio: str
+    indice_tiempo: int = 0
+    seleccionada: bool = False  # Solo en memoria, para la copia por lote
+
 class AppState:
     """Estado global de la aplicación."""
     
-    def __init__(self, page=None):
+    def __init__(self, page=None, servicio_roster: Optional[ServicioRoster] = None, sincronizador: Optional[Sincronizador] = None):
         self.page = page
-        self.operador_manager = OperadorManager(page=self.page)
+        self.operador_manager = OperadorManager(page=self.page, servicio=servicio_roster, sincronizador=sincronizador)
+        self.historial = HistorialReportes()
+        self.deduplicador = obtener_deduplicador(self.historial.ruta)  # Compartido entre sesiones
         self.indice_tiempo = 0
         self.indice_operador = 0
         self.is_dark_theme = False
         self.departamento = DEPARTAMENTO
         self.municipio = "Guanta"  # Valor por defecto
+        self.estado = ESTADO
+        self.novedad = ""  # Vacía: se reporta la novedad por defecto
+        self.codigo_idioma = IDIOMAS["predeterminado"]
+        self.plantilla = self.idioma.plantilla
+        self.tablero: List[FilaTablero] = []
+        self._guardia: Optional[str] = None  # Último operador de guardia aplicado
+        self._operador_retenido: Optional[Operador] = None  # Mientras el roster está liberado
         self.cargar_configuracion()
+        self.enlaces = EnlacesIdioma(self.idioma)
         self._set_default_operator()
 
     def _set_default_operator(self):
-        """Establece el operador por defecto."""
+        """Establece el operador por defecto: el de guardia, o uno fijo si no hay turnos."""
+        self.actualizar_guardia()
+        if self._guardia is not None:
+            return
         default_operator_name = "Rubén Rojas"
         default_operator_index = self.operador_manager.obtener_indice_por_nombre(default_operator_name)
         if default_operator_index != -1:
@@ -221,16 +417,97 @@ class AppState:
         if self.page and self.page.client_storage:
             self.departamento = self.page.client_storage.get("departamento") or self.departamento
             self.municipio = self.page.client_storage.get("municipio") or self.municipio
+            self.estado = self.page.client_storage.get("estado") or self.estado
+            codigo = self.page.client_storage.get("idioma")
+            if codigo_disponible(codigo):  # Lo guardado puede ser cualquier cosa
+                self.codigo_idioma = codigo
+            texto = cargar_plantilla(self.page)
+            # Sin plantilla propia se usa la del idioma
+            self.plantilla = self.idioma.plantilla if es_plantilla_de_idioma(texto) else compilar_plantilla(texto)
+            self.tablero = self._leer_tablero()
+
+    def _leer_tablero(self) -> List[FilaTablero]:
+        """Lee las filas del tablero guardadas como [[municipio, índice], ...]."""
+        try:
+            datos = json.loads(desempaquetar(self.page.client_storage.get("dashboard") or "[]"))
+            return [FilaTablero(municipio, int(indice)) for municipio, indice in datos]
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
+            print(f"Error al cargar el tablero: {e}")
+            return []
+
+    def guardar_tablero(self):
+        """Guarda las filas del tablero en el almacenamiento del cliente."""
+        if self.page and self.page.client_storage:
+            datos = [[fila.municipio, fila.indice_tiempo] for fila in self.tablero]
+            self.page.client_storage.set("dashboard", empaquetar(json.dumps(datos, ensure_ascii=False, separators=(",", ":"))))
 
     def guardar_configuracion(self):
         """Guarda la configuración actual del usuario en el almacenamiento del cliente."""
         if self.page and self.page.client_storage:
             self.page.client_storage.set("departamento", self.departamento)
             self.page.client_storage.set("municipio", self.municipio)
+            self.page.client_storage.set("estado", self.estado)
+            self.page.client_storage.set("idioma", self.codigo_idioma)
+            guardar_plantilla(self.page, self._plantilla_guardada())
+
+    async def guardar_configuracion_async(self):
+        """Guarda la configuración escribiendo las claves en paralelo fuera del bucle de la UI."""
+        if self.page and self.page.client_storage:
+            storage = self.page.client_storage
+            departamento, municipio, estado = self.departamento, self.municipio, self.estado
+            idioma, plantilla = self.codigo_idioma, self._plantilla_guardada()
+            await en_paralelo(
+                lambda: storage.set("departamento", departamento),
+                lambda: storage.set("municipio", municipio),
+                lambda: storage.set("estado", estado),
+                lambda: storage.set("idioma", idioma),
+                lambda: guardar_plantilla(self.page, plantilla)
+            )
+
+    def _plantilla_guardada(self) -> str:
+        """Texto a guardar: la plantilla de un idioma no se guarda, se sigue al idioma elegido."""
+        texto = self.plantilla.texto
+        return PLANTILLA_REPORTE if es_plantilla_de_idioma(texto) else texto
+
+    def cambiar_plantilla(self, texto: str) -> None:
+        """Cambia la plantilla del reporte. Lanza PlantillaError si no es válida."""
+        self.plantilla = compilar_plantilla(texto)
+
+    @property
+    def idioma(self) -> Idioma:
+        """Idioma compilado de la sesión."""
+        return obtener_idioma(self.codigo_idioma)
+
+    def cambiar_idioma(self, codigo: str) -> bool:
+        """Cambia el idioma del reporte y de la interfaz; True si cambió.
+
+        Una plantilla propia se conserva; la de un idioma pasa a la del nuevo.
+        Los controles enlazados se actualizan con `enlaces.aplicar`.
+        """
+        if codigo == self.codigo_idioma or not codigo_disponible(codigo):
+            return False
+        propia = not es_plantilla_de_idioma(self.plantilla.texto)
+        self.codigo_idioma = codigo
+        if not propia:
+            self.plantilla = self.idioma.plantilla
+        return True
 
     def obtener_operador_actual(self) -> Optional[Operador]:
         """Obtiene el operador actualmente seleccionado."""
+        if self._operador_retenido and self.operador_manager.liberado:
+            return self._operador_retenido  # El refresco de la hora no recarga el roster
+        self._operador_retenido = None
         return self.operador_manager.obtener_operador_por_indice(self.indice_operador)
+
+    def liberables(self) -> list:
+        """Lo que liberar() soltaría, para medirlo."""
+        return self.operador_manager.liberables()
+
+    def liberar(self) -> None:
+        """Suelta la copia del roster de una sesión inactiva."""
+        operador = self.obtener_operador_actual()
+        if self.operador_manager.liberar():
+            self._operador_retenido = operador
     
     def cambiar_operador(self, nombre: str) -> None:
         """Cambia el operador seleccionado por nombre."""
@@ -238,11 +515,45 @@ class AppState:
         if indice >= 0:
             self.indice_operador = indice
     
+    def actualizar_guardia(self, momento: Optional[float] = None) -> bool:
+        """Selecciona al operador de guardia si cambió desde la última consulta.
+
+        Solo actúa en los relevos de guardia, así que una selección manual se
+        respeta hasta el siguiente cambio de turno.
+        """
+        operador = self.operador_manager.operador_en_guardia(self.municipio, momento)
+        nombre = operador.nombre if operador else None
+        if nombre == self._guardia:
+            return False
+        self._guardia = nombre
+        if nombre is None:
+            return False
+        anterior = self.indice_operador
+        self.cambiar_operador(nombre)
+        return self.indice_operador != anterior
+
+    def cambiar_novedad(self, texto: str) -> None:
+        """Cambia la novedad del reporte actual."""
+        self.novedad = " ".join(texto.split())
+
     def cambiar_tiempo(self, indice: int) -> None:
         """Cambia el índice del tiempo seleccionado."""
-        if 0 <= indice < len(TIEMPO):
+        if 0 <= indice < len(obtener_catalogos().tiempo):
             self.indice_tiempo = indice
     
+    def construir_reporte_actual(self) -> Reporte:
+        """Construye el reporte estructurado con el estado actual."""
+        operador = self.obtener_operador_actual()
+        return ReportGenerator.construir_reporte(
+            self.indice_tiempo,
+            operador,
+            self.municipio,
+            self.departamento,
+            plantilla=self.plantilla,
+            novedad=self.novedad,
+            idioma=self.idioma
+        )
+
     def generar_reporte_actual(self) -> str:
         """Genera el reporte con el estado actual."""
         operador = self.obtener_operador_actual()
@@ -250,5 +561,136 @@ class AppState:
             self.indice_tiempo,
             operador,
             self.municipio,
-            self.departamento
-        )
\ No newline at end of file
+            self.departamento,
+            plantilla=self.plantilla,
+            novedad=self.novedad,
+            idioma=self.idioma
+        )
+
+    def agregar_al_tablero(self, municipio: str) -> Optional[FilaTablero]:
+        """Agrega un municipio al tablero; None si ya estaba."""
+        if any(fila.municipio == municipio for fila in self.tablero):
+            return None
+        fila = FilaTablero(municipio, self.indice_tiempo)
+        self.tablero.append(fila)
+        return fila
+
+    def quitar_del_tablero(self, municipio: str) -> None:
+        """Quita un municipio del tablero."""
+        self.tablero = [fila for fila in self.tablero if fila.municipio != municipio]
+
+    def operador_de_municipio(
+        self, municipio: str, segundos: Optional[float] = None, actual: Optional[Operador] = None
+    ) -> Optional[Operador]:
+        """Operador que firma el reporte de un municipio: el de guardia o, si no hay, el actual."""
+        return self.operador_manager.operador_en_guardia(municipio, segundos) or actual or self.obtener_operador_actual()
+
+    def construir_reporte_fila(self, fila: FilaTablero, momento: Optional[datetime.datetime] = None) -> Reporte:
+        """Construye el reporte de una fila del tablero, con el operador que lo firmará."""
+        return ReportGenerator.construir_reporte(
+            fila.indice_tiempo,
+            self.operador_de_municipio(fila.municipio, momento.timestamp() if momento else None),
+            fila.municipio,
+            self.departamento,
+            momento=momento,
+            plantilla=self.plantilla,
+            idioma=self.idioma
+        )
+
+    def emitir_reporte(
+        self,
+        indice_tiempo: int,
+        municipio: str,
+        operador: Optional[Operador],
+        momento: Optional[datetime.datetime] = None,
+        novedad: Optional[str] = None
+    ) -> Tuple[Reporte, str, Optional[RegistroHistorial]]:
+        """Reporte, texto a copiar y registro a guardar (None si repite el estado dentro de la ventana)."""
+        momento = momento or datetime.datetime.now()
+        idioma = self.idioma
+        firmante = operador.nombre if operador else ""
+        huella = huella_estado(municipio, self.departamento, indice_tiempo, firmante, novedad or "")
+
+        def construir():
+            reporte = ReportGenerator.construir_reporte(
+                indice_tiempo, operador, municipio, self.departamento,
+                momento=momento, plantilla=self.plantilla, novedad=novedad, idioma=idioma
+            )
+            return reporte, a_whatsapp(reporte)
+
+        # El texto solo cambia con el estado, la plantilla, el idioma y el minuto
+        clave = (huella, momento.strftime("%Y-%m-%d %H:%M"), self.plantilla.texto, idioma.codigo)
+        reporte, texto = self.deduplicador.renderizado(clave, construir)
+
+        accion = self.deduplicador.clasificar(huella, municipio, momento.timestamp(), firmante)
+        REPORTES_EMITIDOS.inc(municipio, accion)
+        if accion == REPETIDO:
+            return reporte, texto, None
+        registro = RegistroHistorial.desde_reporte(reporte, confirmacion=accion == CONFIRMACION)
+        registro.momento = momento.timestamp()
+        return reporte, texto, registro
+
+    def emitir_reporte_actual(self) -> Tuple[Reporte, str, Optional[RegistroHistorial]]:
+        """Emite el reporte con el estado actual."""
+        return self.emitir_reporte(
+            self.indice_tiempo, self.municipio, self.obtener_operador_actual(), novedad=self.novedad
+        )
+
+    def emitir_lote(
+        self,
+        filas: List[FilaTablero],
+        operadores: Optional[List[Operador]] = None
+    ) -> List[Tuple[Reporte, str, Optional[RegistroHistorial]]]:
+        """Emite en una pasada los reportes de varias filas y operadores, con la misma hora.
+
+        Sin operadores explícitos, cada municipio usa a su operador de guardia
+        o, si no tiene, al operador actual.
+        """
+        momento = datetime.datetime.now()
+        if not operadores:
+            actual = self.obtener_operador_actual()
+            segundos = momento.timestamp()
+            return [
+                self.emitir_reporte(
+                    fila.indice_tiempo, fila.municipio,
+                    self.operador_de_municipio(fila.municipio, segundos, actual), momento
+                )
+                for fila in filas
+            ]
+        return [
+            self.emitir_reporte(fila.indice_tiempo, fila.municipio, operador, momento)
+            for fila in filas
+            for operador in operadores
+        ]
+
+    def emitir_lote_idiomas(
+        self,
+        filas: List[FilaTablero],
+        operadores: Optional[List[Operador]] = None,
+        idiomas: Sequence[str] = ()
+    ) -> List[Tuple[Reporte, Dict[str, str], Optional[RegistroHistorial]]]:
+        """Emite el lote una vez y da el texto de cada reporte en cada idioma pedido.
+
+        El registro y la deduplicación son los del idioma de la sesión; los
+        demás idiomas se renderizan desde el mismo reporte estructurado. Una
+        plantilla propia se usa en todos los idiomas; si no, cada uno usa la suya.
+        """
+        compilados = [obtener_idioma(codigo) for codigo in dict.fromkeys(idiomas or (self.codigo_idioma,))]
+        plantilla = None if es_plantilla_de_idioma(self.plantilla.texto) else self.plantilla
+        emitidos = []
+        for reporte, texto, registro in self.emitir_lote(filas, operadores):
+            textos = {}
+            for idioma in compilados:
+                if idioma.codigo == reporte.idioma:
+                    textos[idioma.codigo] = texto
+                else:
+                    textos[idioma.codigo] = a_whatsapp(ReportGenerator.traducir(reporte, idioma, plantilla))
+            emitidos.append((reporte, textos, registro))
+        return emitidos
+
+    def registrar_reporte(self, reporte: Reporte, guardar: bool = True) -> RegistroHistorial:
+        """Registra en el historial un reporte emitido."""
+        registro = RegistroHistorial.desde_reporte(reporte)
+        if guardar:
+            self.historial.registrar(registro)
+        return registro
@@ -0,0 +1,173 @@
+"""
+Índice de autocompletado de novedades por municipio.
+
+Cada municipio tiene un trie sobre el texto normalizado (minúsculas, sin
+tildes) de las novedades ya reportadas. Cada nodo guarda las claves mejor
+clasificadas de su subárbol por frecuencia y, a igualdad, por uso más
+reciente. Como la clasificación de una clave solo sube, registrar una
+novedad actualiza esas listas a lo largo de un único camino y sugerir solo
+recorre el prefijo escrito, sin importar cuántos años de historial haya.
+
+El trie se corta a una profundidad fija; el nodo del corte guarda además
+todas las claves más largas que pasan por él, para resolver prefijos que lo
+superan aunque sus coincidencias no estén entre las mejores del nodo.
+"""
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config import NOVEDADES
+from historial import HistorialReportes, RegistroHistorial
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sin tildes y con espacios simples."""
+    descompuesto = unicodedata.normalize("NFD", texto.casefold())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.split())
+
+class _Nodo:
+    __slots__ = ("hijos", "mejores", "resto")
+
+    def __init__(self):
+        self.hijos: Dict[str, "_Nodo"] = {}
+        self.mejores: List[str] = []  # Claves ordenadas de mejor a peor
+        self.resto: Optional[Set[str]] = None  # Solo en el corte: claves más largas que él
+
+class IndiceNovedades:
+    """Trie por municipio con las novedades más usadas en cada prefijo."""
+
+    def __init__(self, capacidad: Optional[int] = None, profundidad: Optional[int] = None):
+        self.capacidad = capacidad or NOVEDADES["capacidad"]
+        # Por debajo de esta profundidad se filtran las claves del último nodo
+        self.profundidad = profundidad or NOVEDADES["profundidad"]
+        self._raices: Dict[str, _Nodo] = {}
+        # (municipio, clave) -> [frecuencia, orden del último uso, texto original]
+        self._entradas: Dict[Tuple[str, str], list] = {}
+        self._orden = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def registrar(self, municipio: str, texto: str) -> None:
+        """Suma un uso de la novedad en el municipio."""
+        clave = normalizar(texto)
+        if not clave:
+            return
+        with self._lock:
+            self._orden += 1
+            entrada = self._entradas.get((municipio, clave))
+            if entrada is None:
+                entrada = self._entradas[(municipio, clave)] = [0, 0, ""]
+            entrada[0] += 1
+            entrada[1] = self._orden
+            entrada[2] = " ".join(texto.split())  # Se sugiere la última forma escrita
+            self._insertar(municipio, clave, entrada)
+
+    def _insertar(self, municipio: str, clave: str, entrada: list) -> None:
+        """Recorre el camino de la clave actualizando las mejores de cada nodo."""
+        nodo = self._raices.get(municipio)
+        if nodo is None:
+            nodo = self._raices[municipio] = _Nodo()
+        self._ascender(nodo, municipio, clave, entrada)
+        for caracter in clave[:self.profundidad]:
+            hijo = nodo.hijos.get(caracter)
+            if hijo is None:
+                hijo = nodo.hijos[caracter] = _Nodo()
+            nodo = hijo
+            self._ascender(nodo, municipio, clave, entrada)
+        if len(clave) > self.profundidad:
+            if nodo.resto is None:
+                nodo.resto = set()
+            nodo.resto.add(clave)
+
+    def _ascender(self, nodo: _Nodo, municipio: str, clave: str, entrada: list) -> None:
+        """Ubica la clave en las mejores del nodo tras subir su clasificación."""
+        lista = nodo.mejores
+        rango = (entrada[0], entrada[1])
+        if clave in lista:
+            lista.remove(clave)
+        elif len(lista) >= self.capacidad:
+            ultima = self._entradas[(municipio, lista[-1])]
+            if rango <= (ultima[0], ultima[1]):
+                return
+            lista.pop()
+        # Inserción ordenada en una lista de pocas claves
+        posicion = len(lista)
+        while posicion > 0:
+            anterior = self._entradas[(municipio, lista[posicion - 1])]
+            if (anterior[0], anterior[1]) >= rango:
+                break
+            posicion -= 1
+        lista.insert(posicion, clave)
+
+    def sugerir(self, municipio: str, prefijo: str, limite: Optional[int] = None) -> List[str]:
+        """Novedades del municipio que empiezan con el prefijo, de la más usada a la menos."""
+        limite = limite or NOVEDADES["sugerencias"]
+        clave = normalizar(prefijo)
+        with self._lock:
+            nodo = self._raices.get(municipio)
+            for caracter in clave[:self.profundidad]:
+                if nodo is None:
+                    break
+                nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return []
+            claves = nodo.mejores
+            if len(clave) > self.profundidad:
+                claves = [c for c in claves if c.startswith(clave)]
+                if len(claves) < limite:
+                    # Las mejores del corte no alcanzan: se ordenan todas las que coinciden
+                    claves = sorted(
+                        (c for c in nodo.resto or () if c.startswith(clave)),
+                        key=lambda c: self._entradas[(municipio, c)][:2], reverse=True
+                    )
+            return [self._entradas[(municipio, c)][2] for c in claves[:limite]]
+
+    def cargar(self, registros: Iterable[RegistroHistorial]) -> int:
+        """Suma las novedades de un recorrido del historial; devuelve cuántas había.
+
+        Primero cuenta y después inserta cada novedad distinta una sola vez. El
+        historial se considera anterior a lo registrado mientras se cargaba.
+        """
+        conteos: Dict[Tuple[str, str], list] = {}
+        claves: Dict[str, str] = {}  # Texto -> clave, para normalizar cada texto una vez
+        cantidad = 0
+        for registro in registros:
+            if not registro.novedad:
+                continue
+            clave = claves.get(registro.novedad)
+            if clave is None:
+                clave = claves[registro.novedad] = normalizar(registro.novedad)
+            cantidad += 1
+            conteo = conteos.get((registro.municipio, clave))
+            if conteo is None:
+                conteo = conteos[(registro.municipio, clave)] = [0, 0, ""]
+            conteo[0] += 1
+            conteo[1] = cantidad
+            conteo[2] = registro.novedad
+
+        for (municipio, clave), (frecuencia, orden, texto) in conteos.items():
+            with self._lock:  # Por clave, para no frenar las sugerencias mientras carga
+                entrada = self._entradas.get((municipio, clave))
+                if entrada is None:
+                    entrada = self._entradas[(municipio, clave)] = [0, orden - cantidad - 1, " ".join(texto.split())]
+                entrada[0] += frecuencia
+                self._insertar(municipio, clave, entrada)
+        return cantidad
+
+_indice: Optional[IndiceNovedades] = None
+_creacion = threading.Lock()
+
+def obtener_indice_novedades(historial: Optional[HistorialReportes] = None) -> IndiceNovedades:
+    """Índice del proceso; la primera vez se llena con el historial en un hilo aparte."""
+    global _indice
+    if _indice is None:
+        with _creacion:
+            if _indice is None:
+                indice = IndiceNovedades()
+                historial = historial or HistorialReportes()
+                threading.Thread(
+                    target=lambda: indice.cargar(historial.iterar()), name="indice-novedades", daemon=True
+                ).start()
+                _indice = indice
+    return _indice
@@ -0,0 +1,127 @@
+"""
+Plantillas de reporte definidas por el usuario.
+
+Una plantilla es texto con marcas de negrita al estilo WhatsApp (*texto*) y
+campos entre llaves ({municipio}, {hora}, ...). Se compila una sola vez en una
+secuencia de segmentos listos para `str.format_map` y se guarda en una caché
+LRU acotada por el hash de su contenido (en el modo web cada usuario puede
+editar la suya).
+"""
+import hashlib
+import string
+import threading
+from collections import OrderedDict
+from typing import Mapping, Optional, Tuple
+from config import PLANTILLA_REPORTE, PLANTILLAS_EN_CACHE
+
+CAMPOS_PLANTILLA = (
+    "municipio", "municipio_mayus", "departamento", "emoji", "fecha",
+    "hora", "descripcion", "novedad", "reporta"
+)
+
+class PlantillaError(ValueError):
+    """Error de validación de una plantilla de reporte."""
+
+class PlantillaCompilada:
+    """Plantilla lista para renderizar segmentos (texto, negrita)."""
+
+    def __init__(self, texto: str, segmentos: Tuple[Tuple[str, bool, bool], ...]):
+        self.texto = texto
+        # (texto o formato, negrita, tiene_campos)
+        self._segmentos = segmentos
+
+    def renderizar(self, valores: Mapping[str, str]) -> Tuple[Tuple[str, bool], ...]:
+        """Produce los segmentos del reporte con los valores indicados."""
+        return tuple(
+            (formato.format_map(valores) if tiene_campos else formato, negrita)
+            for formato, negrita, tiene_campos in self._segmentos
+        )
+
+_formatter = string.Formatter()
+_cache: "OrderedDict[str, PlantillaCompilada]" = OrderedDict()
+_lock = threading.Lock()
+_predeterminada: Optional[PlantillaCompilada] = None
+
+def _validar_fragmento(fragmento: str) -> bool:
+    """Valida los campos de un fragmento y devuelve si contiene alguno."""
+    tiene_campos = False
+    try:
+        partes = list(_formatter.parse(fragmento))
+    except ValueError as e:
+        raise PlantillaError(f"Llaves mal formadas: {e}") from None
+
+    for _, campo, especificacion, conversion in partes:
+        if campo is None:
+            continue
+        if campo not in CAMPOS_PLANTILLA:
+            raise PlantillaError(f"Campo desconocido: {{{campo}}}")
+        if especificacion or conversion:
+            raise PlantillaError(f"El campo {{{campo}}} no admite formato")
+        tiene_campos = True
+    return tiene_campos
+
+def _compilar(texto: str) -> PlantillaCompilada:
+    partes = texto.split("*")
+    if len(partes) % 2 == 0:
+        raise PlantillaError("Hay un asterisco de negrita sin cerrar")
+
+    segmentos = []
+    for i, fragmento in enumerate(partes):
+        if not fragmento:
+            continue
+        tiene_campos = _validar_fragmento(fragmento)
+        if not tiene_campos:
+            # Sin campos: se guarda el texto literal ya resuelto ({{ -> {)
+            fragmento = fragmento.format_map({})
+        segmentos.append((fragmento, i % 2 == 1, tiene_campos))
+
+    return PlantillaCompilada(texto, tuple(segmentos))
+
+def hash_plantilla(texto: str) -> str:
+    """Hash del contenido de una plantilla."""
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def compilar_plantilla(texto: Optional[str] = None) -> PlantillaCompilada:
+    """Compila una plantilla (o la predeterminada), reutilizando la caché."""
+    global _predeterminada
+    if texto is None:
+        if _predeterminada is None:
+            _predeterminada = compilar_plantilla(PLANTILLA_REPORTE)
+        return _predeterminada
+
+    clave = hash_plantilla(texto)
+    with _lock:
+        plantilla = _cache.get(clave)
+        if plantilla is not None:
+            _cache.move_to_end(clave)
+            return plantilla
+    plantilla = _compilar(texto)
+    with _lock:
+        _cache[clave] = plantilla
+        if len(_cache) > PLANTILLAS_EN_CACHE:
+            _cache.popitem(last=False)
+    return plantilla
+
+def validar_plantilla(texto: str) -> Optional[str]:
+    """Devuelve un mensaje de error o None si la plantilla es válida."""
+    try:
+        compilar_plantilla(texto)
+    except PlantillaError as e:
+        return str(e)
+    return None
+
+def cargar_plantilla(page=None) -> str:
+    """Carga la plantilla guardada en el almacenamiento del cliente."""
+    if page and page.client_storage:
+        texto = page.client_storage.get("report_template")
+        if texto and validar_plantilla(texto) is None:
+            return texto
+    return PLANTILLA_REPORTE
+
+def guardar_plantilla(page, texto: str) -> None:
+    """Guarda la plantilla en el almacenamiento del cliente."""
+    if page and page.client_storage:
+        if texto == PLANTILLA_REPORTE:
+            page.client_storage.remove("report_template")
+        else:
+            page.client_storage.set("report_template", texto)
@@ -0,0 +1,297 @@
+"""
+Ingesta de pluviómetros y sugerencia del estado del tiempo.
+
+Las estaciones escriben sus lecturas en archivos CSV del directorio de
+pluviómetros, una por línea:
+    momento,sensor,municipio,mm
+con el momento en ISO (hora local) o segundos desde época y los milímetros
+caídos desde la lectura anterior. Un hilo sigue los archivos como un flujo,
+acumula las lecturas en cubetas de pocos segundos por sensor y calcula con
+NumPy la tasa de precipitación (mm/h) de cada municipio en la ventana actual
+y en la anterior. El par de intensidades se traduce al estado del tiempo
+correspondiente por su clave del catálogo, incluidas las transiciones de
+aumento y disminución. Cuando un municipio deja de tener sugerencia se
+publica con índice -1 para que las sesiones la retiren.
+
+NumPy es opcional: sin él no hay sugerencias.
+"""
+import datetime
+import glob
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from catalogos import Catalogos, obtener_catalogos
+from config import PLUVIOMETROS
+
+try:
+    import numpy as np
+except ImportError:  # Dependencia opcional
+    np = None
+
+# Clave del estado del tiempo según la intensidad en la ventana anterior (fila)
+# y en la actual (columna): 0 sin lluvia, 1 leve, 2 moderada, 3 fuerte; None
+# sin sugerencia. Las claves deben estar en CATALOGOS["claves_requeridas"]
+TRANSICIONES = (
+    (None, "lluvia_leve", "lluvia_moderada", "lluvia_fuerte"),  # Sin lluvia: inicia el evento
+    ("cese_lluvia", "lluvia_leve", "aumento_leve_moderada", "aumento_moderada_fuerte"),  # Leve: sigue o aumenta
+    ("cese_lluvia", "disminucion_moderada_leve", "lluvia_moderada", "aumento_moderada_fuerte"),  # Moderada
+    ("cese_lluvia", "disminucion_moderada_leve", "disminucion_fuerte_moderada", "lluvia_fuerte"),  # Fuerte
+)
+SIN_SUGERENCIA = -1
+
+@dataclass(frozen=True)
+class Sugerencia:
+    """Estado del tiempo sugerido para un municipio."""
+    municipio: str
+    indice: int  # SIN_SUGERENCIA cuando se retira
+    tasa: float  # mm/h en la ventana actual
+
+class LectorCola:
+    """Sigue un archivo que crece, devolviendo solo las líneas completas nuevas."""
+
+    def __init__(self, ruta: str, desde_el_final: bool = True):
+        self.ruta = ruta
+        self._inodo = None
+        self._posicion = 0
+        self._resto = b""
+        self._desde_el_final = desde_el_final
+
+    def leer(self) -> List[str]:
+        try:
+            info = os.stat(self.ruta)
+        except OSError:
+            return []
+        if info.st_ino != self._inodo or info.st_size < self._posicion:
+            # Archivo nuevo, rotado o truncado
+            nuevo = self._inodo is None
+            self._inodo = info.st_ino
+            self._posicion = info.st_size if nuevo and self._desde_el_final else 0
+            self._resto = b""
+        if info.st_size == self._posicion:
+            return []
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(self._posicion)
+            datos = archivo.read()
+        self._posicion += len(datos)
+        *lineas, self._resto = (self._resto + datos).split(b"\n")
+        return [linea.decode("utf-8", "replace") for linea in lineas if linea.strip()]
+
+class VentanasLluvia:
+    """Lluvia por sensor en cubetas circulares de `paso` segundos."""
+
+    def __init__(self, ventana: float, paso: float):
+        self.paso = paso
+        self.por_ventana = max(1, int(ventana // paso))
+        self.columnas = 2 * self.por_ventana  # Ventana actual y anterior
+        self.cubetas = np.zeros((16, self.columnas))
+        self.ultima_lectura = np.full(16, -np.inf)
+        self.municipio_de = np.zeros(16, dtype=np.int64)
+        self.municipios: List[str] = []
+        self._codigos: Dict[str, int] = {}
+        self._filas: Dict[Tuple[str, str], int] = {}
+        self._cubeta = None  # Última cubeta absoluta (momento // paso)
+
+    def _fila(self, municipio: str, sensor: str) -> int:
+        fila = self._filas.get((municipio, sensor))
+        if fila is None:
+            codigo = self._codigos.get(municipio)
+            if codigo is None:
+                codigo = self._codigos[municipio] = len(self.municipios)
+                self.municipios.append(municipio)
+            fila = self._filas[(municipio, sensor)] = len(self._filas)
+            if fila == len(self.municipio_de):
+                self.cubetas = np.vstack([self.cubetas, np.zeros_like(self.cubetas)])
+                self.ultima_lectura = np.concatenate([self.ultima_lectura, np.full(fila, -np.inf)])
+                self.municipio_de = np.concatenate([self.municipio_de, np.zeros(fila, dtype=np.int64)])
+            self.municipio_de[fila] = codigo
+        return fila
+
+    def _avanzar(self, cubeta: int) -> None:
+        """Vacía las columnas que pasan a representar cubetas nuevas."""
+        if self._cubeta is None or cubeta - self._cubeta >= self.columnas:
+            self.cubetas[:] = 0
+        elif cubeta > self._cubeta:
+            self.cubetas[:, np.arange(self._cubeta + 1, cubeta + 1) % self.columnas] = 0
+        else:
+            return
+        self._cubeta = cubeta
+
+    def agregar(self, lecturas: List[Tuple[float, str, str, float]]) -> None:
+        """Agrega lecturas (momento, sensor, municipio, mm)."""
+        if not lecturas:
+            return
+        filas = np.fromiter((self._fila(m, s) for _, s, m, _ in lecturas), dtype=np.int64, count=len(lecturas))
+        momentos = np.fromiter((l[0] for l in lecturas), dtype=np.float64, count=len(lecturas))
+        mm = np.fromiter((l[3] for l in lecturas), dtype=np.float64, count=len(lecturas))
+        absolutas = (momentos // self.paso).astype(np.int64)
+        self._avanzar(int(absolutas.max()))
+        vigentes = absolutas > self._cubeta - self.columnas
+        filas, absolutas, mm, momentos = filas[vigentes], absolutas[vigentes], mm[vigentes], momentos[vigentes]
+        np.add.at(self.cubetas, (filas, absolutas % self.columnas), mm)
+        np.maximum.at(self.ultima_lectura, filas, momentos)
+
+    def tasas(self, ahora: float) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Tasas (mm/h) por municipio en la ventana actual y en la anterior."""
+        self._avanzar(int(ahora // self.paso))
+        sensores = len(self._filas)
+        n = len(self.municipios)
+        posiciones = np.arange(self._cubeta - self.columnas + 1, self._cubeta + 1) % self.columnas
+        cubetas = self.cubetas[:sensores, posiciones]
+        anterior = cubetas[:, :self.por_ventana].sum(axis=1)
+        actual = cubetas[:, self.por_ventana:].sum(axis=1)
+
+        # Promedio de los sensores que reportaron dentro de las dos ventanas
+        activos = self.ultima_lectura[:sensores] > ahora - self.columnas * self.paso
+        municipios = self.municipio_de[:sensores]
+        cantidad = np.bincount(municipios, weights=activos, minlength=n)
+        escala = 3600 / (self.por_ventana * self.paso) / np.maximum(cantidad, 1)
+        return (
+            np.bincount(municipios, weights=actual * activos, minlength=n) * escala,
+            np.bincount(municipios, weights=anterior * activos, minlength=n) * escala
+        )
+
+_tablas: Dict[int, Tuple[Catalogos, "np.ndarray"]] = {}
+
+def tabla_transiciones(catalogos: Optional[Catalogos] = None) -> "np.ndarray":
+    """TRANSICIONES resueltas a los índices del catálogo (memorizada por versión)."""
+    catalogos = catalogos or obtener_catalogos()
+    memorizada = _tablas.get(id(catalogos))
+    if memorizada is None or memorizada[0] is not catalogos:
+        tabla = np.array([
+            [SIN_SUGERENCIA if clave is None else catalogos.indice_de(clave) for clave in fila]
+            for fila in TRANSICIONES
+        ])
+        _tablas.clear()  # Solo interesa la versión vigente
+        memorizada = _tablas[id(catalogos)] = (catalogos, tabla)
+    return memorizada[1]
+
+def clasificar(actual: "np.ndarray", anterior: "np.ndarray", umbrales=None) -> "np.ndarray":
+    """Índices de TIEMPO sugeridos (-1 si no hay) para cada par de tasas."""
+    umbrales = np.asarray(umbrales or PLUVIOMETROS["umbrales"])
+    tabla = tabla_transiciones()
+    return tabla[np.searchsorted(umbrales, anterior, side="right"), np.searchsorted(umbrales, actual, side="right")]
+
+def interpretar(linea: str) -> Optional[Tuple[float, str, str, float]]:
+    """Convierte una línea CSV en (momento, sensor, municipio, mm), o None si no es válida."""
+    partes = linea.split(",")
+    if len(partes) != 4:
+        return None
+    momento, sensor, municipio, mm = (p.strip() for p in partes)
+    try:
+        try:
+            segundos = float(momento)
+        except ValueError:
+            segundos = datetime.datetime.fromisoformat(momento).timestamp()
+        return segundos, sensor, municipio, float(mm)
+    except ValueError:
+        return None  # Encabezado o línea corrupta
+
+class IngestaPluviometros:
+    """Sigue los CSV de los pluviómetros y publica las sugerencias que cambian."""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        self.ventanas = VentanasLluvia(PLUVIOMETROS["ventana"], PLUVIOMETROS["paso"])
+        self.lineas_invalidas = 0
+        self._recorridos = 0
+        self._lectores: Dict[str, LectorCola] = {}
+        self._sugerencias: Dict[str, Sugerencia] = {}
+        self._suscriptores: Tuple[Callable[[Dict[str, Sugerencia]], None], ...] = ()
+        self._lock = threading.Lock()
+        self._detenido = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def sugerencia(self, municipio: str) -> Optional[Sugerencia]:
+        """Última sugerencia vigente para el municipio."""
+        return self._sugerencias.get(municipio)
+
+    def suscribir(self, callback: Callable[[Dict[str, Sugerencia]], None]) -> Callable[[], None]:
+        """Registra un callback con las sugerencias que cambian y devuelve la función para anularlo."""
+        with self._lock:
+            self._suscriptores = self._suscriptores + (callback,)
+
+        def desuscribir():
+            with self._lock:
+                self._suscriptores = tuple(s for s in self._suscriptores if s is not callback)
+        return desuscribir
+
+    def leer_lecturas(self) -> List[Tuple[float, str, str, float]]:
+        """Lee las líneas nuevas de todos los archivos del directorio."""
+        for ruta in glob.glob(os.path.join(self.directorio, "*.csv")):
+            if ruta not in self._lectores:
+                # Los archivos que ya estaban al arrancar se siguen desde el final
+                self._lectores[ruta] = LectorCola(ruta, desde_el_final=self._recorridos == 0)
+        self._recorridos += 1
+        lecturas = []
+        for lector in self._lectores.values():
+            for linea in lector.leer():
+                lectura = interpretar(linea)
+                if lectura is None:
+                    self.lineas_invalidas += 1
+                else:
+                    lecturas.append(lectura)
+        return lecturas
+
+    def procesar(self, lecturas: List[Tuple[float, str, str, float]], ahora: Optional[float] = None) -> Dict[str, Sugerencia]:
+        """Agrega lecturas, recalcula las tasas y devuelve las sugerencias que cambiaron."""
+        self.ventanas.agregar(lecturas)
+        if not self.ventanas.municipios:
+            return {}
+        actual, anterior = self.ventanas.tasas(time.time() if ahora is None else ahora)
+        indices = clasificar(actual, anterior)
+        cambios = {}
+        for codigo in np.flatnonzero(indices >= 0).tolist():
+            municipio = self.ventanas.municipios[codigo]
+            previa = self._sugerencias.get(municipio)
+            if previa is None or previa.indice != indices[codigo]:
+                cambios[municipio] = Sugerencia(municipio, int(indices[codigo]), float(actual[codigo]))
+        for codigo in np.flatnonzero(indices < 0).tolist():
+            municipio = self.ventanas.municipios[codigo]
+            if self._sugerencias.pop(municipio, None) is not None:
+                # Se publica el retiro: la ayuda y la preselección dejan de valer
+                cambios[municipio] = Sugerencia(municipio, SIN_SUGERENCIA, float(actual[codigo]))
+        self._sugerencias.update((m, s) for m, s in cambios.items() if s.indice != SIN_SUGERENCIA)
+        return cambios
+
+    def iniciar(self) -> None:
+        self._hilo = threading.Thread(target=self._ejecutar, name="pluviometros", daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detenido.set()
+
+    def _ejecutar(self) -> None:
+        while not self._detenido.wait(PLUVIOMETROS["intervalo"]):
+            try:
+                cambios = self.procesar(self.leer_lecturas())
+            except OSError as e:
+                print(f"Error leyendo pluviómetros: {e}")
+                continue
+            except Exception as e:
+                # Un CSV malformado no debe detener el hilo
+                print(f"Error procesando pluviómetros: {e}")
+                continue
+            if cambios:
+                for callback in self._suscriptores:
+                    try:
+                        callback(cambios)
+                    except Exception as e:
+                        print(f"Error notificando sugerencias de pluviómetros: {e}")
+
+_ingesta: Optional[IngestaPluviometros] = None
+_inicializada = False
+_creacion = threading.Lock()
+
+def obtener_ingesta() -> Optional[IngestaPluviometros]:
+    """Devuelve la ingesta del proceso, o None si no hay NumPy o directorio de pluviómetros."""
+    global _ingesta, _inicializada
+    if not _inicializada:
+        with _creacion:
+            if not _inicializada:
+                if np is not None and os.path.isdir(PLUVIOMETROS["directorio"]):
+                    _ingesta = IngestaPluviometros(PLUVIOMETROS["directorio"])
+                    _ingesta.iniciar()
+                _inicializada = True
+    return _ingesta
@@ -0,0 +1,72 @@
+"""
+Instantánea de la pantalla principal para pintar el primer cuadro.
+
+Después de cada cambio visible se guarda en client_storage un resumen pequeño
+de lo que se ve (tema, reporte y selecciones). En el siguiente arranque se
+pinta con una sola lectura, en el idioma de la sesión, antes de cargar operadores, configuración,
+catálogos e historial; luego se hidrata el estado y solo se envía lo que
+cambió.
+"""
+import json
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from config import IDIOMAS
+
+CLAVE = "ui_snapshot"
+VERSION = 1
+
+@dataclass(frozen=True)
+class InstantaneaUI:
+    """Lo necesario para dibujar la pantalla principal sin el estado completo."""
+    tema_oscuro: bool
+    segmentos: Tuple[Tuple[str, bool], ...]
+    tiempo: Tuple[str, str]  # (clave, texto) de la opción elegida
+    operador: Optional[str]
+    idioma: str = IDIOMAS["predeterminado"]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": VERSION,
+            "oscuro": self.tema_oscuro,
+            "segmentos": [list(s) for s in self.segmentos],
+            "tiempo": list(self.tiempo),
+            "operador": self.operador,
+            "idioma": self.idioma
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'InstantaneaUI':
+        if data.get("version") != VERSION:
+            raise ValueError("Versión de instantánea desconocida")
+        clave, texto = data["tiempo"]
+        return cls(
+            bool(data["oscuro"]),
+            tuple((str(t), bool(n)) for t, n in data["segmentos"]),
+            (str(clave), str(texto)),
+            data.get("operador"),
+            str(data.get("idioma") or IDIOMAS["predeterminado"])
+        )
+
+def capturar(app_state) -> InstantaneaUI:
+    """Instantánea de lo que muestra la pantalla principal con el estado actual."""
+    operador = app_state.obtener_operador_actual()
+    idioma = app_state.idioma
+    return InstantaneaUI(
+        app_state.is_dark_theme,
+        app_state.construir_reporte_actual().segmentos,
+        idioma.opciones_tiempo[app_state.indice_tiempo],
+        operador.nombre if operador else None,
+        idioma.codigo
+    )
+
+def serializar(instantanea: InstantaneaUI) -> str:
+    return json.dumps(instantanea.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+def leer_instantanea(storage) -> Optional[InstantaneaUI]:
+    """Lee la instantánea guardada; None si no hay o no es válida."""
+    try:
+        datos = storage.get(CLAVE)
+        return InstantaneaUI.from_dict(json.loads(datos)) if datos else None
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+        print(f"Instantánea de la interfaz ignorada: {e}")
+        return None
@@ -0,0 +1,188 @@
+"""
+Recordatorios de reportes pendientes.
+
+El programador calcula la cadencia de cada municipio a partir del historial y
+duerme exactamente hasta el próximo vencimiento (o hasta que se registra un
+reporte nuevo), sin sondeos periódicos. El reloj es intercambiable para poder
+probarlo con un reloj virtual.
+"""
+import asyncio
+import heapq
+import itertools
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from config import RECORDATORIOS
+from historial import RegistroHistorial
+
+class Reloj:
+    """Reloj real basado en time.time y asyncio.sleep."""
+
+    def ahora(self) -> float:
+        return time.time()
+
+    async def dormir(self, segundos: float) -> None:
+        await asyncio.sleep(max(0.0, segundos))
+
+class RelojVirtual(Reloj):
+    """Reloj controlado manualmente para pruebas."""
+
+    def __init__(self, inicio: float = 0.0):
+        self._ahora = inicio
+        self._esperas: List[Tuple[float, int, asyncio.Future]] = []
+        self._secuencia = itertools.count()
+
+    def ahora(self) -> float:
+        return self._ahora
+
+    async def dormir(self, segundos: float) -> None:
+        futuro = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._esperas, (self._ahora + max(0.0, segundos), next(self._secuencia), futuro))
+        await futuro
+
+    async def avanzar(self, segundos: float) -> None:
+        """Avanza el tiempo despertando en orden a quienes duermen."""
+        destino = self._ahora + segundos
+        await self._asentar()
+        while self._esperas and self._esperas[0][0] <= destino:
+            momento, _, futuro = heapq.heappop(self._esperas)
+            if futuro.done():
+                continue
+            self._ahora = max(self._ahora, momento)
+            futuro.set_result(None)
+            await self._asentar()
+        self._ahora = destino
+
+    @staticmethod
+    async def _asentar() -> None:
+        """Deja que las tareas despertadas vuelvan a dormir antes de seguir."""
+        for _ in range(10):
+            await asyncio.sleep(0)
+
+@dataclass
+class CadenciaMunicipio:
+    """Cadencia de reportes de un municipio."""
+    ultimo: float
+    intervalo: float
+    proximo_aviso: float
+
+class ProgramadorRecordatorios:
+    """Avisa cuando un municipio no ha emitido su reporte a tiempo."""
+
+    def __init__(
+        self,
+        on_vencido: Callable[[str, float], None],
+        on_minuto: Optional[Callable[[], None]] = None,
+        reloj: Optional[Reloj] = None
+    ):
+        self.on_vencido = on_vencido
+        self.on_minuto = on_minuto
+        self.reloj = reloj or Reloj()
+        self._cadencias: Dict[str, CadenciaMunicipio] = {}
+        self._muestras: Dict[str, List[float]] = {}
+        self._cambio: Optional[asyncio.Event] = None
+        self._tareas: List[asyncio.Task] = []
+
+    def cargar_historial(self, registros: Iterable[RegistroHistorial]) -> None:
+        """Calcula las cadencias a partir de registros en orden cronológico."""
+        for registro in registros:
+            self._anotar(registro.municipio, registro.momento)
+        self._notificar_cambio()
+
+    def registrar_reporte(self, municipio: str, momento: float) -> None:
+        """Anota un reporte emitido y reprograma el próximo aviso."""
+        self._anotar(municipio, momento)
+        self._notificar_cambio()
+
+    def registrar_reportes(self, registros: Iterable[RegistroHistorial]) -> None:
+        """Anota un lote de reportes emitidos con una sola reprogramación."""
+        self.cargar_historial(registros)
+
+    def vigilar(self, municipio: str) -> None:
+        """Empieza a vigilar un municipio aunque no tenga historial."""
+        if municipio not in self._cadencias:
+            self._anotar(municipio, self.reloj.ahora())
+            self._notificar_cambio()
+
+    def proximo_vencimiento(self) -> Optional[Tuple[float, str]]:
+        """Devuelve (momento, municipio) del próximo aviso."""
+        if not self._cadencias:
+            return None
+        return min((c.proximo_aviso, m) for m, c in self._cadencias.items())
+
+    def _anotar(self, municipio: str, momento: float) -> None:
+        cadencia = self._cadencias.get(municipio)
+        muestras = self._muestras.setdefault(municipio, [])
+        if cadencia:
+            if momento <= cadencia.ultimo:
+                return
+            intervalo = momento - cadencia.ultimo
+            # Los huecos largos (noches, cortes) no describen la cadencia habitual
+            if intervalo <= RECORDATORIOS["cadencia_maxima"]:
+                muestras.append(intervalo)
+                del muestras[:-RECORDATORIOS["muestras"]]
+
+        intervalo = statistics.median(muestras) if muestras else RECORDATORIOS["cadencia_por_defecto"]
+        intervalo = min(max(intervalo, RECORDATORIOS["cadencia_minima"]), RECORDATORIOS["cadencia_maxima"])
+        self._cadencias[municipio] = CadenciaMunicipio(
+            ultimo=momento,
+            intervalo=intervalo,
+            proximo_aviso=momento + intervalo + RECORDATORIOS["tolerancia"]
+        )
+
+    def _notificar_cambio(self) -> None:
+        if self._cambio is not None:
+            self._cambio.set()
+
+    async def ejecutar(self) -> None:
+        """Ejecuta los recordatorios y el reloj de minutos hasta que se detenga."""
+        self._cambio = asyncio.Event()
+        self._tareas = [asyncio.create_task(self._bucle_avisos())]
+        if self.on_minuto:
+            self._tareas.append(asyncio.create_task(self._bucle_minutos()))
+        try:
+            await asyncio.gather(*self._tareas)
+        except asyncio.CancelledError:
+            pass
+
+    def detener(self) -> None:
+        """Cancela las tareas en curso."""
+        for tarea in self._tareas:
+            tarea.cancel()
+
+    async def _bucle_avisos(self) -> None:
+        while True:
+            self._cambio.clear()
+            proximo = self.proximo_vencimiento()
+            if proximo is None:
+                await self._cambio.wait()
+                continue
+
+            momento, municipio = proximo
+            espera = momento - self.reloj.ahora()
+            if espera > 0:
+                if await self._dormir_o_cambio(espera):
+                    continue
+
+            cadencia = self._cadencias[municipio]
+            # Tras un reinicio o un corte largo los avisos atrasados salen una sola vez
+            ahora = self.reloj.ahora()
+            while cadencia.proximo_aviso <= ahora:
+                cadencia.proximo_aviso += cadencia.intervalo
+            self.on_vencido(municipio, cadencia.ultimo)
+
+    async def _dormir_o_cambio(self, segundos: float) -> bool:
+        """Duerme hasta el plazo; devuelve True si antes hubo un cambio."""
+        dormir = asyncio.ensure_future(self.reloj.dormir(segundos))
+        cambio = asyncio.ensure_future(self._cambio.wait())
+        hechas, pendientes = await asyncio.wait({dormir, cambio}, return_when=asyncio.FIRST_COMPLETED)
+        for tarea in pendientes:
+            tarea.cancel()
+        return cambio in hechas
+
+    async def _bucle_minutos(self) -> None:
+        while True:
+            ahora = self.reloj.ahora()
+            await self.reloj.dormir(60 - ahora % 60)
+            self.on_minuto()
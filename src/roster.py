@@ -0,0 +1,111 @@
+"""
+Roster de operadores compartido por todas las sesiones del proceso.
+
+Cada versión del roster es una instantánea inmutable: los lectores solo leen
+la referencia actual y nunca toman bloqueos. Los escritores construyen una
+instantánea nueva a partir de la que leyeron y la publican con control de
+concurrencia optimista por versión, reintentando si otro escritor se adelantó.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from models import Operador
+
+@dataclass(frozen=True)
+class InstantaneaRoster:
+    """Versión inmutable del roster con índices por nombre y cédula."""
+    version: int
+    operadores: Tuple["Operador", ...]
+    por_nombre: Dict[str, int] = field(init=False, repr=False, compare=False)
+    por_cedula: Dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "por_nombre", {op.nombre: i for i, op in enumerate(self.operadores)})
+        object.__setattr__(self, "por_cedula", {op.cedula: i for i, op in enumerate(self.operadores)})
+
+@dataclass(frozen=True)
+class CambioRoster:
+    """Diferencia entre dos versiones consecutivas del roster."""
+    version: int
+    agregados: Tuple["Operador", ...]
+    eliminados: Tuple[str, ...]
+
+class ConflictoVersion(Exception):
+    """Otro escritor publicó una versión nueva antes que nosotros."""
+
+# Función que recibe los operadores actuales y devuelve los nuevos (o None si no hay cambio)
+Modificacion = Callable[[Tuple["Operador", ...]], Optional[Tuple["Operador", ...]]]
+
+class ServicioRoster:
+    """Roster compartido con instantáneas copy-on-write."""
+
+    def __init__(self, operadores: Tuple["Operador", ...] = ()):
+        self._instantanea = InstantaneaRoster(0, tuple(operadores))
+        # Solo protege la comparación e intercambio de la versión; los lectores no lo usan
+        self._publicacion = threading.Lock()
+        self._suscriptores: Tuple[Callable[[CambioRoster], None], ...] = ()
+        self.conflictos = 0
+
+    def instantanea(self) -> InstantaneaRoster:
+        """Devuelve la versión actual sin bloquear."""
+        return self._instantanea
+
+    def publicar(self, version_base: int, operadores: Tuple["Operador", ...]) -> CambioRoster:
+        """Publica una versión nueva si nadie escribió desde version_base."""
+        with self._publicacion:
+            anterior = self._instantanea
+            if anterior.version != version_base:
+                raise ConflictoVersion(f"Versión {version_base} obsoleta (actual {anterior.version})")
+            nueva = InstantaneaRoster(version_base + 1, operadores)
+            self._instantanea = nueva
+
+        cambio = CambioRoster(
+            version=nueva.version,
+            agregados=tuple(op for op in nueva.operadores if op.nombre not in anterior.por_nombre),
+            eliminados=tuple(op.nombre for op in anterior.operadores if op.nombre not in nueva.por_nombre)
+        )
+        for suscriptor in self._suscriptores:
+            try:
+                suscriptor(cambio)
+            except Exception as e:
+                print(f"Error notificando cambio del roster: {e}")
+        return cambio
+
+    def modificar(self, modificacion: Modificacion, reintentos: int = 100) -> bool:
+        """Aplica una modificación reintentando ante conflictos de versión."""
+        for _ in range(reintentos):
+            base = self._instantanea
+            operadores = modificacion(base.operadores)
+            if operadores is None:
+                return False
+            try:
+                self.publicar(base.version, operadores)
+                return True
+            except ConflictoVersion:
+                self.conflictos += 1
+                continue
+        raise ConflictoVersion("Demasiados conflictos de escritura en el roster")
+
+    def suscribir(self, callback: Callable[[CambioRoster], None]) -> Callable[[], None]:
+        """Registra un callback de cambios y devuelve la función para anularlo."""
+        with self._publicacion:
+            self._suscriptores = self._suscriptores + (callback,)
+
+        def desuscribir():
+            with self._publicacion:
+                self._suscriptores = tuple(s for s in self._suscriptores if s is not callback)
+        return desuscribir
+
+_servicio: Optional[ServicioRoster] = None
+_creacion = threading.Lock()
+
+def obtener_servicio_roster(cargar_inicial: Callable[[], List["Operador"]]) -> ServicioRoster:
+    """Devuelve el roster del proceso, creándolo con cargar_inicial la primera vez."""
+    global _servicio
+    if _servicio is None:
+        with _creacion:
+            if _servicio is None:
+                _servicio = ServicioRoster(tuple(cargar_inicial()))
+    return _servicio
@@ -0,0 +1,267 @@
+"""
+Servidor HTTP/JSON local sin interfaz gráfica.
+
+Expone el generador de reportes, el roster de operadores y el historial para
+los tableros de las estaciones. Atiende con un hilo por conexión, mantiene las
+conexiones abiertas (HTTP/1.1 keep-alive) y guarda en caché las respuestas
+del minuto en curso, ya que el reporte solo cambia con la hora.
+
+Con --central también actúa como nodo central de sincronización (POST /sync).
+
+Uso:
+    python src/servidor.py [--host 127.0.0.1] [--port 8765] [--operadores operadores.json] [--central]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from config import DATA_DIR, DEFAULT_OPERATORS, DEPARTAMENTO, ESTADO, SERVIDOR, SINCRONIZACION
+from catalogos import obtener_catalogos
+from formatos import FORMATOS, a_dict
+from historial import HistorialReportes
+from models import Operador, OperadorManager, ReportGenerator
+from idiomas import Idioma, codigo_disponible, obtener_idioma
+from roster import ServicioRoster
+from sincronizacion import NodoCentral, comprimir, descomprimir
+from territorio import obtener_catalogo_territorial
+
+TIPOS_CONTENIDO = {
+    "whatsapp": "text/plain; charset=utf-8",
+    "texto": "text/plain; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "json": "application/json; charset=utf-8"
+}
+
+Respuesta = Tuple[int, str, bytes]
+
+class ErrorSolicitud(Exception):
+    """Solicitud inválida (HTTP 400/404)."""
+
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+# Parámetros que atiende cada ruta; la clave de la caché solo usa estos
+PARAMETROS = {
+    "/reporte": ("municipio", "tiempo", "operador", "departamento", "novedad", "formato", "idioma"),
+    "/operadores": (),
+    "/historial": ("municipio", "limite", "desde", "hasta"),
+    "/catalogo": ("idioma", "estado")
+}
+
+class CacheMinuto:
+    """Caché de respuestas válida solo durante el minuto en curso, con un máximo de entradas."""
+
+    def __init__(self, maximo: int = 1024):
+        self.maximo = maximo
+        self._minuto = -1
+        self._respuestas: Dict[Hashable, Respuesta] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable, minuto: int) -> Optional[Respuesta]:
+        if minuto != self._minuto:
+            return None
+        return self._respuestas.get(clave)
+
+    def guardar(self, clave: Hashable, minuto: int, respuesta: Respuesta) -> None:
+        with self._lock:
+            if minuto != self._minuto:
+                self._minuto = minuto
+                self._respuestas = {}
+            elif len(self._respuestas) >= self.maximo and clave not in self._respuestas:
+                del self._respuestas[next(iter(self._respuestas))]  # La más antigua
+            self._respuestas[clave] = respuesta
+
+class ApiReportes:
+    """Lógica de los endpoints, independiente del transporte HTTP."""
+
+    def __init__(self, roster: ServicioRoster, historial: Optional[HistorialReportes] = None, central: Optional[NodoCentral] = None):
+        self.operadores = OperadorManager(servicio=roster)
+        self.historial = historial or HistorialReportes()
+        self.central = central
+        self.cache = CacheMinuto()
+        self.rutas = {
+            "/reporte": self._reporte,
+            "/operadores": self._operadores,
+            "/historial": self._historial,
+            "/catalogo": self._catalogo
+        }
+
+    def atender(self, ruta_completa: str) -> Respuesta:
+        """Devuelve (estado, tipo de contenido, cuerpo) para una ruta GET."""
+        url = urlparse(ruta_completa)
+        manejador = self.rutas.get(url.path)
+        if manejador is None:
+            return self.respuesta_json({"error": f"Ruta desconocida: {url.path}"}, 404)
+        consulta = parse_qs(url.query)
+        parametros = {k: consulta[k][-1] for k in PARAMETROS[url.path] if k in consulta}
+
+        # Clave normalizada: los parámetros desconocidos no crean entradas nuevas
+        minuto = int(time.time() // 60)
+        clave = (url.path, tuple(sorted(parametros.items())))
+        respuesta = self.cache.obtener(clave, minuto)
+        if respuesta is not None:
+            return respuesta
+        try:
+            respuesta = manejador(parametros)
+        except ErrorSolicitud as e:
+            return self.respuesta_json({"error": str(e)}, e.estado)
+
+        self.cache.guardar(clave, minuto, respuesta)
+        return respuesta
+
+    def sincronizar(self, cuerpo: bytes) -> Respuesta:
+        """Atiende un intercambio comprimido de una estación (POST /sync)."""
+        if self.central is None:
+            return self.respuesta_json({"error": "Este servidor no es nodo central"}, 404)
+        try:
+            respuesta = self.central.intercambiar(descomprimir(cuerpo))
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            return self.respuesta_json({"error": f"Intercambio inválido: {e}"}, 400)
+        return 200, "application/json", comprimir(respuesta)
+
+    @staticmethod
+    def respuesta_json(datos, estado: int = 200) -> Respuesta:
+        """Serializa datos como respuesta JSON con el estado indicado."""
+        return estado, TIPOS_CONTENIDO["json"], json.dumps(datos, ensure_ascii=False).encode("utf-8")
+
+    @staticmethod
+    def _entero(parametros: Dict[str, str], nombre: str, defecto: Optional[int] = None) -> Optional[int]:
+        valor = parametros.get(nombre)
+        if valor is None:
+            return defecto
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErrorSolicitud(400, f"'{nombre}' debe ser un número entero") from None
+
+    @staticmethod
+    def _idioma(parametros: Dict[str, str]) -> Idioma:
+        codigo = parametros.get("idioma")
+        if codigo and not codigo_disponible(codigo):
+            raise ErrorSolicitud(400, f"Idioma desconocido: {codigo}")
+        return obtener_idioma(codigo)
+
+    def _reporte(self, parametros: Dict[str, str]) -> Respuesta:
+        municipio = parametros.get("municipio", "Guanta")
+        indice = self._entero(parametros, "tiempo", 0)
+        cantidad = len(obtener_catalogos().tiempo)
+        if not 0 <= indice < cantidad:
+            raise ErrorSolicitud(400, f"'tiempo' debe estar entre 0 y {cantidad - 1}")
+        formato = parametros.get("formato", "json")
+        if formato not in FORMATOS:
+            raise ErrorSolicitud(400, f"Formato desconocido: {formato}")
+        idioma = self._idioma(parametros)
+
+        if "operador" in parametros:
+            operador = self.operadores.buscar_por_nombre(parametros["operador"])
+            if operador is None:
+                raise ErrorSolicitud(404, f"Operador desconocido: {parametros['operador']}")
+        else:
+            operador = self.operadores.operador_en_guardia(municipio)
+
+        reporte = ReportGenerator.construir_reporte(
+            indice, operador, municipio, parametros.get("departamento", DEPARTAMENTO),
+            novedad=parametros.get("novedad"), idioma=idioma
+        )
+        if formato == "json":
+            return self.respuesta_json(a_dict(reporte))
+        return 200, TIPOS_CONTENIDO[formato], FORMATOS[formato](reporte).encode("utf-8")
+
+    def _operadores(self, parametros: Dict[str, str]) -> Respuesta:
+        return self.respuesta_json([op.to_dict() for op in self.operadores.obtener_operadores()])
+
+    def _historial(self, parametros: Dict[str, str]) -> Respuesta:
+        limite = min(self._entero(parametros, "limite", 100), SERVIDOR["limite_historial"])
+        desde = self._entero(parametros, "desde")
+        hasta = self._entero(parametros, "hasta")
+        # Solo los últimos `limite` registros del rango, leídos desde el final
+        registros = self.historial.ultimos(limite, desde, hasta, parametros.get("municipio"))
+        return self.respuesta_json([r.to_dict() for r in registros])
+
+    def _catalogo(self, parametros: Dict[str, str]) -> Respuesta:
+        return self.respuesta_json({
+            "tiempo": list(self._idioma(parametros).descripciones),
+            # Los nombres se repiten entre estados: se listan los de uno solo
+            "municipios": [
+                m.nombre for m in obtener_catalogo_territorial().municipios_de(parametros.get("estado", ESTADO))
+            ]
+        })
+
+class ManejadorApi(BaseHTTPRequestHandler):
+    """Manejador HTTP/1.1 con conexiones persistentes."""
+
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo van en escrituras separadas; sin esto el ACK retardado añade ~40 ms
+    disable_nagle_algorithm = True
+    api: ApiReportes = None
+
+    def do_GET(self):
+        estado, tipo, cuerpo = self.api.atender(self.path)
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/sync":
+            estado, tipo, cuerpo = self.api.respuesta_json({"error": f"Ruta desconocida: {self.path}"}, 404)
+        else:
+            longitud = int(self.headers.get("Content-Length", 0))
+            estado, tipo, cuerpo = self.api.sincronizar(self.rfile.read(longitud))
+        self.send_response(estado)
+        self.send_header("Content-Type", tipo)
+        if estado == 200:
+            self.send_header("Content-Encoding", "deflate")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+def cargar_roster(ruta: Optional[str]) -> ServicioRoster:
+    """Crea el roster desde un archivo JSON o con los operadores por defecto."""
+    datos = DEFAULT_OPERATORS
+    if ruta:
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+    return ServicioRoster(tuple(Operador.from_dict(op) for op in datos))
+
+def crear_servidor(host: str, puerto: int, api: ApiReportes) -> ThreadingHTTPServer:
+    """Crea el servidor HTTP sin iniciarlo."""
+    manejador = type("Manejador", (ManejadorApi,), {"api": api})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor JSON de reportes del tiempo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--operadores", default=None, help="Archivo JSON con los operadores")
+    parser.add_argument("--central", action="store_true", help="Atender la sincronización de las estaciones")
+    args = parser.parse_args()
+
+    ruta_operadores = args.operadores
+    if ruta_operadores is None and os.path.exists(os.path.join(DATA_DIR, "operadores.json")):
+        ruta_operadores = os.path.join(DATA_DIR, "operadores.json")
+
+    central = NodoCentral(SINCRONIZACION["central"]) if args.central else None
+    servidor = crear_servidor(args.host, args.port, ApiReportes(cargar_roster(ruta_operadores), central=central))
+    print(f"Servidor de reportes en http://{args.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Ciclo de vida de las sesiones: inactividad y presupuesto de memoria.
+
+En el modo web cada conexión mantiene su propia aplicación. Las sesiones que
+quedan abiertas por días (pantallas de pared) se registran aquí. Un hilo
+revisa periódicamente cuánto ocupan sus estructuras pesadas (diálogos,
+copia del roster, cachés de reportes y spans) y las libera en las sesiones
+inactivas. Si el total supera el presupuesto del proceso, también las libera
+en las sesiones menos recientes. Medir recorre los objetos, así que solo se
+vuelve a medir una sesión que tuvo actividad, y como mucho cada tanto. Cada
+sesión reconstruye lo liberado cuando vuelve a usarlo.
+"""
+import gc
+import sys
+import threading
+import time
+import types
+from typing import Callable, Iterable, List, Optional, Tuple
+from config import SESIONES
+from metricas import MEMORIA_SESIONES, SESIONES_LIBERADAS
+
+INACTIVIDAD = "inactividad"
+PRESUPUESTO = "presupuesto"
+
+# Tipos que no se recorren: pertenecen al proceso, no a la sesión
+_COMPARTIDOS = (type, types.ModuleType, types.FunctionType, types.MethodType,
+                types.BuiltinFunctionType, types.CodeType, types.FrameType)
+
+def tamano_profundo(objetos: Iterable[object], excluir: Iterable[object] = (), limite: int = 500_000) -> int:
+    """Bytes aproximados de los objetos y de todo lo que alcanzan.
+
+    No entra en funciones, clases, módulos ni en los objetos de `excluir`
+    (la página y el estado de la sesión, que no se liberan). Se detiene
+    después de `limite` objetos para acotar el costo de la medición.
+    """
+    vistos = {id(o) for o in excluir}
+    pendientes = [o for o in objetos if o is not None]
+    total = 0
+    while pendientes and len(vistos) < limite:
+        objeto = pendientes.pop()
+        if id(objeto) in vistos or isinstance(objeto, _COMPARTIDOS):
+            continue
+        vistos.add(id(objeto))
+        total += sys.getsizeof(objeto, 0)
+        pendientes.extend(gc.get_referents(objeto))
+    return total
+
+class Sesion:
+    """Una sesión registrada; `tocar` marca actividad del usuario."""
+
+    def __init__(self, registro: "RegistroSesiones", liberar: Callable[[], None], medir: Callable[[], int]):
+        self._registro = registro
+        self._liberar = liberar
+        self._medir = medir
+        self.ultima_actividad = time.monotonic()
+        self.liberada = False
+        self.memoria = 0  # Bytes liberables en la última medición
+        self._medida_en: Optional[float] = None
+
+    def tocar(self) -> None:
+        self.ultima_actividad = time.monotonic()
+        self.liberada = False
+
+    def medir(self, ahora: Optional[float] = None) -> int:
+        """Vuelve a medir solo si hubo actividad desde la última medición."""
+        if self.liberada:
+            return 0
+        ahora = time.monotonic() if ahora is None else ahora
+        if self._medida_en is None or (
+            self.ultima_actividad >= self._medida_en and ahora - self._medida_en >= SESIONES["remedicion"]
+        ):
+            try:
+                self.memoria = self._medir()
+                self._medida_en = ahora
+            except RuntimeError:
+                pass  # La sesión cambió durante el recorrido: queda la medición anterior
+        return self.memoria
+
+    def liberar(self, motivo: str) -> None:
+        self.liberada = True
+        self.memoria = 0
+        self._medida_en = None  # La primera revisión tras volver a usarla mide lo reconstruido
+        SESIONES_LIBERADAS.inc(motivo)
+        try:
+            self._liberar()
+        except Exception as e:
+            print(f"Error liberando la sesión: {e}")
+
+    def cerrar(self) -> None:
+        """Deja de vigilar la sesión (al desconectarse)."""
+        self._registro.quitar(self)
+
+class RegistroSesiones:
+    """Sesiones vivas del proceso con su actividad y su memoria liberable."""
+
+    def __init__(self, inactividad: Optional[float] = None, presupuesto: Optional[int] = None,
+                 inactividad_minima: Optional[float] = None):
+        self.inactividad = inactividad if inactividad is not None else SESIONES["inactividad"]
+        self.inactividad_minima = inactividad_minima if inactividad_minima is not None else SESIONES["inactividad_minima"]
+        self.presupuesto = presupuesto if presupuesto is not None else int(SESIONES["presupuesto_mb"] * 1024 * 1024)
+        self._sesiones: Tuple[Sesion, ...] = ()
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._sesiones)
+
+    def registrar(self, liberar: Callable[[], None], medir: Callable[[], int]) -> Sesion:
+        """Registra una sesión. `liberar` suelta sus estructuras pesadas y `medir` devuelve cuánto ocupan."""
+        sesion = Sesion(self, liberar, medir)
+        with self._lock:
+            self._sesiones = self._sesiones + (sesion,)
+        return sesion
+
+    def quitar(self, sesion: Sesion) -> None:
+        with self._lock:
+            self._sesiones = tuple(s for s in self._sesiones if s is not sesion)
+
+    def revisar(self, ahora: Optional[float] = None) -> List[Tuple[Sesion, str]]:
+        """Mide las sesiones y libera las inactivas y, si hace falta, las menos recientes."""
+        ahora = time.monotonic() if ahora is None else ahora
+        sesiones = self._sesiones
+        total = sum(s.medir(ahora) for s in sesiones)
+        liberadas = []
+        for sesion in sesiones:
+            if not sesion.liberada and ahora - sesion.ultima_actividad >= self.inactividad:
+                total -= sesion.memoria
+                sesion.liberar(INACTIVIDAD)
+                liberadas.append((sesion, INACTIVIDAD))
+
+        if self.presupuesto > 0 and total > self.presupuesto:
+            candidatas = sorted(
+                (s for s in sesiones if not s.liberada and ahora - s.ultima_actividad >= self.inactividad_minima),
+                key=lambda s: s.ultima_actividad
+            )
+            for sesion in candidatas:
+                if total <= self.presupuesto:
+                    break
+                total -= sesion.memoria
+                sesion.liberar(PRESUPUESTO)
+                liberadas.append((sesion, PRESUPUESTO))
+            if total > self.presupuesto:
+                print(f"Sesiones sobre el presupuesto de memoria: {total / 1024 ** 2:.1f} MiB")
+        MEMORIA_SESIONES.fijar(total)
+        return liberadas
+
+    def iniciar(self) -> None:
+        """Inicia el hilo de revisión periódica (una sola vez)."""
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._ejecutar, name="sesiones", daemon=True)
+                self._hilo.start()
+
+    def _ejecutar(self) -> None:
+        while True:
+            time.sleep(SESIONES["intervalo"])
+            try:
+                self.revisar()
+            except Exception as e:
+                print(f"Error revisando las sesiones: {e}")
+
+_registro: Optional[RegistroSesiones] = None
+_creacion = threading.Lock()
+
+def obtener_registro_sesiones() -> RegistroSesiones:
+    """Registro del proceso, con su hilo de revisión en marcha."""
+    global _registro
+    if _registro is None:
+        with _creacion:
+            if _registro is None:
+                registro = RegistroSesiones()
+                registro.iniciar()
+                _registro = registro
+    return _registro
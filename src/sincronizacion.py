@@ -0,0 +1,384 @@
+"""
+Sincronización diferida del roster y del historial con un nodo central.
+
+Cada cambio local (alta o baja de un operador, reporte emitido) se anexa a un
+registro de cambios ordenado (JSON Lines) con un reloj de Lamport. Cuando hay
+enlace, el sincronizador envía al nodo central solo los cambios que este aún
+no confirmó y recibe los de las demás estaciones desde su último cursor, en
+lotes comprimidos con zlib. Sin enlace los cambios esperan en disco.
+
+Los conflictos se resuelven igual en todas las estaciones: para cada operador
+gana el cambio con mayor (reloj, nodo), sea alta o baja, y si dos operadores
+vivos comparten cédula se conserva el del cambio mayor. Los reportes no
+entran en conflicto: se unen por identificador.
+"""
+import json
+import os
+import random
+import threading
+import urllib.request
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from config import SINCRONIZACION
+from historial import HistorialReportes, RegistroHistorial
+
+OPERADOR = "operador"
+REPORTE = "reporte"
+
+class ErrorEnlace(Exception):
+    """No se pudo contactar al nodo central."""
+
+@dataclass(frozen=True)
+class Cambio:
+    """Un cambio del registro. `datos` None es la baja del operador `clave`."""
+    nodo: str
+    seq: int
+    reloj: int
+    tipo: str
+    clave: str
+    datos: Optional[Dict]
+
+    @property
+    def id(self) -> str:
+        return f"{self.nodo}:{self.seq}"
+
+    @property
+    def orden(self) -> Tuple[int, str]:
+        """Orden total para resolver conflictos."""
+        return self.reloj, self.nodo
+
+    def to_dict(self) -> Dict:
+        return {
+            "nodo": self.nodo, "seq": self.seq, "reloj": self.reloj,
+            "tipo": self.tipo, "clave": self.clave, "datos": self.datos
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Cambio':
+        return cls(data["nodo"], int(data["seq"]), int(data["reloj"]), data["tipo"], data["clave"], data.get("datos"))
+
+def comprimir(datos: Dict) -> bytes:
+    return zlib.compress(json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+def descomprimir(cuerpo: bytes) -> Dict:
+    return json.loads(zlib.decompress(cuerpo).decode("utf-8"))
+
+class RegistroCambios:
+    """Registro local de cambios propios y ajenos, con el estado resultante."""
+
+    def __init__(self, ruta: str, nodo: str):
+        self.ruta = ruta
+        self.nodo = nodo
+        self.reloj = 0
+        self.seq = 0
+        self.ids = set()
+        self.operadores: Dict[str, Cambio] = {}  # Cambio ganador por nombre
+        self.propios: List[Cambio] = []  # Cambios locales aún sin confirmar
+        self._cargar()
+
+    def _cargar(self) -> None:
+        try:
+            archivo = open(self.ruta, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with archivo:
+            for linea in archivo:
+                try:
+                    self._aplicar(Cambio.from_dict(json.loads(linea)))
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                    print(f"Cambio inválido en el registro: {e}")
+
+    def _aplicar(self, cambio: Cambio) -> bool:
+        if cambio.id in self.ids:
+            return False
+        self.ids.add(cambio.id)
+        self.reloj = max(self.reloj, cambio.reloj)
+        if cambio.nodo == self.nodo:
+            self.seq = max(self.seq, cambio.seq)
+            self.propios.append(cambio)
+        if cambio.tipo == OPERADOR:
+            actual = self.operadores.get(cambio.clave)
+            if actual is None or cambio.orden > actual.orden:
+                self.operadores[cambio.clave] = cambio
+        return True
+
+    def _anexar(self, cambios: List[Cambio]) -> None:
+        if not cambios:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write("".join(json.dumps(c.to_dict(), ensure_ascii=False) + "\n" for c in cambios))
+
+    def registrar(self, entradas: List[Tuple[str, str, Optional[Dict]]]) -> List[Cambio]:
+        """Registra cambios locales (tipo, clave, datos)."""
+        cambios = []
+        for tipo, clave, datos in entradas:
+            self.seq += 1
+            self.reloj += 1
+            cambio = Cambio(self.nodo, self.seq, self.reloj, tipo, clave, datos)
+            self._aplicar(cambio)
+            cambios.append(cambio)
+        self._anexar(cambios)
+        return cambios
+
+    def incorporar(self, cambios: List[Cambio]) -> List[Cambio]:
+        """Incorpora cambios remotos; devuelve los que no se conocían."""
+        nuevos = [c for c in cambios if self._aplicar(c)]
+        self._anexar(nuevos)
+        return nuevos
+
+    def confirmar(self, seq: int) -> None:
+        """Olvida los cambios locales que el nodo central ya confirmó."""
+        self.propios = [c for c in self.propios if c.seq > seq]
+
+    def roster(self) -> List[Dict]:
+        """Operadores vivos según los cambios ganadores, sin cédulas repetidas."""
+        por_cedula: Dict[str, Cambio] = {}
+        for cambio in self.operadores.values():
+            if cambio.datos is None:
+                continue
+            cedula = cambio.datos.get("cedula")
+            actual = por_cedula.get(cedula)
+            if actual is None or cambio.orden > actual.orden:
+                por_cedula[cedula] = cambio
+        return [c.datos for c in sorted(por_cedula.values(), key=lambda c: c.orden)]
+
+class NodoCentral:
+    """Nodo central: guarda todos los cambios y los reparte por cursor."""
+
+    def __init__(self, ruta: Optional[str] = None):
+        self.ruta = ruta
+        self.cambios: List[Dict] = []
+        self.ids = set()
+        self._lock = threading.Lock()
+        if ruta and os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as archivo:
+                for linea in archivo:
+                    try:
+                        datos = json.loads(linea)
+                    except json.JSONDecodeError:
+                        continue
+                    self.cambios.append(datos)
+                    self.ids.add(f"{datos['nodo']}:{datos['seq']}")
+
+    def intercambiar(self, solicitud: Dict) -> Dict:
+        """Recibe los cambios de una estación y le devuelve los ajenos desde su cursor."""
+        nodo = solicitud["nodo"]
+        recibidos = solicitud.get("cambios", [])
+        with self._lock:
+            nuevos = []
+            for datos in recibidos:
+                clave = f"{datos['nodo']}:{datos['seq']}"
+                if clave not in self.ids:
+                    self.ids.add(clave)
+                    nuevos.append(datos)
+            if nuevos and self.ruta:
+                with open(self.ruta, "a", encoding="utf-8") as archivo:
+                    archivo.write("".join(json.dumps(d, ensure_ascii=False) + "\n" for d in nuevos))
+            self.cambios.extend(nuevos)
+
+            desde = max(0, int(solicitud.get("desde", 0)))
+            limite = int(solicitud.get("limite", SINCRONIZACION["tamano_lote"]))
+            salida, cursor = [], desde
+            while cursor < len(self.cambios) and len(salida) < limite:
+                if self.cambios[cursor]["nodo"] != nodo:
+                    salida.append(self.cambios[cursor])
+                cursor += 1
+            mas = cursor < len(self.cambios)
+        return {
+            "ack": max((d["seq"] for d in recibidos), default=0),
+            "cambios": salida,
+            "cursor": cursor,
+            "mas": mas
+        }
+
+Transporte = Callable[[bytes], bytes]
+
+class TransporteHttp:
+    """Envía el intercambio comprimido por HTTP POST al nodo central."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    def __call__(self, cuerpo: bytes) -> bytes:
+        solicitud = urllib.request.Request(
+            self.url, data=cuerpo, method="POST",
+            headers={"Content-Type": "application/json", "Content-Encoding": "deflate"}
+        )
+        try:
+            with urllib.request.urlopen(solicitud, timeout=self.timeout) as respuesta:
+                return respuesta.read()
+        except OSError as e:
+            raise ErrorEnlace(str(e)) from e
+
+class Sincronizador:
+    """Registra los cambios locales y los intercambia con el nodo central cuando hay enlace."""
+
+    def __init__(self, transporte: Transporte, directorio: str, historial: Optional[HistorialReportes] = None):
+        self.transporte = transporte
+        self.historial = historial or HistorialReportes()
+        self._ruta_estado = os.path.join(directorio, "sincronizacion.json")
+        estado = self._leer_estado()
+        self.nodo = estado.get("nodo") or uuid.uuid4().hex[:12]
+        self.enviado = estado.get("enviado", 0)  # Último seq propio confirmado
+        self.cursor = estado.get("cursor", 0)  # Posición en el registro central
+        self.registro = RegistroCambios(os.path.join(directorio, "cambios.jsonl"), self.nodo)
+        self.registro.confirmar(self.enviado)
+        self.bytes_enviados = 0
+        self.bytes_recibidos = 0
+        self._lock = threading.Lock()
+        self._suscriptores: Tuple[Callable[[List[Cambio]], None], ...] = ()
+        self._pendiente = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._guardar_estado()
+
+    def _leer_estado(self) -> Dict:
+        try:
+            with open(self._ruta_estado, encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _guardar_estado(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self._ruta_estado)), exist_ok=True)
+        with open(self._ruta_estado + ".tmp", "w", encoding="utf-8") as archivo:
+            json.dump({"nodo": self.nodo, "enviado": self.enviado, "cursor": self.cursor}, archivo)
+        os.replace(self._ruta_estado + ".tmp", self._ruta_estado)
+
+    def suscribir(self, callback: Callable[[List[Cambio]], None]) -> Callable[[], None]:
+        """Registra un callback con los cambios remotos de operadores y devuelve la función para anularlo."""
+        with self._lock:
+            self._suscriptores = self._suscriptores + (callback,)
+
+        def desuscribir():
+            with self._lock:
+                self._suscriptores = tuple(s for s in self._suscriptores if s is not callback)
+        return desuscribir
+
+    def registrar_operador(self, nombre: str, datos: Optional[Dict]) -> None:
+        """Registra el alta (datos) o la baja (None) de un operador."""
+        with self._lock:
+            self.registro.registrar([(OPERADOR, nombre, datos)])
+        self._pendiente.set()
+
+    def registrar_reportes(self, registros: List[RegistroHistorial]) -> None:
+        with self._lock:
+            self.registro.registrar([(REPORTE, "", r.to_dict()) for r in registros])
+        self._pendiente.set()
+
+    def sembrar_roster(self, operadores: List[Dict]) -> None:
+        """Registra los operadores locales que el registro aún no conoce."""
+        with self._lock:
+            nuevos = [op for op in operadores if op["nombre"] not in self.registro.operadores]
+            self.registro.registrar([(OPERADOR, op["nombre"], op) for op in nuevos])
+        if nuevos:
+            self._pendiente.set()
+
+    def roster(self) -> List[Dict]:
+        """Roster que resulta de todos los cambios conocidos."""
+        with self._lock:
+            return self.registro.roster()
+
+    def pendientes(self) -> int:
+        return len(self.registro.propios)
+
+    def sincronizar(self) -> int:
+        """Intercambia lotes hasta quedar al día; devuelve los cambios remotos nuevos. Lanza ErrorEnlace."""
+        recibidos = 0
+        while True:
+            with self._lock:
+                salientes = self.registro.propios[:SINCRONIZACION["tamano_lote"]]
+            cuerpo = comprimir({
+                "nodo": self.nodo,
+                "cambios": [c.to_dict() for c in salientes],
+                "desde": self.cursor,
+                "limite": SINCRONIZACION["tamano_lote"]
+            })
+            respuesta_cruda = self.transporte(cuerpo)
+            self.bytes_enviados += len(cuerpo)
+            self.bytes_recibidos += len(respuesta_cruda)
+            try:
+                respuesta = descomprimir(respuesta_cruda)
+                remotos = [Cambio.from_dict(d) for d in respuesta["cambios"]]
+            except (zlib.error, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                raise ErrorEnlace(f"Respuesta inválida del nodo central: {e}") from e
+
+            with self._lock:
+                nuevos = self.registro.incorporar(remotos)
+                self.enviado = max(self.enviado, respuesta["ack"])
+                self.registro.confirmar(self.enviado)
+                self.cursor = respuesta["cursor"]
+                self._guardar_estado()
+            recibidos += len(nuevos)
+            self._publicar(nuevos)
+            if not respuesta["mas"] and len(salientes) < SINCRONIZACION["tamano_lote"]:
+                return recibidos
+
+    def _publicar(self, nuevos: List[Cambio]) -> None:
+        reportes = [RegistroHistorial.from_dict(c.datos) for c in nuevos if c.tipo == REPORTE]
+        if reportes:
+            self.historial.registrar_lote(reportes)
+        operadores = [c for c in nuevos if c.tipo == OPERADOR]
+        if operadores:
+            # Una sesión con error no deja sin cambios a las demás ni detiene el hilo
+            for callback in self._suscriptores:
+                try:
+                    callback(operadores)
+                except Exception as e:
+                    print(f"Error notificando cambios sincronizados: {e}")
+
+    def iniciar(self) -> None:
+        self._hilo = threading.Thread(target=self._trabajar, name="sincronizacion", daemon=True)
+        self._hilo.start()
+
+    def detener(self, espera: float = 5.0) -> None:
+        self._detener.set()
+        self._pendiente.set()
+        if self._hilo:
+            self._hilo.join(espera)
+
+    def _trabajar(self) -> None:
+        intentos = 0
+        while not self._detener.is_set():
+            try:
+                self.sincronizar()
+                intentos = 0
+                espera = SINCRONIZACION["intervalo"]
+            except Exception as e:
+                # Cualquier fallo (no solo de enlace) espera con retroceso; el hilo sigue vivo
+                intentos += 1
+                espera = min(SINCRONIZACION["reintento_min"] * 2 ** (intentos - 1), SINCRONIZACION["reintento_max"])
+                espera *= random.uniform(0.8, 1.2)
+                if not isinstance(e, ErrorEnlace):
+                    print(f"Error sincronizando: {e!r}")
+                elif intentos == 1:
+                    print(f"Sin enlace con el nodo central: {e}")
+            # Un cambio local adelanta el intercambio, salvo durante la espera por fallos
+            if intentos:
+                self._detener.wait(espera)
+            else:
+                self._pendiente.wait(espera)
+                self._pendiente.clear()
+
+_sincronizador: Optional[Sincronizador] = None
+_inicializado = False
+_creacion = threading.Lock()
+
+def obtener_sincronizador() -> Optional[Sincronizador]:
+    """Devuelve el sincronizador del proceso, o None si no hay nodo central configurado."""
+    global _sincronizador, _inicializado
+    if not _inicializado:
+        with _creacion:
+            if not _inicializado:
+                if SINCRONIZACION["url"]:
+                    _sincronizador = Sincronizador(
+                        TransporteHttp(SINCRONIZACION["url"], SINCRONIZACION["timeout"]),
+                        SINCRONIZACION["directorio"]
+                    )
+                    _sincronizador.iniciar()
+                _inicializado = True
+    return _sincronizador
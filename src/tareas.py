@@ -0,0 +1,19 @@
+"""
+Ejecución de E/S bloqueante fuera del bucle de eventos de la interfaz.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+# Pool acotado para el almacenamiento del cliente, archivos y red
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="reporte-io")
+
+async def en_segundo_plano(funcion: Callable, *args, **kwargs) -> Any:
+    """Ejecuta una función bloqueante en el pool de E/S y espera su resultado."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(funcion, *args, **kwargs))
+
+async def en_paralelo(*llamadas: Callable) -> list:
+    """Ejecuta varias funciones sin argumentos en el pool y las espera juntas."""
+    return await asyncio.gather(*(en_segundo_plano(llamada) for llamada in llamadas))
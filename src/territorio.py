@@ -0,0 +1,116 @@
+"""
+Catálogo territorial jerárquico (estado → municipio → parroquia).
+
+Se carga de forma diferida desde un archivo de datos compacto la primera vez
+que se usa y se comparte en todo el proceso. Como los catálogos, el archivo
+del directorio de datos tiene prioridad sobre el incluido y se vuelve a leer
+solo cuando cambia su fecha de modificación. La búsqueda usa un índice
+ordenado de palabras normalizadas (sin acentos ni mayúsculas) y resuelve
+prefijos con búsqueda binaria.
+"""
+import bisect
+import itertools
+import json
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from catalogos import ArchivoVigilado, CatalogoError
+from config import DIVISION_TERRITORIAL
+
+@dataclass(frozen=True)
+class Municipio:
+    """Municipio con su estado y parroquias."""
+    estado: str
+    nombre: str
+    parroquias: Tuple[str, ...] = ()
+
+    @property
+    def etiqueta(self) -> str:
+        return f"{self.nombre} ({self.estado})"
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin acentos, para comparar búsquedas."""
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+class CatalogoTerritorial:
+    """División territorial con índice de búsqueda por prefijo."""
+
+    def __init__(self, estados: Dict[str, Tuple[Municipio, ...]]):
+        self._estados = estados
+        self.municipios: Tuple[Municipio, ...] = tuple(m for ms in estados.values() for m in ms)
+
+        # (palabra normalizada, índice del municipio), ordenado para bisect
+        entradas = set()
+        for i, municipio in enumerate(self.municipios):
+            for texto in (municipio.nombre, municipio.estado):
+                for palabra in normalizar(texto).split():
+                    entradas.add((palabra, i))
+        self._indice: List[Tuple[str, int]] = sorted(entradas)
+        self._palabras = [palabra for palabra, _ in self._indice]
+        self._normalizados = [
+            normalizar(f"{m.nombre} {m.estado}").split() for m in self.municipios
+        ]
+
+    @classmethod
+    def desde_archivo(cls, ruta: str) -> 'CatalogoTerritorial':
+        """Lee el formato compacto: [estado, [[municipio, [parroquias]], ...]]."""
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+            estados = {
+                estado: tuple(Municipio(estado, nombre, tuple(parroquias)) for nombre, parroquias in municipios)
+                for estado, municipios in datos["estados"]
+            }
+        except json.JSONDecodeError as e:
+            raise CatalogoError(f"JSON inválido: {e}") from None
+        except (KeyError, TypeError, ValueError):
+            raise CatalogoError("La división territorial no tiene el formato [estado, [[municipio, [parroquias]], ...]]") from None
+        if not any(estados.values()):
+            raise CatalogoError("La división territorial no tiene municipios")
+        return cls(estados)
+
+    def estados(self) -> Tuple[str, ...]:
+        return tuple(self._estados)
+
+    def municipios_de(self, estado: str) -> Tuple[Municipio, ...]:
+        return self._estados.get(estado, ())
+
+    def buscar_municipio(self, nombre: str, estado: Optional[str] = None) -> Optional[Municipio]:
+        """Busca un municipio por nombre exacto, opcionalmente dentro de un estado."""
+        for municipio in (self.municipios_de(estado) if estado else self.municipios):
+            if municipio.nombre == nombre:
+                return municipio
+        return None
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Municipio]:
+        """Municipios cuyas palabras empiezan por las de la consulta."""
+        palabras = normalizar(consulta).split()
+        if not palabras:
+            return list(self.municipios[:limite])
+
+        # Candidatos por la palabra más larga (la más selectiva)
+        clave = max(palabras, key=len)
+        inicio = bisect.bisect_left(self._palabras, clave)
+        resultados, vistos = [], set()
+        for palabra, i in itertools.islice(self._indice, inicio, None):
+            if not palabra.startswith(clave):
+                break
+            if i in vistos:
+                continue
+            vistos.add(i)
+            tokens = self._normalizados[i]
+            if all(any(t.startswith(p) for t in tokens) for p in palabras):
+                resultados.append(i)
+
+        resultados.sort()  # Orden del catálogo, estable entre consultas
+        return [self.municipios[i] for i in resultados[:limite]]
+
+def _rutas_territorio() -> Tuple[str, ...]:
+    return (DIVISION_TERRITORIAL["archivo"], DIVISION_TERRITORIAL["predeterminado"])
+
+_catalogo = ArchivoVigilado(_rutas_territorio, CatalogoTerritorial.desde_archivo)
+
+def obtener_catalogo_territorial() -> CatalogoTerritorial:
+    """Catálogo vigente del proceso; se carga la primera vez que se pide."""
+    return _catalogo.obtener()
@@ -0,0 +1,177 @@
+"""
+Calendario de turnos de los operadores.
+
+Las guardias se definen como rotaciones recurrentes (un turno de cierta
+duración que se repite con un periodo) y excepciones puntuales, que tienen
+prioridad. Para responder "quién está de guardia en el momento t para el
+municipio m" se expanden los turnos de una ventana de tiempo y se aplanan en
+segmentos disjuntos ordenados, consultados con búsqueda binaria.
+
+Formato compacto de turnos.json (fechas ISO en hora local, duraciones en horas):
+    {"rotaciones": [[operador, municipio, inicio, duracion, periodo, hasta], ...],
+     "excepciones": [[operador, municipio, inicio, fin], ...]}
+El municipio "*" aplica a todos; "hasta" puede ser null.
+"""
+import bisect
+import datetime
+import heapq
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from catalogos import ArchivoVigilado, CatalogoError
+from config import TURNOS
+
+TODOS = "*"
+
+@dataclass(frozen=True)
+class Rotacion:
+    """Turno recurrente: desde `inicio`, `duracion` segundos cada `periodo` segundos."""
+    operador: str
+    municipio: str
+    inicio: float
+    duracion: float
+    periodo: float
+    hasta: Optional[float] = None
+
+    def turnos(self, desde: float, hasta: float) -> List[Tuple[float, float]]:
+        """Turnos (inicio, fin) que se solapan con [desde, hasta)."""
+        limite = min(hasta, self.hasta) if self.hasta is not None else hasta
+        if limite <= self.inicio:
+            return []
+        primero = max(0, int((desde - self.inicio - self.duracion) // self.periodo) + 1)
+        resultado = []
+        inicio = self.inicio + primero * self.periodo
+        while inicio < limite:
+            fin = inicio + self.duracion
+            if self.hasta is not None:
+                fin = min(fin, self.hasta)
+            if fin > desde:
+                resultado.append((inicio, fin))
+            inicio += self.periodo
+        return resultado
+
+@dataclass(frozen=True)
+class Excepcion:
+    """Guardia puntual que prevalece sobre las rotaciones."""
+    operador: str
+    municipio: str
+    inicio: float
+    fin: float
+
+class IndiceGuardias:
+    """Segmentos disjuntos (inicio, fin, operador) consultados por bisección."""
+
+    def __init__(self, intervalos: List[Tuple[float, float, int, str]]):
+        # intervalos: (inicio, fin, clase, operador); gana la clase mayor y luego el inicio más reciente
+        self.inicios: List[float] = []
+        self.fines: List[float] = []
+        self.operadores: List[str] = []
+
+        ordenados = sorted(intervalos, key=lambda i: i[0])
+        puntos = sorted({p for inicio, fin, _, _ in ordenados for p in (inicio, fin)})
+        activos: List[Tuple[int, float, int, float, str]] = []
+        siguiente = 0
+        for i, punto in enumerate(puntos[:-1]):
+            while siguiente < len(ordenados) and ordenados[siguiente][0] <= punto:
+                inicio, fin, clase, operador = ordenados[siguiente]
+                heapq.heappush(activos, (-clase, -inicio, -siguiente, fin, operador))
+                siguiente += 1
+            while activos and activos[0][3] <= punto:
+                heapq.heappop(activos)  # Retiro perezoso de los turnos terminados
+            if not activos:
+                continue
+            operador = activos[0][4]
+            if self.operadores and self.operadores[-1] == operador and self.fines[-1] == punto:
+                self.fines[-1] = puntos[i + 1]
+            else:
+                self.inicios.append(punto)
+                self.fines.append(puntos[i + 1])
+                self.operadores.append(operador)
+
+    def en_guardia(self, momento: float) -> Optional[str]:
+        i = bisect.bisect_right(self.inicios, momento) - 1
+        if i >= 0 and momento < self.fines[i]:
+            return self.operadores[i]
+        return None
+
+class CalendarioTurnos:
+    """Rotaciones y excepciones con índices por municipio y ventana de tiempo."""
+
+    def __init__(self, rotaciones: Tuple[Rotacion, ...] = (), excepciones: Tuple[Excepcion, ...] = ()):
+        self.rotaciones = tuple(rotaciones)
+        self.excepciones = tuple(excepciones)
+        self._indices: Dict[str, Tuple[float, float, IndiceGuardias]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def desde_dict(cls, datos: Dict) -> 'CalendarioTurnos':
+        try:
+            rotaciones = []
+            for operador, municipio, inicio, duracion, periodo, *hasta in datos.get("rotaciones", []):
+                rotaciones.append(Rotacion(
+                    operador, municipio, _momento(inicio), float(duracion) * 3600, float(periodo) * 3600,
+                    _momento(hasta[0]) if hasta and hasta[0] else None
+                ))
+            excepciones = tuple(
+                Excepcion(operador, municipio, _momento(inicio), _momento(fin))
+                for operador, municipio, inicio, fin in datos.get("excepciones", [])
+            )
+        except (TypeError, ValueError) as e:
+            raise CatalogoError(f"Turno inválido: {e}") from None
+        if any(r.duracion <= 0 or r.periodo <= 0 for r in rotaciones):
+            raise CatalogoError("Las rotaciones necesitan duración y periodo positivos")
+        if any(e.fin <= e.inicio for e in excepciones):
+            raise CatalogoError("Las excepciones deben terminar después de empezar")
+        return cls(tuple(rotaciones), excepciones)
+
+    def en_guardia(self, momento: float, municipio: str) -> Optional[str]:
+        """Nombre del operador de guardia en el momento dado, o None."""
+        entrada = self._indices.get(municipio)
+        if entrada is None or not entrada[0] <= momento < entrada[1]:
+            entrada = self._construir(municipio, momento)
+        return entrada[2].en_guardia(momento)
+
+    def _construir(self, municipio: str, momento: float) -> Tuple[float, float, IndiceGuardias]:
+        desde = momento - TURNOS["margen_horas"] * 3600
+        hasta = momento + TURNOS["ventana_dias"] * 86400
+        intervalos = []
+        for rotacion in self.rotaciones:
+            if rotacion.municipio in (municipio, TODOS):
+                clase = 1 if rotacion.municipio == municipio else 0
+                intervalos.extend(
+                    (inicio, fin, clase, rotacion.operador) for inicio, fin in rotacion.turnos(desde, hasta)
+                )
+        for excepcion in self.excepciones:
+            if excepcion.municipio in (municipio, TODOS) and excepcion.fin > desde and excepcion.inicio < hasta:
+                clase = 3 if excepcion.municipio == municipio else 2
+                intervalos.append((excepcion.inicio, excepcion.fin, clase, excepcion.operador))
+        entrada = (desde, hasta, IndiceGuardias(intervalos))
+        with self._lock:
+            self._indices[municipio] = entrada
+        return entrada
+
+def _momento(valor) -> float:
+    """Fecha ISO en hora local (o segundos desde época) a segundos desde época."""
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    return datetime.datetime.fromisoformat(valor).timestamp()
+
+def cargar_turnos(ruta: str) -> CalendarioTurnos:
+    """Lee un archivo de turnos en el formato compacto."""
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+    except json.JSONDecodeError as e:
+        raise CatalogoError(f"JSON inválido: {e}") from None
+    return CalendarioTurnos.desde_dict(datos)
+
+_calendario = ArchivoVigilado(lambda: (TURNOS["archivo"],), cargar_turnos)
+_vacio = CalendarioTurnos()
+
+def obtener_calendario() -> CalendarioTurnos:
+    """Calendario vigente del proceso; vacío si no hay archivo de turnos."""
+    try:
+        return _calendario.obtener()
+    except CatalogoError:
+        return _vacio
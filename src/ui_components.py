@@ -3,60 +3,97 @@
 Componentes de interfaz de usuario reutilizables.
 """
 import flet as ft
+import datetime
 import json
-from typing import Callable, Optional, List
-from models import AppState, Operador, ReportGenerator
+import os
+import time
+from typing import Callable, Dict, Optional, List, Sequence, Tuple
+from models import AppState, FilaTablero, Operador, ReportGenerator, Reporte
+from roster import CambioRoster
 from styles import (
     TextStyles, ButtonStyles, ContainerStyles, InputStyles, 
     Colors, ThemeManager, Shadows
 )
-from config import EMOJI_TIEMPO, NOMBRES_TIEMPO, get_cargos, JERARQUIAS, WINDOW_CONFIG
+from config import get_cargos, FONT_FAMILY, DATA_DIR
+from exportacion import ERRORES_POOL, FORMATOS_EXPORTACION, ExportadorHistorial
+from catalogos import obtener_catalogos
+from territorio import Municipio, obtener_catalogo_territorial
+from plantillas import CAMPOS_PLANTILLA, PlantillaError, compilar_plantilla
+from idiomas import Idioma, es_plantilla_de_idioma, idiomas_disponibles, obtener_idioma
+from tareas import en_segundo_plano
+from metricas import LATENCIA_COPIA
+from pluviometros import Sugerencia
+from novedades import IndiceNovedades
+from primer_cuadro import InstantaneaUI
+
+def actualizar_opciones(dropdown: ft.Dropdown, opciones: Sequence[Tuple[str, str]]) -> bool:
+    """Ajusta las opciones (clave, texto) reutilizando las existentes; devuelve True si cambió algo."""
+    actuales = {opcion.key: opcion for opcion in dropdown.options}
+    cambio = [opcion.key for opcion in dropdown.options] != [clave for clave, _ in opciones]
+    nuevas = []
+    for clave, texto in opciones:
+        opcion = actuales.get(clave)
+        if opcion is None:
+            opcion = ft.dropdown.Option(key=clave, text=texto)
+        elif opcion.text != texto:
+            opcion.text = texto
+            cambio = True
+        nuevas.append(opcion)
+    if cambio:
+        dropdown.options = nuevas
+        if dropdown.value not in {clave for clave, _ in opciones}:
+            dropdown.value = opciones[0][0] if opciones else None
+    return cambio
 
 class CustomAppBar:
     """AppBar personalizada con título y menú de opciones."""
 
-    def __init__(self, app_state: AppState, on_theme_change: Callable, on_manage_operators: Callable, on_show_settings: Callable, on_show_about: Callable):
+    def __init__(self, app_state: AppState, on_theme_change: Callable, on_manage_operators: Callable, on_show_settings: Callable, on_show_about: Callable, on_export: Optional[Callable] = None, on_dashboard: Optional[Callable] = None):
         self.app_state = app_state
         self.on_theme_change = on_theme_change
         self.on_manage_operators = on_manage_operators
         self.on_show_settings = on_show_settings
         self.on_show_about = on_show_about
+        self.on_export = on_export
+        self.on_dashboard = on_dashboard
         self.app_bar = self._create_app_bar()
 
     def _create_app_bar(self) -> ft.AppBar:
         """Crea el widget AppBar."""
         is_dark = self.app_state.is_dark_theme
+        enlazar = self.app_state.enlaces.enlazar
 
         return ft.AppBar(
             leading=ft.Image(src="icon.png", width=40, height=40),
-            title=ft.Text(
-                WINDOW_CONFIG["title"],
-                style=TextStyles.subtitle(is_dark)
-            ),
+            title=enlazar(ft.Text(style=TextStyles.subtitle(is_dark)), "app.titulo"),
             bgcolor=ContainerStyles.card(is_dark)["bgcolor"],
             actions=[
                 ft.PopupMenuButton(
                     items=[
-                        ft.PopupMenuItem(
-                            text="Cambiar Tema",
+                        enlazar(ft.PopupMenuItem(
                             icon=ThemeManager.get_theme_icon(is_dark),
                             on_click=lambda _: self.on_theme_change()
-                        ),
-                        ft.PopupMenuItem(
-                            text="Gestionar Operadores",
+                        ), "menu.tema", "text"),
+                        enlazar(ft.PopupMenuItem(
                             icon=ft.Icons.MANAGE_ACCOUNTS,
                             on_click=lambda _: self.on_manage_operators()
-                        ),
-                        ft.PopupMenuItem(
-                            text="Ajustes Generales",
+                        ), "menu.operadores", "text"),
+                        enlazar(ft.PopupMenuItem(
                             icon=ft.Icons.SETTINGS,
                             on_click=lambda _: self.on_show_settings()
-                        ),
-                        ft.PopupMenuItem(
-                            text="Acerca de",
+                        ), "menu.ajustes", "text"),
+                        enlazar(ft.PopupMenuItem(
+                            icon=ft.Icons.DASHBOARD,
+                            on_click=lambda _: self.on_dashboard() if self.on_dashboard else None
+                        ), "menu.tablero", "text"),
+                        enlazar(ft.PopupMenuItem(
+                            icon=ft.Icons.FILE_DOWNLOAD,
+                            on_click=lambda _: self.on_export() if self.on_export else None
+                        ), "menu.exportar", "text"),
+                        enlazar(ft.PopupMenuItem(
                             icon=ft.Icons.INFO_OUTLINE,
                             on_click=lambda _: self.on_show_about()
-                        )
+                        ), "menu.acerca", "text")
                     ]
                 )
             ]
@@ -79,88 +116,147 @@ class CustomAppBar:
 class ReportDisplay:
     """Componente para mostrar el reporte generado."""
     
-    def __init__(self, app_state: AppState):
+    def __init__(self, app_state: AppState, container: Optional[ft.Container] = None):
         self.app_state = app_state
-        self.text_widget = self._create_text_widget()
-        self.container = self._create_container()
+        if container is None:
+            self.text_widget = self._create_text_widget(app_state.is_dark_theme)
+            self.container = self._create_container(self.text_widget, app_state.is_dark_theme)
+            self._segmentos = None
+        else:
+            # Reporte ya pintado por el primer cuadro: sus segmentos van en `data`
+            self.container = container
+            self.text_widget = container.content.controls[0]
+            self._segmentos = container.data
     
-    def _create_text_widget(self) -> ft.Text:
+    @staticmethod
+    def _create_text_widget(is_dark: bool) -> ft.Text:
         return ft.Text(
             spans=[],
             size=17,
-            color=Colors.DARK["on_surface"] if self.app_state.is_dark_theme else Colors.LIGHT["on_surface"],
+            color=Colors.DARK["on_surface"] if is_dark else Colors.LIGHT["on_surface"],
             font_family="Segoe UI",
             selectable=False
         )
     
-    def _create_container(self) -> ft.Container:
+    @staticmethod
+    def _create_container(text_widget: ft.Text, is_dark: bool) -> ft.Container:
         return ft.Container(
             ft.Column([
-                self.text_widget
+                text_widget
             ], alignment="center", horizontal_alignment="center", spacing=12),
-            **ContainerStyles.card(self.app_state.is_dark_theme),
+            **ContainerStyles.card(is_dark),
             alignment=ft.alignment.center
         )
     
-    def update_report(self):
-        """Actualiza el reporte mostrado."""
-        reporte_texto = self.app_state.generar_reporte_actual()
-        self.text_widget.spans = self._markdown_to_spans(reporte_texto)
+    def update_report(self, forzar: bool = False):
+        """Actualiza el reporte mostrado; los spans solo se reemplazan si cambió el texto."""
+        reporte = self.app_state.construir_reporte_actual()
+        if reporte.segmentos == self._segmentos and not forzar:
+            return
+        self._segmentos = reporte.segmentos
+        self.text_widget.spans = self._segmentos_to_spans(reporte.segmentos, self.app_state.is_dark_theme)
     
-    def _markdown_to_spans(self, texto: str) -> List[ft.TextSpan]:
-        """Convierte markdown a TextSpans con el tema actual."""
-        spans = ReportGenerator.markdown_a_textspan(texto)
-        
-        # Actualizar colores según el tema actual
-        text_color = Colors.DARK["on_surface"] if self.app_state.is_dark_theme else Colors.LIGHT["on_surface"]
-        
-        for span in spans:
-            if span.style:
-                span.style.color = text_color
+    @staticmethod
+    def _segmentos_to_spans(segmentos, is_dark: bool) -> List[ft.TextSpan]:
+        """Convierte los segmentos del reporte a TextSpans con el tema dado."""
+        text_color = Colors.DARK["on_surface"] if is_dark else Colors.LIGHT["on_surface"]
         
-        return spans
+        return [
+            ft.TextSpan(
+                texto,
+                ft.TextStyle(
+                    weight=ft.FontWeight.BOLD if negrita else None,
+                    color=text_color,
+                    font_family=FONT_FAMILY
+                )
+            )
+            for texto, negrita in segmentos
+        ]
     
+    def liberar(self):
+        """Suelta los spans de un reporte que no está a la vista; update_report los reconstruye."""
+        self.text_widget.spans = []
+        self._segmentos = None
+
     def update_theme(self):
         """Actualiza los colores según el tema."""
-        self.text_widget.color = Colors.DARK["on_surface"] if self.app_state.is_dark_theme else Colors.LIGHT["on_surface"]
+        color = Colors.DARK["on_surface"] if self.app_state.is_dark_theme else Colors.LIGHT["on_surface"]
+        cambio = self.text_widget.color != color
+        self.text_widget.color = color
         
         # Actualizar container
         container_style = ContainerStyles.card(self.app_state.is_dark_theme)
         for key, value in container_style.items():
             setattr(self.container, key, value)
         
-        # Actualizar spans del reporte
-        self.update_report()
+        # Actualizar spans del reporte (con otro color si cambió el tema)
+        self.update_report(forzar=cambio)
 
 class WeatherSelector:
     """Selector de estado del tiempo."""
     
-    def __init__(self, app_state: AppState, on_change: Callable):
+    def __init__(self, app_state: AppState, on_change: Callable, dropdown: Optional[ft.Dropdown] = None):
         self.app_state = app_state
         self.on_change = on_change
-        self.dropdown = self._create_dropdown()
+        self._sugerencia: Optional[Sugerencia] = None  # Para rehacer la ayuda al cambiar de idioma
+        self._indice_previo: Optional[int] = None  # Elección anterior a la sugerencia
+        self.dropdown = self._create_dropdown() if dropdown is None else self._adopt_dropdown(dropdown)
+    
+    def _adopt_dropdown(self, dropdown: ft.Dropdown) -> ft.Dropdown:
+        """Reutiliza el selector del primer cuadro; solo cambia lo que difiere."""
+        actualizar_opciones(dropdown, self.app_state.idioma.opciones_tiempo)
+        dropdown.value = str(self.app_state.indice_tiempo)
+        dropdown.on_change = self._on_dropdown_change
+        dropdown.disabled = False
+        return dropdown
     
     def _create_dropdown(self) -> ft.Dropdown:
         return ft.Dropdown(
             width=380,
-            options=[
-                ft.dropdown.Option(
-                    key=str(i),
-                    text=f"{EMOJI_TIEMPO[i]}  {nombre}"
-                ) for i, nombre in enumerate(NOMBRES_TIEMPO)
-            ],
+            options=[ft.dropdown.Option(key=key, text=text) for key, text in self.app_state.idioma.opciones_tiempo],
             value=str(self.app_state.indice_tiempo),
             on_change=self._on_dropdown_change,
             **InputStyles.dropdown(self.app_state.is_dark_theme)
         )
     
-    def _on_dropdown_change(self, e):
+    async def _on_dropdown_change(self, e):
         try:
             indice = int(e.control.value)
             self.app_state.cambiar_tiempo(indice)
+            self.dropdown.helper_text = self._sugerencia = self._indice_previo = None  # Elección manual
             self.on_change()
         except (ValueError, TypeError):
             pass
+
+    def sugerir(self, sugerencia: Sugerencia) -> None:
+        """Preselecciona el estado del tiempo sugerido por los pluviómetros."""
+        if self._sugerencia is None:
+            self._indice_previo = self.app_state.indice_tiempo
+        self.app_state.cambiar_tiempo(sugerencia.indice)
+        self.dropdown.value = str(self.app_state.indice_tiempo)
+        self._sugerencia = sugerencia
+        self.dropdown.helper_text = self.app_state.idioma.texto("tiempo.sugerido", tasa=sugerencia.tasa)
+
+    def retirar_sugerencia(self) -> bool:
+        """Quita la ayuda y vuelve a la elección anterior a la sugerencia; True si había una."""
+        if self._sugerencia is None:
+            return False
+        if self._indice_previo is not None:
+            self.app_state.cambiar_tiempo(self._indice_previo)
+            self.dropdown.value = str(self.app_state.indice_tiempo)
+        self.dropdown.helper_text = self._sugerencia = self._indice_previo = None
+        return True
+
+    def actualizar_idioma(self) -> bool:
+        """Aplica las opciones del idioma vigente (otro idioma o un catálogo recargado);
+        devuelve True si cambiaron."""
+        idioma = self.app_state.idioma
+        if self._sugerencia is not None:
+            self.dropdown.helper_text = idioma.texto("tiempo.sugerido", tasa=self._sugerencia.tasa)
+        if not actualizar_opciones(self.dropdown, idioma.opciones_tiempo):
+            return False
+        self.app_state.cambiar_tiempo(int(self.dropdown.value))
+        return True
     
     def update_theme(self):
         """Actualiza el estilo según el tema."""
@@ -171,11 +267,30 @@ class WeatherSelector:
 class OperatorSelector:
     """Selector de operador."""
     
-    def __init__(self, app_state: AppState, on_change: Callable):
+    def __init__(self, app_state: AppState, on_change: Callable, page: Optional[ft.Page] = None, dropdown: Optional[ft.Dropdown] = None):
         self.app_state = app_state
         self.on_change = on_change
-        self.dropdown = self._create_dropdown()
+        self.page = page
+        self.dropdown = self._create_dropdown() if dropdown is None else self._adopt_dropdown(dropdown)
+        self._desuscribir = None
+        self._version_roster = 0  # Última versión del roster compartido ya mostrada
+
+        # Con roster compartido, recibir los cambios de las demás sesiones
+        servicio = app_state.operador_manager.servicio
+        if servicio and page:
+            self._version_roster = servicio.instantanea().version
+            self._desuscribir = servicio.suscribir(self._on_roster_change)
     
+    def _adopt_dropdown(self, dropdown: ft.Dropdown) -> ft.Dropdown:
+        """Reutiliza el selector del primer cuadro; solo cambia lo que difiere."""
+        nombres = self.app_state.operador_manager.obtener_nombres()
+        if [option.key for option in dropdown.options] != nombres:
+            dropdown.options = [ft.dropdown.Option(nombre) for nombre in nombres]
+        dropdown.value = nombres[self.app_state.indice_operador] if nombres else None
+        dropdown.on_change = self._on_dropdown_change
+        dropdown.disabled = False
+        return dropdown
+
     def _create_dropdown(self) -> ft.Dropdown:
         nombres = self.app_state.operador_manager.obtener_nombres()
         valor_inicial = nombres[self.app_state.indice_operador] if nombres else None
@@ -188,13 +303,59 @@ class OperatorSelector:
             **InputStyles.dropdown(self.app_state.is_dark_theme)
         )
     
-    def _on_dropdown_change(self, e):
+    async def _on_dropdown_change(self, e):
         if e.control.value:
             self.app_state.cambiar_operador(e.control.value)
             self.on_change()
     
+    def _on_roster_change(self, cambio: CambioRoster):
+        """Aplica en el hilo de la sesión un cambio publicado por otra sesión."""
+        self.page.run_thread(self._apply_roster_change, cambio)
+
+    def _apply_roster_change(self, cambio: CambioRoster):
+        """Agrega y quita solo las opciones que difieren de la versión actual del roster.
+
+        Las notificaciones salen fuera del bloqueo del servicio y pueden llegar
+        desordenadas: se descartan las ya superadas y se concilia contra la
+        instantánea vigente en lugar de aplicar la diferencia recibida.
+        """
+        if cambio.version <= self._version_roster:
+            return
+        instantanea = self.app_state.operador_manager.servicio.instantanea()
+        self._version_roster = instantanea.version
+        claves = {option.key for option in self.dropdown.options}
+        eliminados = claves - instantanea.por_nombre.keys()
+        agregados = [op for op in instantanea.operadores if op.nombre not in claves]
+        if not eliminados and not agregados:
+            return  # Cambio ya aplicado por esta misma sesión
+
+        if eliminados:
+            self.dropdown.options = [o for o in self.dropdown.options if o.key not in eliminados]
+        for operador in agregados:
+            self.dropdown.options.append(ft.dropdown.Option(operador.nombre))
+
+        # Los índices pudieron desplazarse: volver a ubicar la selección por nombre
+        seleccionado = self.dropdown.value
+        if seleccionado and seleccionado not in eliminados:
+            self.app_state.cambiar_operador(seleccionado)
+        else:
+            cantidad = self.app_state.operador_manager.cantidad
+            self.app_state.indice_operador = min(self.app_state.indice_operador, max(cantidad - 1, 0))
+            operador = self.app_state.obtener_operador_actual()
+            self.dropdown.value = operador.nombre if operador else None
+        self.on_change()
+
+    def close(self):
+        """Deja de recibir cambios del roster compartido."""
+        if self._desuscribir:
+            self._desuscribir()
+            self._desuscribir = None
+
     def refresh_options(self):
         """Actualiza las opciones del dropdown."""
+        servicio = self.app_state.operador_manager.servicio
+        if servicio:
+            self._version_roster = servicio.instantanea().version
         nombres = self.app_state.operador_manager.obtener_nombres()
         self.dropdown.options = [ft.dropdown.Option(nombre) for nombre in nombres]
         
@@ -210,6 +371,90 @@ class OperatorSelector:
         for key, value in style.items():
             setattr(self.dropdown, key, value)
 
+class NovedadField:
+    """Campo de novedad con sugerencias de las novedades ya reportadas en el municipio."""
+
+    def __init__(self, app_state: AppState, indice: IndiceNovedades, on_change: Callable, on_commit: Callable,
+                 field: Optional[ft.TextField] = None, results: Optional[ft.Column] = None):
+        self.app_state = app_state
+        self.indice = indice
+        self.on_change = on_change  # En cada tecla: solo refrescar el reporte
+        self.on_commit = on_commit  # Al terminar de escribir
+        self.field = field or self._create_field(app_state.is_dark_theme)
+        app_state.enlaces.enlazar(self.field, "novedad.etiqueta", "label")
+        self.field.hint_text = app_state.idioma.novedad_por_defecto
+        self.field.value = app_state.novedad
+        self.field.on_change = self._on_text_change
+        self.field.on_focus = self._on_text_change
+        self.field.on_blur = self._on_blur
+        self.field.on_submit = self._on_submit
+        self.field.disabled = False
+        self.results = results or self._create_results()
+
+    @staticmethod
+    def _create_field(is_dark: bool) -> ft.TextField:
+        return ft.TextField(
+            width=380,
+            **InputStyles.textfield(is_dark)
+        )
+
+    @staticmethod
+    def _create_results() -> ft.Column:
+        return ft.Column(spacing=0, width=380, visible=False)
+
+    def _on_text_change(self, e):
+        """Aplica lo escrito y muestra las novedades que empiezan igual."""
+        texto = self.field.value or ""
+        anterior = self.app_state.novedad
+        self.app_state.cambiar_novedad(texto)
+        escrita = " ".join(texto.split())
+        sugerencias = [
+            s for s in self.indice.sugerir(self.app_state.municipio, texto) if s != escrita
+        ]
+        self.results.controls = [
+            ft.ListTile(title=ft.Text(s), dense=True, on_click=lambda e, s=s: self._select(s))
+            for s in sugerencias
+        ]
+        self.results.visible = bool(sugerencias)
+        if self.app_state.novedad != anterior:
+            self.on_change()
+        else:
+            self.results.update()
+
+    def _select(self, texto: str):
+        """Usa la novedad sugerida."""
+        self.field.value = texto
+        self.app_state.cambiar_novedad(texto)
+        self.results.visible = False
+        self.on_change()
+        self.on_commit()
+
+    def _on_submit(self, e):
+        self.results.visible = False
+        self.results.update()
+        self.on_commit()
+
+    def _on_blur(self, e):
+        # Las sugerencias siguen visibles: el clic en una llega después del blur
+        self.on_commit()
+
+    def liberar(self) -> bool:
+        """Descarta las sugerencias; devuelve True si estaban a la vista."""
+        visibles = self.results.visible
+        self.results.controls = []
+        self.results.visible = False
+        return visibles
+
+    def actualizar_idioma(self):
+        """Muestra la novedad por defecto del idioma vigente."""
+        self.field.hint_text = self.app_state.idioma.novedad_por_defecto
+
+    def update_theme(self):
+        """Actualiza el estilo según el tema."""
+        style = InputStyles.textfield(self.app_state.is_dark_theme)
+        for key, value in style.items():
+            setattr(self.field, key, value)
+
 class OperatorManagementDialog:
     """Diálogo para gestionar operadores."""
     
@@ -250,50 +495,48 @@ class OperatorManagementDialog:
     def _create_form_fields(self):
         """Crea los campos del formulario."""
         style = InputStyles.textfield(self.app_state.is_dark_theme)
+        enlazar = self.app_state.enlaces.enlazar
         
         self.nombre_field = ft.TextField(
-            label="Nombre",
             width=300,
-            hint_text="Nombre del operador",
             **style
         )
+        enlazar(self.nombre_field, "operadores.nombre", "label")
+        enlazar(self.nombre_field, "operadores.nombre_ayuda", "hint_text")
         
         self.cedula_field = ft.TextField(
-            label="Cédula",
             width=300,
-            hint_text="Cédula",
             value="V-",
             on_change=self._format_cedula,
             input_filter=ft.InputFilter(r"[0-9]"),
             **style
         )
+        enlazar(self.cedula_field, "operadores.cedula", "label")
+        enlazar(self.cedula_field, "operadores.cedula", "hint_text")
         
         cargos = get_cargos(self.app_state.departamento)
-        self.cargo_dropdown = ft.Dropdown(
-            label="Cargo",
+        self.cargo_dropdown = enlazar(ft.Dropdown(
             width=300,
             options=[ft.dropdown.Option(cargo) for cargo in cargos],
             value=cargos[0],
             **InputStyles.dropdown(self.app_state.is_dark_theme)
-        )
+        ), "operadores.cargo", "label")
         
-        self.jerarquia_dropdown = ft.Dropdown(
-            label="Jerarquía",
+        self.jerarquia_dropdown = enlazar(ft.Dropdown(
             width=300,
-            options=[ft.dropdown.Option(j) for j in JERARQUIAS],
-            value=JERARQUIAS[0],
+            options=[ft.dropdown.Option(j) for j in obtener_catalogos().jerarquias],
+            value=obtener_catalogos().jerarquias[0],
             **InputStyles.dropdown(self.app_state.is_dark_theme)
-        )
+        ), "operadores.jerarquia", "label")
         
-        self.eliminar_dropdown = ft.Dropdown(
-            label="Eliminar operador",
+        self.eliminar_dropdown = enlazar(ft.Dropdown(
             width=300,
             options=[
                 ft.dropdown.Option(nombre) 
                 for nombre in self.app_state.operador_manager.obtener_nombres()
             ],
             **InputStyles.dropdown(self.app_state.is_dark_theme)
-        )
+        ), "operadores.eliminar_operador", "label")
 
     def update_theme(self):
         """Actualiza los estilos de los componentes del diálogo."""
@@ -333,16 +576,18 @@ class OperatorManagementDialog:
         # Asegurarse de que el valor seleccionado sea válido
         if self.cargo_dropdown.value not in cargos:
             self.cargo_dropdown.value = cargos[0] if cargos else None
+        actualizar_opciones(self.jerarquia_dropdown, [(j, j) for j in obtener_catalogos().jerarquias])
 
         # Actualizar tema antes de mostrar
         self.update_theme()
 
         dialog_style = ContainerStyles.dialog(self.app_state.is_dark_theme)
+        texto = self.app_state.idioma.texto
         
         self.dialog = ft.AlertDialog(
             modal=True,
             title=ft.Text(
-                "Gestión de Operadores",
+                texto("operadores.titulo"),
                 style=TextStyles.subtitle(self.app_state.is_dark_theme)
             ),
             content=ft.Container(
@@ -355,7 +600,7 @@ class OperatorManagementDialog:
                     self.jerarquia_dropdown,
                     ft.Row([
                         ft.ElevatedButton(
-                            "Añadir",
+                            texto("operadores.anadir"),
                             on_click=self._agregar_operador,
                             style=ButtonStyles.primary()
                         )
@@ -364,7 +609,7 @@ class OperatorManagementDialog:
                     self.eliminar_dropdown,
                     ft.Row([
                         ft.ElevatedButton(
-                            "Eliminar",
+                            texto("operadores.eliminar"),
                             on_click=self._eliminar_operador,
                             style=ButtonStyles.danger()
                         )
@@ -376,7 +621,7 @@ class OperatorManagementDialog:
             ),
             actions=[
                 ft.ElevatedButton(
-                    "Cerrar",
+                    texto("comun.cerrar"),
                     on_click=self._cerrar_dialog,
                     style=ButtonStyles.secondary(self.app_state.is_dark_theme)
                 )
@@ -388,14 +633,15 @@ class OperatorManagementDialog:
         
         self.page.open(self.dialog)
     
-    def _agregar_operador(self, e):
-        """Agrega un nuevo operador."""
+    async def _agregar_operador(self, e):
+        """Agrega un nuevo operador y lo persiste en segundo plano."""
         nombre = self.nombre_field.value.strip() if self.nombre_field.value else ""
         cedula = self.cedula_field.value.strip() if self.cedula_field.value else ""
         cargo = self.cargo_dropdown.value
         jerarquia = self.jerarquia_dropdown.value
+        manager = self.app_state.operador_manager
         
-        if self.app_state.operador_manager.agregar_operador(nombre, cargo, jerarquia, cedula):
+        if manager.agregar_operador(nombre, cargo, jerarquia, cedula, guardar=False):
             # Actualizar selector
             self.operator_selector.refresh_options()
             self.app_state.cambiar_operador(nombre)
@@ -408,14 +654,16 @@ class OperatorManagementDialog:
             self.cedula_field.value = ""
             
             # Mostrar mensaje
-            self._show_snackbar("Operador añadido", Colors.SUCCESS)
+            self._show_snackbar(self.app_state.idioma.texto("operadores.anadido"), Colors.SUCCESS)
+            await en_segundo_plano(manager.guardar_operadores)
         else:
-            self._show_snackbar("Error: Verifique los datos o si el operador ya existe", Colors.ERROR)
+            self._show_snackbar(self.app_state.idioma.texto("operadores.error_anadir"), Colors.ERROR)
     
-    def _eliminar_operador(self, e):
-        """Elimina un operador."""
+    async def _eliminar_operador(self, e):
+        """Elimina un operador y persiste el cambio en segundo plano."""
         nombre_seleccionado = self.eliminar_dropdown.value
-        if nombre_seleccionado and self.app_state.operador_manager.eliminar_operador(nombre_seleccionado):
+        manager = self.app_state.operador_manager
+        if nombre_seleccionado and manager.eliminar_operador(nombre_seleccionado, guardar=False):
             # Actualizar selector
             self.operator_selector.refresh_options()
             
@@ -429,9 +677,10 @@ class OperatorManagementDialog:
             self._refresh_delete_dropdown()
             
             # Mostrar mensaje
-            self._show_snackbar("Operador eliminado", Colors.WARNING)
+            self._show_snackbar(self.app_state.idioma.texto("operadores.eliminado"), Colors.WARNING)
+            await en_segundo_plano(manager.guardar_operadores)
         else:
-            self._show_snackbar("Error al eliminar operador", Colors.ERROR)
+            self._show_snackbar(self.app_state.idioma.texto("operadores.error_eliminar"), Colors.ERROR)
     
     def _refresh_delete_dropdown(self):
         """Actualiza el dropdown de eliminación."""
@@ -454,43 +703,182 @@ class OperatorManagementDialog:
         self.page.open(snackbar)
         self.page.update()
 
-class SettingsDialog:
-    """Diálogo para configurar el departamento y municipio."""
+class ExportDialog:
+    """Diálogo para exportar el historial de reportes."""
 
-    def __init__(self, app_state: AppState, page: ft.Page, on_save: Callable):
+    def __init__(self, app_state: AppState, page: ft.Page):
         self.app_state = app_state
         self.page = page
-        self.on_save = on_save
         self.dialog = None
-        self.municipalities = self._load_municipalities()
         self._create_form_fields()
 
-    def _load_municipalities(self) -> List[str]:
-        """Carga la lista de municipios desde el almacenamiento del cliente."""
+    def _create_form_fields(self):
+        """Crea los campos del formulario de exportación."""
+        is_dark = self.app_state.is_dark_theme
+        enlazar = self.app_state.enlaces.enlazar
+        self.formato_dropdown = enlazar(ft.Dropdown(
+            options=[ft.dropdown.Option(f) for f in FORMATOS_EXPORTACION],
+            value=FORMATOS_EXPORTACION[0],
+            width=300,
+            **InputStyles.dropdown(is_dark)
+        ), "exportar.formato", "label")
+        self.municipio_dropdown = enlazar(ft.Dropdown(
+            options=[enlazar(ft.dropdown.Option(""), "comun.todos", "text")],
+            value="",
+            width=300,
+            **InputStyles.dropdown(is_dark)
+        ), "comun.municipio", "label")
+        self.actualizar_municipios()
+        self.desde_field = enlazar(ft.TextField(width=300, **InputStyles.textfield(is_dark)), "exportar.desde", "label")
+        self.hasta_field = enlazar(ft.TextField(width=300, **InputStyles.textfield(is_dark)), "exportar.hasta", "label")
+        self.progress_bar = ft.ProgressBar(width=300, value=0, visible=False)
+        self.status_text = ft.Text("", style=TextStyles.caption(is_dark), width=300)
+        self.export_button = enlazar(
+            ft.ElevatedButton(on_click=self._export, style=ButtonStyles.primary()), "exportar.exportar", "text"
+        )
+
+    def actualizar_municipios(self) -> bool:
+        """Opciones de municipio del catálogo territorial vigente; True si cambiaron."""
+        todos = self.municipio_dropdown.options[0]  # Enlazado al idioma, se conserva
+        return actualizar_opciones(self.municipio_dropdown, [(todos.key, todos.text)] + [
+            (m.nombre, m.nombre) for m in obtener_catalogo_territorial().municipios_de(self.app_state.estado)
+        ])
+
+    def show(self):
+        """Muestra el diálogo de exportación."""
+        is_dark = self.app_state.is_dark_theme
+        dialog_style = ContainerStyles.dialog(is_dark)
+        texto = self.app_state.idioma.texto
+        self.dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Text(texto("exportar.titulo"), style=TextStyles.subtitle(is_dark)),
+            content=ft.Column([
+                self.formato_dropdown,
+                self.municipio_dropdown,
+                self.desde_field,
+                self.hasta_field,
+                self.progress_bar,
+                self.status_text
+            ], tight=True, width=300, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            actions=[
+                self.export_button,
+                ft.ElevatedButton(texto("comun.cerrar"), on_click=self._close_dialog, style=ButtonStyles.secondary(is_dark))
+            ],
+            actions_alignment="center",
+            bgcolor=dialog_style.get("bgcolor"),
+            shape=ft.RoundedRectangleBorder(radius=dialog_style.get("border_radius", 0))
+        )
+        self.page.open(self.dialog)
+
+    @staticmethod
+    def _parse_date(valor: Optional[str]) -> Optional[float]:
+        """Convierte AAAA-MM-DD a marca de tiempo; vacío significa sin límite."""
+        if not valor or not valor.strip():
+            return None
+        return datetime.datetime.strptime(valor.strip(), "%Y-%m-%d").timestamp()
+
+    async def _export(self, e):
+        """Exporta en segundo plano mostrando el progreso."""
+        texto = self.app_state.idioma.texto
         try:
-            municipalities_str = self.page.client_storage.get("municipalities")
-            if municipalities_str:
-                return json.loads(municipalities_str)
-        except (json.JSONDecodeError) as e:
-            print(f"Error al cargar municipios desde client_storage: {e}")
+            desde = self._parse_date(self.desde_field.value)
+            hasta = self._parse_date(self.hasta_field.value)
+        except ValueError:
+            self.status_text.value = texto("exportar.fechas_invalidas")
+            self.page.update()
+            return
+        if hasta is not None:
+            hasta += 24 * 3600  # Incluir el día completo
+
+        formato = self.formato_dropdown.value
+        nombre = f"historial-{datetime.datetime.now():%Y%m%d-%H%M%S}.{formato}"
+        destino = os.path.join(DATA_DIR, "exportaciones", nombre)
+        exportador = ExportadorHistorial(
+            self.app_state.historial.ruta,
+            self.app_state.operador_manager.obtener_operadores(),
+            self.app_state.plantilla.texto,
+            idioma=self.app_state.codigo_idioma
+        )
 
-        return ["Guanta"] # Valor de respaldo
+        self.export_button.disabled = True
+        self.progress_bar.value = 0
+        self.progress_bar.visible = True
+        self.status_text.value = texto("exportar.en_curso")
+        self.page.update()
+
+        ultimo = [0.0]
+        def on_progress(fraccion: float, exportados: int):
+            # Limitar las actualizaciones de la página a un 1 % de avance
+            if fraccion - ultimo[0] >= 0.01 or fraccion >= 1.0:
+                ultimo[0] = fraccion
+                self.progress_bar.value = fraccion
+                self.status_text.value = texto("exportar.progreso", cantidad=exportados)
+                self.page.update()
+
+        try:
+            cantidad = await en_segundo_plano(
+                exportador.exportar, destino, formato, desde, hasta,
+                self.municipio_dropdown.value or None, on_progress
+            )
+            self.progress_bar.value = 1
+            self.status_text.value = texto("exportar.terminado", cantidad=cantidad, destino=destino)
+        except (OSError, ValueError, *ERRORES_POOL) as error:
+            # Cualquier fallo deja el diálogo listo para reintentar
+            self.progress_bar.visible = False
+            self.status_text.value = texto("exportar.error", error=error)
+        finally:
+            self.export_button.disabled = False
+            self.page.update()
+
+    def _close_dialog(self, e):
+        """Cierra el diálogo."""
+        self.page.close(self.dialog)
+
+class SettingsDialog:
+    """Diálogo para configurar el departamento, el municipio, el idioma y la plantilla."""
+
+    def __init__(self, app_state: AppState, page: ft.Page, on_save: Callable):
+        self.app_state = app_state
+        self.page = page
+        self.on_save = on_save
+        self.dialog = None
+        self._selected_municipio: Optional[Municipio] = None
+        self._create_form_fields()
 
     def _create_form_fields(self):
         """Crea los campos del formulario de ajustes."""
-        self.departamento_field = ft.TextField(
-            label="Departamento",
+        enlazar = self.app_state.enlaces.enlazar
+        self.departamento_field = enlazar(ft.TextField(
             value=self.app_state.departamento,
             width=300,
             **InputStyles.textfield(self.app_state.is_dark_theme)
-        )
-        self.municipio_dropdown = ft.Dropdown(
-            label="Municipio",
-            options=[ft.dropdown.Option(m) for m in self.municipalities],
+        ), "ajustes.departamento", "label")
+        self.municipio_field = enlazar(ft.TextField(
             value=self.app_state.municipio,
+            helper_text=self.app_state.estado,
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=self._on_municipio_search,
+            width=300,
+            **InputStyles.textfield(self.app_state.is_dark_theme)
+        ), "comun.municipio", "label")
+        # Solo se muestran las coincidencias, nunca la lista completa
+        self.municipio_results = ft.Column(spacing=0, width=300, visible=False)
+        self.idioma_dropdown = enlazar(ft.Dropdown(
+            options=[ft.dropdown.Option(key=codigo, text=nombre) for codigo, nombre in idiomas_disponibles()],
+            value=self.app_state.codigo_idioma,
             width=300,
             **InputStyles.dropdown(self.app_state.is_dark_theme)
-        )
+        ), "ajustes.idioma", "label")
+        self.plantilla_field = enlazar(ft.TextField(
+            value=self.app_state.plantilla.texto,
+            multiline=True,
+            min_lines=4,
+            max_lines=8,
+            width=300,
+            **InputStyles.textfield(self.app_state.is_dark_theme)
+        ), "ajustes.plantilla", "label")
+        enlazar(self.plantilla_field, "ajustes.campos", "helper_text",
+                campos=", ".join(f"{{{c}}}" for c in CAMPOS_PLANTILLA))
 
     def update_theme(self):
         """Actualiza los estilos de los componentes del diálogo."""
@@ -498,13 +886,11 @@ class SettingsDialog:
 
         # Actualizar TextField
         tf_style = InputStyles.textfield(is_dark)
-        for key, value in tf_style.items():
-            setattr(self.departamento_field, key, value)
-
-        # Actualizar Dropdown
-        dd_style = InputStyles.dropdown(is_dark)
-        for key, value in dd_style.items():
-            setattr(self.municipio_dropdown, key, value)
+        for field in [self.departamento_field, self.municipio_field, self.plantilla_field]:
+            for key, value in tf_style.items():
+                setattr(field, key, value)
+        for key, value in InputStyles.dropdown(is_dark).items():
+            setattr(self.idioma_dropdown, key, value)
 
         if self.dialog:
             self.dialog.title.style = TextStyles.subtitle(is_dark)
@@ -517,17 +903,25 @@ class SettingsDialog:
     def show(self):
         """Muestra el diálogo de ajustes."""
         self.update_theme()
+        actualizar_opciones(self.idioma_dropdown, idiomas_disponibles())  # Idiomas agregados desde la última vez
+        self.idioma_dropdown.value = self.app_state.codigo_idioma
+        texto = self.app_state.idioma.texto
 
         self.dialog = ft.AlertDialog(
             modal=True,
-            title=ft.Text("Ajustes Generales"),
+            title=ft.Text(texto("ajustes.titulo")),
             content=ft.Column([
                 self.departamento_field,
-                self.municipio_dropdown
-            ], tight=True, width=300, horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+                self.municipio_field,
+                self.municipio_results,
+                self.idioma_dropdown,
+                self.plantilla_field,
+                ft.TextButton(texto("ajustes.restablecer"), on_click=self._reset_template)
+            ], tight=True, width=300, scroll=ft.ScrollMode.ADAPTIVE,
+               horizontal_alignment=ft.CrossAxisAlignment.CENTER),
             actions=[
-                ft.ElevatedButton("Guardar", on_click=self._save_settings),
-                ft.ElevatedButton("Cerrar", on_click=self._close_dialog)
+                ft.ElevatedButton(texto("comun.guardar"), on_click=self._save_settings),
+                ft.ElevatedButton(texto("comun.cerrar"), on_click=self._close_dialog)
             ],
             actions_alignment="center"
         )
@@ -537,17 +931,83 @@ class SettingsDialog:
 
         self.page.open(self.dialog)
 
-    def _save_settings(self, e):
-        """Guarda los ajustes y cierra el diálogo."""
+    def _on_municipio_search(self, e):
+        """Muestra los municipios que coinciden con lo escrito."""
+        self._selected_municipio = None
+        self.actualizar_territorio()
+        self.municipio_field.error_text = None
+        self.page.update()
+
+    def actualizar_territorio(self):
+        """Recalcula las coincidencias con el catálogo territorial vigente."""
+        consulta = self.municipio_field.value or ""
+        matches = obtener_catalogo_territorial().buscar(consulta, limite=8) if consulta.strip() else []
+        self.municipio_results.controls = [
+            ft.ListTile(
+                title=ft.Text(m.nombre),
+                subtitle=ft.Text(m.estado),
+                dense=True,
+                on_click=lambda e, m=m: self._select_municipio(m)
+            )
+            for m in matches
+        ]
+        self.municipio_results.visible = bool(matches)
+
+    def _select_municipio(self, municipio: Municipio):
+        """Fija el municipio elegido entre las coincidencias."""
+        self._selected_municipio = municipio
+        self.municipio_field.value = municipio.nombre
+        self.municipio_field.helper_text = municipio.estado
+        self.municipio_results.visible = False
+        self.page.update()
+
+    def _resolve_municipio(self) -> Optional[Municipio]:
+        """Municipio elegido, o el que coincida exactamente con el texto."""
+        if self._selected_municipio:
+            return self._selected_municipio
+        nombre = (self.municipio_field.value or "").strip()
+        catalogo = obtener_catalogo_territorial()
+        return catalogo.buscar_municipio(nombre, self.app_state.estado) or catalogo.buscar_municipio(nombre)
+
+    def _reset_template(self, e):
+        """Restablece la plantilla del idioma elegido en el formulario."""
+        self.plantilla_field.value = obtener_idioma(self.idioma_dropdown.value).plantilla.texto
+        self.plantilla_field.error_text = None
+        self.page.update()
+
+    async def _save_settings(self, e):
+        """Aplica los ajustes, cierra el diálogo y los persiste en segundo plano."""
+        codigo = self.idioma_dropdown.value or self.app_state.codigo_idioma
+        plantilla = self.plantilla_field.value
+        if not plantilla or es_plantilla_de_idioma(plantilla):
+            plantilla = obtener_idioma(codigo).plantilla.texto  # Sin plantilla propia, la del idioma
+        try:
+            compilar_plantilla(plantilla)
+        except PlantillaError as error:
+            self.plantilla_field.error_text = str(error)
+            self.page.update()
+            return
+        self.plantilla_field.error_text = None
+
+        municipio = self._resolve_municipio()
+        if municipio is None:
+            self.municipio_field.error_text = self.app_state.idioma.texto("ajustes.municipio_invalido")
+            self.page.update()
+            return
+
+        self.app_state.cambiar_plantilla(plantilla)
+        self.app_state.cambiar_idioma(codigo)
+        self.plantilla_field.value = self.app_state.plantilla.texto
         self.app_state.departamento = self.departamento_field.value or "PROTECCIÓN CIVIL"
-        self.app_state.municipio = self.municipio_dropdown.value or "Guanta"
-        self.app_state.guardar_configuracion()
+        self.app_state.municipio = municipio.nombre
+        self.app_state.estado = municipio.estado
 
         # Llama al callback para actualizar la UI principal
         self.on_save()
 
-        self._show_snackbar("Ajustes guardados", Colors.SUCCESS)
+        self._show_snackbar(self.app_state.idioma.texto("ajustes.guardados"), Colors.SUCCESS)
         self._close_dialog(e)
+        await self.app_state.guardar_configuracion_async()
 
     def _close_dialog(self, e):
         """Cierra el diálogo."""
@@ -559,43 +1019,505 @@ class SettingsDialog:
         self.page.open(snackbar)
         self.page.update()
 
+class DashboardRow:
+    """Fila del tablero con su propio estado; solo se redibuja cuando cambia."""
+
+    SEPARACION = 8
+    ALTURA = 84 + SEPARACION  # Incluye la separación: la lista usa altura fija sin spacing
+
+    def __init__(self, app_state: AppState, fila: FilaTablero, on_change: Callable, on_remove: Callable):
+        self.app_state = app_state
+        self.fila = fila
+        self.on_change = on_change
+        self.on_remove = on_remove
+        self._clave = None
+        self._create_controls()
+        self.refrescar()
+
+    def _create_controls(self):
+        is_dark = self.app_state.is_dark_theme
+        self.checkbox = ft.Checkbox(value=self.fila.seleccionada, on_change=self._on_select)
+        self.title = ft.Text(self.fila.municipio, style=TextStyles.body(is_dark), weight=ft.FontWeight.BOLD)
+        self.subtitle = ft.Text("", style=TextStyles.caption(is_dark), max_lines=1)
+        self.dropdown = ft.Dropdown(
+            width=190,
+            options=[ft.dropdown.Option(key=key, text=text) for key, text in self.app_state.idioma.opciones_tiempo],
+            value=str(self.fila.indice_tiempo),
+            on_change=self._on_dropdown_change,
+            **InputStyles.dropdown(is_dark)
+        )
+        self.container = ft.Container(
+            ft.Row([
+                self.checkbox,
+                ft.Column([self.title, self.subtitle], spacing=2, expand=True),
+                self.dropdown,
+                self.app_state.enlaces.enlazar(
+                    ft.IconButton(ft.Icons.CLOSE, on_click=lambda _: self.on_remove(self)), "tablero.quitar", "tooltip"
+                )
+            ], vertical_alignment=ft.CrossAxisAlignment.CENTER),
+            height=self.ALTURA - self.SEPARACION,
+            margin=ft.margin.only(bottom=self.SEPARACION),
+            padding=ft.padding.symmetric(horizontal=12),
+            bgcolor=ContainerStyles.card(is_dark)["bgcolor"],
+            border_radius=ContainerStyles.card(is_dark)["border_radius"]
+        )
+
+    def refrescar(self, momento: Optional[datetime.datetime] = None, forzar: bool = False) -> bool:
+        """Recalcula el resumen de la fila; devuelve True si cambió."""
+        reporte = self.app_state.construir_reporte_fila(self.fila, momento)
+        clave = (reporte.emoji, reporte.descripcion, reporte.hora)
+        if clave == self._clave and not forzar:
+            return False
+        self._clave = clave
+        self.subtitle.value = f"{reporte.emoji} {reporte.descripcion} · {reporte.hora}"
+        return True
+
+    def _on_select(self, e):
+        self.fila.seleccionada = bool(e.control.value)
+
+    def actualizar_idioma(self) -> bool:
+        """Aplica las opciones y el resumen del idioma vigente (otro idioma o un catálogo recargado);
+        devuelve True si cambió algo."""
+        if actualizar_opciones(self.dropdown, self.app_state.idioma.opciones_tiempo):
+            self.fila.indice_tiempo = int(self.dropdown.value)
+        return self.refrescar()
+
+    def sugerir(self, indice: int) -> bool:
+        """Preselecciona el estado sugerido por los pluviómetros; devuelve True si cambió."""
+        if indice == self.fila.indice_tiempo:
+            return False
+        self.fila.indice_tiempo = indice
+        self.dropdown.value = str(indice)
+        self.refrescar(forzar=True)
+        return True
+
+    async def _on_dropdown_change(self, e):
+        try:
+            self.fila.indice_tiempo = int(e.control.value)
+        except (ValueError, TypeError):
+            return
+        if self.refrescar():
+            self.subtitle.update()
+        await self.on_change()
+
+    def update_theme(self):
+        """Actualiza el estilo según el tema."""
+        is_dark = self.app_state.is_dark_theme
+        self.title.style = TextStyles.body(is_dark)
+        self.subtitle.style = TextStyles.caption(is_dark)
+        for key, value in InputStyles.dropdown(is_dark).items():
+            setattr(self.dropdown, key, value)
+        self.container.bgcolor = ContainerStyles.card(is_dark)["bgcolor"]
+
+class DashboardView:
+    """Tablero con el reporte y el tiempo de varios municipios."""
+
+    # Filas que se construyen por tanda; el resto se agrega al desplazarse
+    LOTE = 20
+
+    def __init__(self, app_state: AppState, page: ft.Page, on_copy: Optional[Callable] = None):
+        self.app_state = app_state
+        self.page = page
+        self.on_copy = on_copy
+        self.rows: List[DashboardRow] = []
+        self._operadores_lote = set()
+        self._idiomas_lote = set()
+        self._create_controls()
+        self._build_more()
+
+    def _create_controls(self):
+        is_dark = self.app_state.is_dark_theme
+        enlazar = self.app_state.enlaces.enlazar
+        self.header = enlazar(ft.Text(style=TextStyles.subtitle(is_dark)), "tablero.titulo")
+        self.search_field = enlazar(ft.TextField(
+            prefix_icon=ft.Icons.SEARCH,
+            on_change=self._on_search,
+            **InputStyles.textfield(is_dark)
+        ), "tablero.agregar", "label")
+        self.search_results = ft.Column(spacing=0, visible=False)
+        self.select_all = enlazar(ft.Checkbox(on_change=self._on_select_all), "comun.todos", "label")
+        self.operator_chips = ft.Row(wrap=True, spacing=6)
+        self._refresh_operator_chips()
+        # Idiomas de la copia por lote; sin marcar, el de la sesión
+        self.language_chips = ft.Row([
+            ft.Chip(
+                label=ft.Text(nombre),
+                on_select=lambda e, codigo=codigo: self._on_language_select(codigo, e.control.selected)
+            )
+            for codigo, nombre in idiomas_disponibles()
+        ], wrap=True, spacing=6)
+        self.copy_button = enlazar(ft.FilledButton(
+            icon=ft.Icons.CONTENT_COPY,
+            on_click=self._copy_selected,
+            style=ButtonStyles.primary()
+        ), "tablero.copiar", "text")
+        # Altura fija por fila: la lista solo dibuja las filas visibles. Con
+        # spacing la altura fija deja de aplicarse; la separación va en cada fila
+        self.list_view = ft.ListView(
+            expand=True,
+            spacing=0,
+            item_extent=DashboardRow.ALTURA,
+            on_scroll=self._on_scroll,
+            on_scroll_interval=100
+        )
+        self.container = ft.Container(
+            ft.Column([
+                self.header,
+                self.search_field,
+                self.search_results,
+                self.operator_chips,
+                self.language_chips,
+                ft.Row([self.select_all, self.copy_button], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
+                self.list_view
+            ], expand=True, spacing=12),
+            expand=True,
+            padding=16
+        )
+
+    def _build_more(self) -> bool:
+        """Construye la siguiente tanda de filas; devuelve True si agregó alguna."""
+        pendientes = self.app_state.tablero[len(self.rows):len(self.rows) + self.LOTE]
+        for fila in pendientes:
+            row = DashboardRow(self.app_state, fila, self._save, self._remove_row)
+            self.rows.append(row)
+            self.list_view.controls.append(row.container)
+        return bool(pendientes)
+
+    def _on_scroll(self, e: ft.OnScrollEvent):
+        if e.max_scroll_extent - e.pixels < DashboardRow.ALTURA * 5 and self._build_more():
+            self.list_view.update()
+
+    def _on_search(self, e):
+        """Muestra los municipios que coinciden con lo escrito."""
+        self.actualizar_territorio()
+        self.page.update()
+
+    def actualizar_territorio(self):
+        """Recalcula las coincidencias con el catálogo territorial vigente."""
+        consulta = self.search_field.value or ""
+        matches = obtener_catalogo_territorial().buscar(consulta, limite=8) if consulta.strip() else []
+        self.search_results.controls = [
+            ft.ListTile(
+                title=ft.Text(m.nombre),
+                subtitle=ft.Text(m.estado),
+                dense=True,
+                on_click=lambda e, m=m: self.page.run_task(self._add_municipio, m)
+            )
+            for m in matches
+        ]
+        self.search_results.visible = bool(matches)
+
+    async def _add_municipio(self, municipio: Municipio):
+        fila = self.app_state.agregar_al_tablero(municipio.nombre)
+        self.search_field.value = ""
+        self.search_results.visible = False
+        if fila and len(self.rows) == len(self.app_state.tablero) - 1:
+            self._build_more()
+        self.page.update()
+        if fila:
+            await self._save()
+
+    def _remove_row(self, row: DashboardRow):
+        self.app_state.quitar_del_tablero(row.fila.municipio)
+        self.rows.remove(row)
+        self.list_view.controls.remove(row.container)
+        self.list_view.update()
+        self.page.run_task(self._save)
+
+    async def _save(self):
+        await en_segundo_plano(self.app_state.guardar_tablero)
+
+    def _refresh_operator_chips(self):
+        """Un chip por operador; los marcados firman la copia por lote."""
+        nombres = self.app_state.operador_manager.obtener_nombres()
+        self._operadores_lote &= set(nombres)
+        self.operator_chips.controls = [
+            ft.Chip(
+                label=ft.Text(nombre),
+                selected=nombre in self._operadores_lote,
+                on_select=lambda e, nombre=nombre: self._on_operator_select(nombre, e.control.selected)
+            )
+            for nombre in nombres
+        ]
+
+    def _on_operator_select(self, nombre: str, seleccionado: bool):
+        if seleccionado:
+            self._operadores_lote.add(nombre)
+        else:
+            self._operadores_lote.discard(nombre)
+
+    def _on_language_select(self, codigo: str, seleccionado: bool):
+        if seleccionado:
+            self._idiomas_lote.add(codigo)
+        else:
+            self._idiomas_lote.discard(codigo)
+
+    def _on_select_all(self, e):
+        valor = bool(e.control.value)
+        for fila in self.app_state.tablero:
+            fila.seleccionada = valor
+        for row in self.rows:
+            row.checkbox.value = valor
+        self.list_view.update()
+
+    async def _copy_selected(self, e):
+        """Copia los reportes de las filas marcadas en una sola pasada."""
+        inicio = time.perf_counter()
+        filas = [fila for fila in self.app_state.tablero if fila.seleccionada]
+        if not filas:
+            self._show_snackbar(self.app_state.idioma.texto("tablero.sin_seleccion"), Colors.WARNING)
+            return
+
+        manager = self.app_state.operador_manager
+        operadores = [op for op in (manager.buscar_por_nombre(nombre) for nombre in sorted(self._operadores_lote)) if op]
+        if self._idiomas_lote:
+            # Cada reporte se construye una vez y se renderiza en los idiomas marcados
+            idiomas = [codigo for codigo, _ in idiomas_disponibles() if codigo in self._idiomas_lote]
+            emitidos = [
+                (reporte, "\n\n".join(textos.values()), registro)
+                for reporte, textos, registro in self.app_state.emitir_lote_idiomas(filas, operadores, idiomas)
+            ]
+        else:
+            emitidos = self.app_state.emitir_lote(filas, operadores)
+        self.page.set_clipboard("\n\n".join(texto for _, texto, _ in emitidos))
+        self._show_snackbar(self.app_state.idioma.texto("tablero.copiados", cantidad=len(emitidos)), Colors.SUCCESS)
+        LATENCIA_COPIA.observar(time.perf_counter() - inicio, "lote")
+
+        # Una sola actualización de la UI, una sola escritura del historial;
+        # los estados repetidos dentro de la ventana no se registran ni se despachan
+        nuevos = [(reporte, registro) for reporte, _, registro in emitidos if registro]
+        if not nuevos:
+            return
+        reportes = [reporte for reporte, _ in nuevos]
+        registros = [registro for _, registro in nuevos]
+        if self.on_copy:
+            self.on_copy(reportes, registros)
+        await en_segundo_plano(self.app_state.historial.registrar_lote, registros)
+
+    def _show_snackbar(self, mensaje: str, color):
+        """Muestra un snackbar con un mensaje."""
+        snackbar = ft.SnackBar(ft.Text(mensaje, color=color))
+        self.page.open(snackbar)
+        self.page.update()
+
+    def refresh(self, forzar: bool = False, momento: Optional[datetime.datetime] = None):
+        """Redibuja solo las filas construidas cuyo contenido cambió."""
+        if forzar:
+            self._refresh_operator_chips()
+            self.operator_chips.update()
+        momento = momento or datetime.datetime.now()
+        cambiadas = [row.subtitle for row in self.rows if row.refrescar(momento, forzar)]
+        if cambiadas:
+            self.page.update(*cambiadas)
+
+    def aplicar_sugerencias(self, sugerencias: Dict[str, Sugerencia]) -> List[ft.Control]:
+        """Preselecciona el tiempo sugerido en las filas de esos municipios.
+
+        Devuelve los controles que hay que redibujar.
+        """
+        construidas = {row.fila.municipio: row for row in self.rows}
+        modificadas = 0
+        cambiadas = []
+        for fila in self.app_state.tablero:
+            sugerencia = sugerencias.get(fila.municipio)
+            # Un retiro (índice negativo) deja la fila en su último estado, ya guardado
+            if sugerencia is None or sugerencia.indice < 0 or sugerencia.indice == fila.indice_tiempo:
+                continue
+            modificadas += 1
+            row = construidas.get(fila.municipio)
+            if row is None:
+                fila.indice_tiempo = sugerencia.indice  # Se dibuja al construirse
+            elif row.sugerir(sugerencia.indice):
+                cambiadas.append(row.container)
+        if modificadas:
+            self.page.run_task(self._save)
+        return cambiadas
+
+    def actualizar_idioma(self) -> bool:
+        """Aplica el idioma vigente (o un catálogo recargado) a las filas construidas."""
+        cambiadas = [row for row in self.rows if row.actualizar_idioma()]
+        return bool(cambiadas)
+
+    def update_theme(self):
+        """Actualiza el estilo según el tema."""
+        is_dark = self.app_state.is_dark_theme
+        self.header.style = TextStyles.subtitle(is_dark)
+        for key, value in InputStyles.textfield(is_dark).items():
+            setattr(self.search_field, key, value)
+        for row in self.rows:
+            row.update_theme()
+
 class ActionButtons:
     """Botones de acción de la aplicación."""
     
-    def __init__(self, app_state: AppState, operator_selector: OperatorSelector, page: ft.Page):
+    def __init__(self, app_state: AppState, operator_selector: OperatorSelector, page: ft.Page, on_copy: Optional[Callable] = None, copy_button: Optional[ft.FilledButton] = None):
         self.app_state = app_state
         self.page = page
-        self.operator_management = OperatorManagementDialog(app_state, operator_selector, page)
-        self.copy_button = self._create_copy_button()
+        self.on_copy = on_copy
+        self.operator_selector = operator_selector
+        self._operator_management: Optional[OperatorManagementDialog] = None
+        if copy_button is None:
+            self.copy_button = self._create_copy_button()
+        else:
+            # Botón del primer cuadro, habilitado al terminar la hidratación
+            copy_button.on_click = self._copy_report
+            copy_button.disabled = False
+            self.copy_button = copy_button
+        self.app_state.enlaces.enlazar(self.copy_button, "principal.copiar", "text")
         self.manage_button = self._create_manage_button()
 
+    @property
+    def operator_management(self) -> OperatorManagementDialog:
+        """Diálogo de gestión, construido al usarlo por primera vez."""
+        if self._operator_management is None:
+            self._operator_management = OperatorManagementDialog(self.app_state, self.operator_selector, self.page)
+        return self._operator_management
+
+    def liberables(self) -> list:
+        """Lo que liberar() soltaría, para medirlo."""
+        return [self._operator_management]
+
+    def liberar(self):
+        """Suelta el diálogo de gestión; se reconstruye al volver a abrirlo."""
+        self._operator_management = None
+
     def _create_manage_button(self) -> ft.ElevatedButton:
         """Crea el botón para gestionar operadores."""
-        return ft.ElevatedButton(
-            "Gestionar Operadores",
+        return self.app_state.enlaces.enlazar(ft.ElevatedButton(
             icon=ft.Icons.MANAGE_ACCOUNTS,
             on_click=lambda _: self.operator_management.show(),
             style=ButtonStyles.secondary(self.app_state.is_dark_theme)
-        )
+        ), "menu.operadores", "text")
 
     def _create_copy_button(self) -> ft.FilledButton:
         return ft.FilledButton(
-            "Copiar al Portapapeles",
             icon=ft.Icons.CONTENT_COPY,
             on_click=self._copy_report,
             style=ButtonStyles.primary()
         )
     
-    def _copy_report(self, e):
-        """Copia el reporte al portapapeles."""
-        reporte = self.app_state.generar_reporte_actual()
-        self.page.set_clipboard(reporte)
+    async def _copy_report(self, e):
+        """Copia el reporte al portapapeles y lo registra en segundo plano."""
+        inicio = time.perf_counter()
+        reporte, texto, registro = self.app_state.emitir_reporte_actual()
+        self.page.set_clipboard(texto)
         
-        snackbar_copiado = ft.SnackBar(ft.Text("¡Reporte copiado!", color=Colors.SUCCESS))
+        snackbar_copiado = ft.SnackBar(ft.Text(self.app_state.idioma.texto("principal.copiado"), color=Colors.SUCCESS))
         self.page.open(snackbar_copiado)
         self.page.update()
+        LATENCIA_COPIA.observar(time.perf_counter() - inicio, "individual")
+
+        if registro is None:
+            return  # Mismo estado dentro de la ventana: ya registrado y despachado
+        if self.on_copy:
+            self.on_copy(reporte, registro)
+        await en_segundo_plano(self.app_state.historial.registrar, registro)
     
     def update_theme(self):
         """Actualiza los estilos según el tema."""
-        self.operator_management.update_theme()
-        self.manage_button.style = ButtonStyles.secondary(self.app_state.is_dark_theme)
\ No newline at end of file
+        if self._operator_management:
+            self._operator_management.update_theme()
+        self.manage_button.style = ButtonStyles.secondary(self.app_state.is_dark_theme)
+
+class MainLayout:
+    """Disposición de la pantalla principal: reporte, datos, botón de copia y créditos."""
+
+    def __init__(self, is_dark: bool, report_container: ft.Container, weather_dropdown: ft.Dropdown,
+                 operator_dropdown: ft.Dropdown, novedad_field: ft.TextField, novedad_results: ft.Column,
+                 copy_button: ft.FilledButton, idioma: Idioma):
+        self.title = ft.Text(idioma.texto("principal.datos"), style=TextStyles.subtitle(is_dark))
+        self.data_container = ft.Container(
+            ft.Column([
+                self.title,
+                weather_dropdown,
+                operator_dropdown,
+                novedad_field,
+                novedad_results,
+            ], alignment="center", horizontal_alignment="center", spacing=12),
+            **ContainerStyles.card(is_dark),
+            width=500,
+            alignment=ft.alignment.center
+        )
+
+        self.credits = ft.Text(idioma.texto("principal.creditos"), style=TextStyles.caption(is_dark))
+
+        self.main_column = ft.Column([
+            report_container,
+            self.data_container,
+            ft.Row([copy_button], alignment=ft.MainAxisAlignment.CENTER),
+            ft.Row([self.credits], alignment=ft.MainAxisAlignment.CENTER)
+        ],
+        expand=True,
+        alignment=ft.MainAxisAlignment.CENTER,
+        horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+        spacing=18,
+        scroll=ft.ScrollMode.ADAPTIVE)
+
+        # Se envuelve la columna principal en un contenedor con el color de fondo
+        # para evitar un parpadeo gris (flickering) al cambiar de tema.
+        # Esta es una solución alternativa para un posible problema de renderizado.
+        self.main_container = ft.Container(
+            self.main_column,
+            expand=True,
+            bgcolor=ThemeManager.get_page_bgcolor(is_dark)
+        )
+
+class FirstFrame:
+    """Pantalla principal pintada desde la instantánea, antes de hidratar el estado.
+
+    Los componentes reales adoptan después estos mismos controles, así que la
+    hidratación solo envía lo que cambió.
+    """
+
+    def __init__(self, instantanea: InstantaneaUI):
+        is_dark = instantanea.tema_oscuro
+        self.tema_oscuro = is_dark
+        self.idioma = obtener_idioma(instantanea.idioma)
+        text_widget = ReportDisplay._create_text_widget(is_dark)
+        text_widget.spans = ReportDisplay._segmentos_to_spans(instantanea.segmentos, is_dark)
+        self.report_container = ReportDisplay._create_container(text_widget, is_dark)
+        self.report_container.data = instantanea.segmentos
+
+        clave, texto = instantanea.tiempo
+        self.weather_dropdown = ft.Dropdown(
+            width=380,
+            options=[ft.dropdown.Option(key=clave, text=texto)],
+            value=clave,
+            disabled=True,
+            **InputStyles.dropdown(is_dark)
+        )
+        operadores = [instantanea.operador] if instantanea.operador else []
+        self.operator_dropdown = ft.Dropdown(
+            width=380,
+            options=[ft.dropdown.Option(nombre) for nombre in operadores],
+            value=instantanea.operador,
+            disabled=True,
+            **InputStyles.dropdown(is_dark)
+        )
+        self.novedad_field = NovedadField._create_field(is_dark)
+        self.novedad_field.label = self.idioma.texto("novedad.etiqueta")
+        self.novedad_field.hint_text = self.idioma.novedad_por_defecto
+        self.novedad_field.disabled = True
+        self.novedad_results = NovedadField._create_results()
+        self.copy_button = ft.FilledButton(
+            self.idioma.texto("principal.copiar"),
+            icon=ft.Icons.CONTENT_COPY,
+            disabled=True,
+            style=ButtonStyles.primary()
+        )
+        self.layout = MainLayout(
+            is_dark, self.report_container, self.weather_dropdown, self.operator_dropdown,
+            self.novedad_field, self.novedad_results, self.copy_button, self.idioma
+        )
+
+    def mostrar(self, page: ft.Page):
+        """Pinta el cuadro con una sola actualización."""
+        page.title = self.idioma.texto("app.titulo")
+        page.theme_mode = ft.ThemeMode.DARK if self.tema_oscuro else ft.ThemeMode.LIGHT
+        page.bgcolor = ThemeManager.get_page_bgcolor(self.tema_oscuro)
+        page.appbar = ft.AppBar(
+            leading=ft.Image(src="icon.png", width=40, height=40),
+            title=ft.Text(self.idioma.texto("app.titulo"), style=TextStyles.subtitle(self.tema_oscuro)),
+            bgcolor=ContainerStyles.card(self.tema_oscuro)["bgcolor"]
+        )
+        page.add(self.layout.main_container)